@@ -18,7 +18,7 @@ class DummyModel(el.AbstractModel):
         pass
 
     def run(self, batch: el.Batch, train: bool, stream):
-        batch['output'] = [batch['key'][0]*self._factor]
+        batch['output'] = [key*self._factor for key in batch['key']]
         return batch
 
     @property
@@ -4,5 +4,5 @@ from .dummy_dataset import DummyDataset
 class PostProcessDataset(DummyDataset):
 
     def postprocess_batch(self, input_batch, output_batch):
-        output_batch['output'][0] *= self._post_process_factor
+        output_batch['output'] = [output*self._post_process_factor for output in output_batch['output']]
         return output_batch
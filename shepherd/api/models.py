@@ -4,7 +4,7 @@ from datetime import datetime
 
 from apistrap.examples import ModelExample, ExamplesMixin
 from schematics import Model
-from schematics.types import StringType, BooleanType, ModelType, UUIDType, DateTimeType
+from schematics.types import StringType, BooleanType, ModelType, UUIDType, DateTimeType, FloatType
 
 
 class ModelModel(Model):
@@ -22,6 +22,8 @@ class SheepModel(Model):
     running: bool = BooleanType(required=True)
     model: ModelModel = ModelType(ModelModel, required=True)
     request: Optional[str] = UUIDType(serialize_when_none=True)
+    ready: Optional[bool] = BooleanType(serialize_when_none=False)
+    startup_time: Optional[float] = FloatType(serialize_when_none=False)
 
 
 class ErrorModel(Model):
@@ -1,5 +1,7 @@
+from typing import List
+
 from schematics import Model
-from schematics.types import StringType, ModelType
+from schematics.types import StringType, ModelType, IntType, ListType
 
 from shepherd.api.models import ModelModel
 
@@ -9,3 +11,12 @@ class StartJobRequest(Model):
     sheep_id: str = StringType(default=None)
     model: ModelModel = ModelType(ModelModel, required=True)
     payload: str = StringType(required=False)
+    priority: int = IntType(default=0)
+
+
+class StartJobsRequest(Model):
+    jobs: List[StartJobRequest] = ListType(ModelType(StartJobRequest), required=True, min_size=1)
+
+
+class JobStatusesRequest(Model):
+    job_ids: List[str] = ListType(StringType, required=True, min_size=1)
@@ -1,11 +1,11 @@
-from typing import Dict
+from typing import Dict, List, Optional
 
 from apistrap.examples import ModelExample, ExamplesMixin
 from apistrap.schemas import ErrorResponse
 from schematics import Model
-from schematics.types import BooleanType, DictType, ModelType
+from schematics.types import BooleanType, DictType, ModelType, ListType, StringType
 
-from .models import SheepModel, JobStatusModel
+from .models import SheepModel, JobStatusModel, ErrorModel
 
 
 class JobErrorResponse(ErrorResponse):
@@ -40,8 +40,23 @@ class StartJobResponse(Model):
     success: bool = BooleanType(default=True, required=True)
 
 
+class StartJobResult(Model):
+    job_id: str = StringType(required=True)
+    success: bool = BooleanType(required=True)
+    error: Optional[ErrorModel] = ModelType(ErrorModel, required=False)
+
+
+class StartJobsResponse(Model):
+    results: List[StartJobResult] = ListType(ModelType(StartJobResult), required=True)
+
+
 JobStatusResponse = JobStatusModel
 
 
+class JobStatusesResponse(Model):
+    statuses: Dict[str, JobStatusModel] = DictType(ModelType(JobStatusModel), required=True)
+    unknown: List[str] = ListType(StringType, required=True)  # ids of the jobs without any data
+
+
 class JobNotReadyResponse(Model):
     ready: bool = BooleanType(required=True, default=False)
@@ -1,20 +1,35 @@
-from aiohttp import web
+from aiohttp import web, BodyPartReader
+from apistrap.errors import InvalidFieldsError
 from apistrap.types import FileResponse
+from schematics.exceptions import DataError
 from io import BytesIO
+from typing import Sequence, Optional, BinaryIO, Tuple, List
 
+import json
+import asyncio
+import logging
+import tempfile
+import posixpath
 import mimetypes
 
 from ..storage import Storage
 from ..constants import DEFAULT_OUTPUT_FILE, OUTPUT_DIR, DEFAULT_PAYLOAD_PATH, DEFAULT_PAYLOAD_FILE, INPUT_DIR
-from ..api.models import JobStatus
+from ..api.models import JobStatus, JobStatusModel
 from ..shepherd import Shepherd
-from .requests import StartJobRequest
+from .requests import StartJobRequest, StartJobsRequest, JobStatusesRequest
 from .responses import StartJobResponse, StatusResponse, JobStatusResponse, ErrorResponse, \
-    JobErrorResponse, JobNotReadyResponse
-from ..errors.api import UnknownJobError, NameConflictError
+    JobErrorResponse, JobNotReadyResponse, StartJobsResponse, StartJobResult, JobStatusesResponse
+from ..errors.api import UnknownJobError, NameConflictError, ApiClientError
 from .openapi import oapi
 
 
+_EVENTS_KEEPALIVE_INTERVAL = 15
+"""Interval (in seconds) of sending keep-alive comments to the job status event streams without events."""
+
+_UPLOAD_CHUNK_SIZE = 256 * 1024
+"""Size of the chunks (in bytes) the uploaded files are read in."""
+
+
 async def check_job_dir_exists(storage: Storage, job_id: str) -> None:
     """
     Check if a job dir/bucket exists and raise an error if it doesn't.
@@ -26,12 +41,150 @@ async def check_job_dir_exists(storage: Storage, job_id: str) -> None:
         raise UnknownJobError('Data for job `{}` does not exist'.format(job_id))
 
 
-def create_shepherd_routes(shepherd: Shepherd, storage: Storage) -> web.RouteTableDef:
+async def submit_job(shepherd: Shepherd, storage: Storage, start_job_request: StartJobRequest) -> None:
+    """
+    Store the payload of a job (or check that its data exist if there is none) and enqueue it.
+
+    :param shepherd: the shepherd to enqueue the job to
+    :param storage: the storage used by the shepherd
+    :param start_job_request: the job specification
+    :raises NameConflictError: a job with given id was already submitted
+    """
+    if not start_job_request.payload:
+        await check_job_dir_exists(storage, start_job_request.job_id)
+    else:
+        await storage.init_job(start_job_request.job_id)
+
+        payload_data = start_job_request.payload.encode()
+        payload = BytesIO(payload_data)
+        await storage.put_file(start_job_request.job_id, DEFAULT_PAYLOAD_PATH, payload, len(payload_data))
+
+    await shepherd.enqueue_job(start_job_request.job_id, start_job_request.model, start_job_request.sheep_id,
+                               start_job_request.priority)
+
+
+async def spool_upload(part: BodyPartReader) -> Tuple[BinaryIO, int]:
+    """
+    Write an uploaded file to a temporary file chunk by chunk, so that it can be stored without holding it in memory.
+
+    :param part: the multipart body part with the file
+    :return: the temporary file (rewound to the start) and its length
+    """
+    file = tempfile.TemporaryFile()
+    length = 0
+
+    try:
+        while True:
+            chunk = await part.read_chunk(_UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            await asyncio.get_event_loop().run_in_executor(None, file.write, chunk)
+            length += len(chunk)
+    except BaseException:
+        file.close()
+        raise
+
+    file.seek(0)
+    return file, length
+
+
+def upload_file_path(file_name: Optional[str]) -> str:
+    """
+    Get the storage path of an uploaded input file.
+
+    :param file_name: name of the uploaded file (possibly with ``/`` delimited folders)
+    :raises ApiClientError: the file name is missing or it points outside of the inputs folder
+    :return: the path of the file in the job storage
+    """
+    file_name = posixpath.normpath(file_name) if file_name else ""
+    if not file_name or file_name == "." or posixpath.isabs(file_name) or file_name.split("/")[0] == "..":
+        raise ApiClientError(f"Invalid input file name `{file_name}`")
+
+    return INPUT_DIR + "/" + file_name
+
+
+async def read_upload(request: web.Request) -> Tuple[StartJobRequest, List[Tuple[str, BinaryIO, int]]]:
+    """
+    Read and validate a ``multipart/form-data`` job upload, spool the uploaded files to temporary files.
+
+    :param request: the HTTP request
+    :raises ApiClientError: the request is malformed
+    :return: the job specification and the storage paths, temporary files and lengths of the uploaded files
+    """
+    try:
+        reader = await request.multipart()
+    except (AssertionError, ValueError) as ex:
+        raise ApiClientError("The request body must be multipart/form-data") from ex
+
+    part = await reader.next()
+    if part is None or part.name != "job" or part.filename is not None:
+        raise ApiClientError("The first part of the request must be the `job` field")
+
+    try:
+        start_job_request = StartJobRequest(json.loads(await part.text()), validate=True, partial=False, strict=True)
+    except (ValueError, TypeError) as ex:
+        raise ApiClientError("The `job` field must be a JSON object") from ex
+    except DataError as ex:
+        raise InvalidFieldsError(ex.errors) from ex
+
+    uploads = []
+    try:
+        while True:
+            part = await reader.next()
+            if part is None:
+                break
+
+            file_path = upload_file_path(part.filename)
+            uploads.append((file_path, *await spool_upload(part)))
+    except BaseException:
+        for _, file, _ in uploads:
+            file.close()
+        raise
+
+    if not uploads and not start_job_request.payload:
+        raise ApiClientError(f"No input files were uploaded for job `{start_job_request.job_id}`")
+
+    return start_job_request, uploads
+
+
+async def stream_job_events(request: web.Request, shepherd: Shepherd, job_ids: Sequence[str]) -> web.StreamResponse:
+    """
+    Stream the status changes of the given jobs as server-sent events until all the jobs are done (or failed).
+    Each ``status`` event carries a JSON object with the ``job_id`` and its ``status`` information.
+
+    :param request: the HTTP request
+    :param shepherd: the shepherd producing the status changes
+    :param job_ids: ids of the jobs
+    :return: the streamed response
+    """
+    async with shepherd.subscribe_job_status(job_ids) as updates:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        pending = set(job_ids)
+
+        while pending:
+            try:
+                job_id, status = await asyncio.wait_for(updates.get(), _EVENTS_KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                await response.write(b": keep-alive\n\n")
+                continue
+
+            data = json.dumps({"job_id": job_id, "status": status.to_primitive()})
+            await response.write(f"event: status\ndata: {data}\n\n".encode())
+            if status.status in (JobStatus.DONE, JobStatus.FAILED):
+                pending.discard(job_id)
+
+        await response.write_eof()
+        return response
+
+
+def create_shepherd_routes(shepherd: Shepherd, storage: Storage, batch_concurrency: int = 32) -> web.RouteTableDef:
     """
     Create shepherd API endpoint handlers.
 
     :param shepherd: the shepherd exposed by the API
     :param storage: the storage used by the shepherd
+    :param batch_concurrency: maximum number of jobs of a batch request processed in parallel
     :return: a route table containing the API endpoint handlers
     """
 
@@ -46,20 +199,69 @@ def create_shepherd_routes(shepherd: Shepherd, storage: Storage) -> web.RouteTab
 
         :raises NameConflictError: a job with given id was already submitted
         """
-        if not start_job_request.payload:
-            await check_job_dir_exists(storage, start_job_request.job_id)
-        else:
+        await submit_job(shepherd, storage, start_job_request)
+
+        return StartJobResponse()
+
+    @api.post('/start-job/upload')
+    @oapi.accepts_file('multipart/form-data')
+    @oapi.responds_with(StartJobResponse)
+    async def start_job_upload(request):
+        """
+        Start a new job with input files uploaded as ``multipart/form-data``.
+        The first part is a ``job`` field with the job specification (the same JSON as for ``/start-job``), every other
+        part is a file stored under ``inputs/``. The job is created only once the whole request is read and validated.
+
+        :raises NameConflictError: a job with given id was already submitted
+        """
+        try:
+            start_job_request, uploads = await read_upload(request)
+        except Exception:
+            await request.release()  # read the rest of the body, so that the connection can be reused
+            raise
+
+        try:
             await storage.init_job(start_job_request.job_id)
+            if start_job_request.payload:
+                payload_data = start_job_request.payload.encode()
+                await storage.put_file(start_job_request.job_id, DEFAULT_PAYLOAD_PATH, BytesIO(payload_data),
+                                       len(payload_data))
 
-            payload_data = start_job_request.payload.encode()
-            payload = BytesIO(payload_data)
-            await storage.put_file(start_job_request.job_id, DEFAULT_PAYLOAD_PATH,
-                                   payload, len(start_job_request.payload))
+            for file_path, file, length in uploads:
+                await storage.put_file(start_job_request.job_id, file_path, file, length)
+        finally:
+            for _, file, _ in uploads:
+                file.close()
 
-        await shepherd.enqueue_job(start_job_request.job_id, start_job_request.model, start_job_request.sheep_id)
+        await shepherd.enqueue_job(start_job_request.job_id, start_job_request.model, start_job_request.sheep_id,
+                                   start_job_request.priority)
 
         return StartJobResponse()
 
+    @api.post('/start-jobs')
+    @oapi.accepts(StartJobsRequest)
+    @oapi.responds_with(StartJobsResponse)
+    async def start_jobs(start_jobs_request: StartJobsRequest):
+        """
+        Start a batch of new jobs. The jobs are submitted in parallel and the result of each one is reported separately.
+        """
+        semaphore = asyncio.Semaphore(batch_concurrency)
+
+        async def submit(start_job_request: StartJobRequest) -> StartJobResult:
+            async with semaphore:
+                try:
+                    await submit_job(shepherd, storage, start_job_request)
+                except Exception as ex:
+                    logging.warning('Failed to submit job `%s`: %s', start_job_request.job_id, str(ex))
+                    return StartJobResult({"job_id": start_job_request.job_id, "success": False,
+                                           "error": {"message": str(ex), "exception_type": type(ex).__name__}})
+
+            return StartJobResult({"job_id": start_job_request.job_id, "success": True})
+
+        results = await asyncio.gather(*map(submit, start_jobs_request.jobs))
+
+        return StartJobsResponse({"results": results})
+
     @api.get("/jobs/{job_id}/status")
     @oapi.responds_with(JobStatusResponse)
     async def get_job_status(job_id: str):
@@ -77,6 +279,33 @@ def create_shepherd_routes(shepherd: Shepherd, storage: Storage) -> web.RouteTab
 
         return status
 
+    @api.post("/jobs/status")
+    @oapi.accepts(JobStatusesRequest)
+    @oapi.responds_with(JobStatusesResponse)
+    async def get_job_statuses(job_statuses_request: JobStatusesRequest):
+        """
+        Get status information for multiple jobs. Only the jobs unknown to the shepherd are looked up in the storage.
+        """
+        semaphore = asyncio.Semaphore(batch_concurrency)
+
+        async def get_status(job_id: str) -> Optional[JobStatusModel]:
+            status = shepherd.get_job_status(job_id)
+            if status is not None:
+                return status
+
+            async with semaphore:
+                try:
+                    return await storage.get_job_status(job_id)
+                except UnknownJobError:
+                    return None
+
+        job_ids = list(dict.fromkeys(job_statuses_request.job_ids))
+        statuses = dict(zip(job_ids, await asyncio.gather(*map(get_status, job_ids))))
+        unknown = [job_id for job_id, status in statuses.items() if status is None]
+
+        known = {job_id: status for job_id, status in statuses.items() if status is not None}
+        return JobStatusesResponse({"statuses": known, "unknown": unknown})
+
     @api.get("/jobs/{job_id}/wait_ready")
     @oapi.responds_with(JobStatusResponse)
     async def wait_ready(job_id: str):
@@ -86,12 +315,28 @@ def create_shepherd_routes(shepherd: Shepherd, storage: Storage) -> web.RouteTab
         :param job_id: An identifier of the queried job
         """
 
-        await check_job_dir_exists(storage, job_id)
-        async with shepherd.job_done_condition:
-            while not await shepherd.is_job_done(job_id):
-                await shepherd.job_done_condition.wait()
+        return await shepherd.wait_job_done(job_id)
 
-        return await storage.get_job_status(job_id)
+    @api.get("/jobs/{job_id}/events")
+    async def get_job_events(request, job_id: str):
+        """
+        Stream the status changes of the specified job as server-sent events until it is done.
+
+        :param job_id: An identifier of the job
+        """
+
+        return await stream_job_events(request, shepherd, [job_id])
+
+    @api.get("/jobs/events")
+    @oapi.accepts_qs("job_ids")
+    async def get_jobs_events(request, job_ids: str):
+        """
+        Stream the status changes of the specified jobs as server-sent events until all of them are done.
+
+        :param job_ids: Comma-separated identifiers of the jobs
+        """
+
+        return await stream_job_events(request, shepherd, [job_id for job_id in job_ids.split(",") if job_id])
 
     @api.get("/jobs/{job_id}/result/{result_file}")
     @api.get("/jobs/{job_id}/result")
@@ -108,7 +353,7 @@ def create_shepherd_routes(shepherd: Shepherd, storage: Storage) -> web.RouteTab
         """
 
         await check_job_dir_exists(storage, job_id)
-        status = await storage.get_job_status(job_id)
+        status = shepherd.get_job_status(job_id) or await storage.get_job_status(job_id)
 
         if status is not None and status.status == JobStatus.FAILED:
             return JobErrorResponse(dict(message=status.error_details.message))
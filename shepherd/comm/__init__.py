@@ -2,4 +2,4 @@
 from .messages import *
 from .messenger import Messenger
 
-__all__ = ['Message', 'InputMessage', 'DoneMessage', 'ErrorMessage', 'Messenger']
+__all__ = ['Message', 'InputMessage', 'DoneMessage', 'ErrorMessage', 'HeartbeatMessage', 'ReadyMessage', 'Messenger']
@@ -57,6 +57,16 @@ class ErrorMessage(Message):
     """Exception traceback (where applicable)."""
 
 
+class HeartbeatMessage(Message):
+    """Message checking whether the runner is ready, the runner replies with :py:class:`ReadyMessage`."""
+    pass
+
+
+class ReadyMessage(Message):
+    """Message informing :py:class:`shepherd.shepherd.Shepherd` that the runner is ready to process jobs."""
+    pass
+
+
 class MessageWrapper(Model):
     """Message wrapper allowing simple en/de-coding."""
 
@@ -1,4 +1,4 @@
-from typing import Union, Sequence
+from typing import Sequence
 
 import zmq
 import zmq.asyncio
@@ -38,7 +38,7 @@ class Messenger:
 
     @staticmethod
     async def recv(socket: zmq.asyncio.Socket, expected_message_types: Optional[Sequence[type]]=None,
-                   noblock: bool=False) -> Union[InputMessage, DoneMessage, ErrorMessage]:
+                   noblock: bool=False) -> Message:
         """
 
         Receive, decode and return a message from the given socket.
@@ -5,7 +5,8 @@ import ruamel.yaml
 from typing import Optional, Dict, Any
 
 from schematics import Model
-from schematics.types import ModelType, DictType, StringType, URLType, BaseType
+from schematics.exceptions import ValidationError
+from schematics.types import ModelType, DictType, StringType, URLType, BaseType, BooleanType, IntType, FloatType
 
 
 def strip_url_scheme(url):
@@ -25,9 +26,39 @@ def strip_url_scheme(url):
 
 
 class StorageConfig(Model):
-    url: str = StringType(required=True)
-    access_key: str = StringType(required=True)
-    secret_key: str = StringType(required=True)
+    type: str = StringType(default="minio", choices=["minio", "local", "memory"])
+    url: Optional[str] = StringType(required=False)  # minio only
+    access_key: Optional[str] = StringType(required=False)  # minio only
+    secret_key: Optional[str] = StringType(required=False)  # minio only
+    path: Optional[str] = StringType(required=False)  # root directory of the local storage
+    memory_limit: Optional[int] = IntType(required=False, min_value=0)  # maximum size (bytes) of the in-memory storage
+    multipart_threshold: int = IntType(default=64 * 1024 ** 2, min_value=1)  # min. size of multipart uploads (bytes)
+    multipart_part_size: int = IntType(default=16 * 1024 ** 2, min_value=5 * 1024 ** 2)  # upload part size (bytes)
+    multipart_concurrency: int = IntType(default=4, min_value=1)  # number of parts uploaded in parallel
+    ranged_download_threshold: int = IntType(default=64 * 1024 ** 2, min_value=1)  # min. size of ranged downloads
+    ranged_download_part_size: int = IntType(default=16 * 1024 ** 2, min_value=1)  # download range size (bytes)
+    ranged_download_concurrency: int = IntType(default=4, min_value=1)  # number of ranges downloaded in parallel
+    max_transfers: int = IntType(default=64, min_value=1)  # maximum number of files transferred in parallel
+    max_job_transfers: int = IntType(default=16, min_value=1)  # maximum number of files of one job transferred at once
+    connection_limit: int = IntType(default=100, min_value=0)  # maximum number of open connections (0 for no limit)
+    connection_limit_per_host: int = IntType(default=0, min_value=0)  # the same per host (0 for no limit)
+    keepalive_timeout: float = FloatType(default=15, min_value=0)  # seconds to keep idle connections open
+    dns_cache_ttl: Optional[int] = IntType(default=10, min_value=0)  # seconds to cache resolved addresses
+    connect_timeout: Optional[float] = FloatType(required=False, min_value=0)  # seconds to establish a connection
+    read_timeout: Optional[float] = FloatType(required=False, min_value=0)  # seconds to wait for the next data chunk
+    request_timeout: Optional[float] = FloatType(required=False, min_value=0)  # seconds for a whole request
+    retries: int = IntType(default=3, min_value=0)  # maximum number of retries of a failed idempotent request
+    retry_base_delay: float = FloatType(default=0.1, min_value=0)  # seconds before the first retry (doubled then)
+    retry_max_delay: float = FloatType(default=5, min_value=0)  # maximum number of seconds between retries
+
+    _REQUIRED_OPTIONS = {"minio": ("url", "access_key", "secret_key"), "local": ("path",), "memory": ()}
+    """Options required by the storage types."""
+
+    def validate_type(self, data, value):
+        missing = [option for option in self._REQUIRED_OPTIONS.get(value, ()) if data.get(option) is None]
+        if missing:
+            raise ValidationError(f"Storage of type `{value}` requires {', '.join(missing)}")
+        return value
 
     @property
     def schemeless_url(self):
@@ -56,12 +87,26 @@ class LoggingConfig(Model):
         return getattr(logging, self.level.upper())
 
 
+class SchedulerConfig(Model):
+    policy: str = StringType(default="model_affinity",
+                             choices=["round_robin", "least_loaded", "model_affinity", "priority"])
+    work_stealing: bool = BooleanType(default=True)
+    steal_threshold: int = IntType(default=2, min_value=1)
+
+
 class ShepherdConfig(Model):
     data_root: str = StringType(required=True)
     storage: StorageConfig = ModelType(StorageConfig, required=True)
     logging: LoggingConfig = ModelType(LoggingConfig, required=False, default=LoggingConfig(dict(level='info')))
     sheep: Dict[str, Dict[str, Any]] = DictType(DictType(BaseType), required=True)
     registry: Optional[RegistryConfig] = ModelType(RegistryConfig, required=False)
+    scheduler: SchedulerConfig = ModelType(SchedulerConfig, required=False,
+                                           default=SchedulerConfig(dict(policy='model_affinity')))
+    upload_workers: int = IntType(default=4, min_value=1)
+    status_workers: int = IntType(default=4, min_value=1)  # maximum number of job statuses written in parallel
+    status_cache_size: int = IntType(default=10000, min_value=0)  # number of finished job statuses kept in memory
+    # maximum number of jobs of a batch request processed at once
+    batch_concurrency: int = IntType(default=32, min_value=1)
 
 
 def load_shepherd_config(config_stream) -> ShepherdConfig:
@@ -32,3 +32,13 @@ DEFAULT_OUTPUT_PATH = OUTPUT_DIR + "/" + DEFAULT_OUTPUT_FILE
 """
 Default path to the output of a runner in a job bucket
 """
+
+CONCURRENCY_ENV_VAR = "SHEPHERD_RUNNER_CONCURRENCY"
+"""
+Environment variable with the default number of jobs processed by a runner in parallel
+"""
+
+PRELOAD_ENV_VAR = "SHEPHERD_RUNNER_PRELOAD"
+"""
+Environment variable which makes a runner run the warm-up job before accepting jobs if non-empty
+"""
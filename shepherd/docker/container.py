@@ -1,9 +1,11 @@
+import asyncio
 import logging
+import subprocess
 from typing import Dict, Optional, List
 
 from .image import DockerImage
 from ..errors.docker import DockerError
-from .utils import run_docker_command, kill_blocking_container
+from .utils import run_docker_command, kill_blocking_container, parse_memory_size
 
 
 class DockerContainer:
@@ -103,6 +105,21 @@ class DockerContainer:
         run_docker_command(['kill', self._container_id])
         self._container_id = None
 
+    async def wait(self) -> None:
+        """
+        Wait until the underlying docker container exits.
+        Returns immediately if the container was not even started.
+        """
+        if self._container_id is None:
+            return
+        process = await asyncio.create_subprocess_exec('docker', 'wait', self._container_id,
+                                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            await process.wait()
+        finally:
+            if process.returncode is None:
+                process.kill()
+
     @property
     def running(self) -> bool:
         """
@@ -116,3 +133,16 @@ class DockerContainer:
         output = run_docker_command(['ps', '--filter', 'id={}'.format(self._container_id)])
         # If the command output contains more than one line, the container was found (the first line is a header)
         return len(output.split('\n')) > 1
+
+    @property
+    def memory_usage(self) -> Optional[int]:
+        """
+        Get the memory used by the underlying docker container.
+        Returns ``None`` if the container is not running or its memory usage cannot be parsed.
+
+        :return: used memory in bytes
+        """
+        if self._container_id is None:
+            return None
+        output = run_docker_command(['stats', '--no-stream', '--format', '{{.MemUsage}}', self._container_id])
+        return parse_memory_size(output.split('/')[0])
@@ -1,6 +1,7 @@
+import re
 import logging
 import subprocess
-from typing import List
+from typing import List, Optional
 
 from ..errors.docker import DockerError
 
@@ -25,6 +26,31 @@ def kill_blocking_container(host_port: int) -> None:
                 return
 
 
+_MEMORY_UNITS = {'B': 1, 'KB': 10**3, 'MB': 10**6, 'GB': 10**9, 'TB': 10**12,
+                 'KIB': 2**10, 'MIB': 2**20, 'GIB': 2**30, 'TIB': 2**40}
+"""Multipliers of the memory units used by ``docker stats``."""
+
+
+def parse_memory_size(size: str) -> Optional[int]:
+    """
+    Parse a human readable memory size as reported by ``docker stats``.
+
+    >>> parse_memory_size('1.5KiB')
+    1536
+    >>> parse_memory_size('12MB')
+    12000000
+    >>> parse_memory_size('--') is None
+    True
+
+    :param size: memory size, e.g. ``12.3MiB``
+    :return: memory size in bytes or ``None`` if it cannot be parsed
+    """
+    match = re.match(r'\s*([0-9.]+)\s*([a-zA-Z]+)\s*$', size)
+    if match is None or match.group(2).upper() not in _MEMORY_UNITS:
+        return None
+    return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2).upper()])
+
+
 def run_docker_command(command: List[str]) -> str:
     """
     Run and wait the given docker command. Return its stdout.
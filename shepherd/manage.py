@@ -6,7 +6,7 @@ import emloop as el
 from aiohttp import web
 import aiohttp_cors
 
-from .storage import MinioStorage
+from .storage import MinioStorage, LocalFsStorage, InMemoryStorage
 from .api import create_app
 from .shepherd import Shepherd
 from .sheep.welcome import welcome
@@ -37,15 +37,21 @@ def run(host, port, config_file) -> None:
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     welcome()
 
-    # create minio, shepherd and API handles
-    logging.debug('Creating minio handle')
-    storage = MinioStorage(config.storage)
+    # create storage, shepherd and API handles
+    logging.debug('Creating %s storage handle', config.storage.type)
+    if config.storage.type == "local":
+        storage = LocalFsStorage(config.storage)
+    elif config.storage.type == "memory":
+        storage = InMemoryStorage(config.storage)
+    else:
+        storage = MinioStorage(config.storage)
 
     logging.debug('Creating shepherd')
-    shepherd = Shepherd(config.sheep, config.data_root, storage, config.registry)
+    shepherd = Shepherd(config.sheep, config.data_root, storage, config.registry, config.scheduler,
+                        config.upload_workers, config.status_workers, config.status_cache_size)
 
     app = create_app()
-    app.add_routes(create_shepherd_routes(shepherd, storage))
+    app.add_routes(create_shepherd_routes(shepherd, storage, config.batch_concurrency))
 
     cors = aiohttp_cors.setup(app, defaults={
         "*": aiohttp_cors.ResourceOptions(
@@ -1,4 +1,5 @@
 from .base_runner import BaseRunner, n_available_gpus
 from .json_runner import JSONRunner, to_json_serializable, run
+from .batching_runner import BatchingJSONRunner
 
-__all__ = ['BaseRunner', 'JSONRunner', 'to_json_serializable', 'run', 'n_available_gpus']
+__all__ = ['BaseRunner', 'JSONRunner', 'BatchingJSONRunner', 'to_json_serializable', 'run', 'n_available_gpus']
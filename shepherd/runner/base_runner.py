@@ -1,9 +1,13 @@
 import re
 import os
+import asyncio
 import logging
+import tempfile
+import threading
 import traceback
 import os.path as path
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Any, Dict
 
 import zmq
@@ -43,13 +47,28 @@ class BaseRunner:
     :py:class:`BaseRunner` manages the socket, messages and many more. See :py:meth:`_process_job` for more info.
     """
 
-    def __init__(self, config_path: str, port: int, stream_name: str):
-        """Create new :py:class:`Runner`."""
+    def __init__(self, config_path: str, port: int, stream_name: str, concurrency: int = 1, preload: bool = False,
+                 warmup: Optional[str] = None):
+        """
+        Create new :py:class:`Runner`.
+
+        :param config_path: emloop configuration file path
+        :param port: socket port to bind to
+        :param stream_name: dataset stream name
+        :param concurrency: maximum number of jobs processed in parallel
+        :param preload: process the warm-up job (if configured) before accepting jobs
+        :param warmup: optional directory with warm-up job inputs, relative paths are resolved against the
+                       configuration directory
+        """
         logging.info('Creating emloop runner from `%s` listening on port %s', config_path, port)
 
         # bind to the socket
         self._port = port
         self._socket = None
+        self._concurrency = concurrency
+        self._preload = preload
+        self._warmup = warmup
+        self._load_lock = threading.RLock()
 
         self._config_path: str = config_path
         self._stream_name: str = stream_name
@@ -62,42 +81,62 @@ class BaseRunner:
         Maybe load the **emloop** configuration from previously specified file and apply updates
         from ``eval.<stream_name>`` section.
         """
-        if self._config is None:
-            logging.debug('Loading config from `%s', self._config_path)
-            # load config
-            self._config = load_config(config_file=find_config(self._config_path))
-            if 'eval' in self._config and self._stream_name in self._config['eval']:
-                logging.debug('Applying eval config updates for stream `%s`', self._stream_name)
-                update_section = self._config['eval'][self._stream_name]
-                for subsection in ['dataset', 'model', 'main_loop']:
-                    if subsection in update_section:
-                        self._config[subsection].update(update_section[subsection])
-                if 'hooks' in update_section:
-                    self._config['hooks'] = update_section['hooks']
-                else:
-                    logging.warning('Config does not contain `eval.%s.hooks` section. '
-                                    'No hook will be employed during the evaluation.', self._stream_name)
-                    self._config['hooks'] = []
-            self._config["model"]["n_gpus"] = n_available_gpus()
-            validate_config(self._config)
-            logging.debug('Loaded config: %s', self._config)
+        with self._load_lock:
+            if self._config is None:
+                logging.debug('Loading config from `%s', self._config_path)
+                # load config
+                self._config = load_config(config_file=find_config(self._config_path))
+                if 'eval' in self._config and self._stream_name in self._config['eval']:
+                    logging.debug('Applying eval config updates for stream `%s`', self._stream_name)
+                    update_section = self._config['eval'][self._stream_name]
+                    for subsection in ['dataset', 'model', 'main_loop']:
+                        if subsection in update_section:
+                            self._config[subsection].update(update_section[subsection])
+                    if 'hooks' in update_section:
+                        self._config['hooks'] = update_section['hooks']
+                    else:
+                        logging.warning('Config does not contain `eval.%s.hooks` section. '
+                                        'No hook will be employed during the evaluation.', self._stream_name)
+                        self._config['hooks'] = []
+                self._config["model"]["n_gpus"] = n_available_gpus()
+                validate_config(self._config)
+                logging.debug('Loaded config: %s', self._config)
 
     def _load_dataset(self) -> None:
         """Maybe load dataset."""
-        if self._dataset is None:
-            self._load_config()
-            logging.info('Creating dataset')
-            self._dataset = el.create_dataset(self._config, None)
+        with self._load_lock:
+            if self._dataset is None:
+                self._load_config()
+                logging.info('Creating dataset')
+                self._dataset = el.create_dataset(self._config, None)
 
     def _load_model(self) -> None:
         """Maybe load model."""
-        if self._model is None:
-            self._load_config()
-            logging.info('Creating model')
-            restore_from = self._config_path
-            if not path.isdir(restore_from):
-                restore_from = path.dirname(restore_from)
-            self._model = el.create_model(self._config, None, self._dataset, restore_from)
+        with self._load_lock:
+            if self._model is None:
+                self._load_config()
+                logging.info('Creating model')
+                restore_from = self._config_path
+                if not path.isdir(restore_from):
+                    restore_from = path.dirname(restore_from)
+                self._model = el.create_model(self._config, None, self._dataset, restore_from)
+
+    def _preload_model(self) -> None:
+        """
+        Load the dataset and model and, if ``preload`` is set, process the warm-up job (if configured) so that
+        the first real job does not pay for the (lazy) initialization.
+        """
+        self._load_dataset()
+        self._load_model()
+        if not self._preload or self._warmup is None:
+            return
+
+        config_dir = self._config_path if path.isdir(self._config_path) else path.dirname(self._config_path)
+        warmup_input_path = path.join(config_dir, self._warmup)
+        logging.info('Processing warm-up job from `%s`', warmup_input_path)
+        with tempfile.TemporaryDirectory() as warmup_output_path:
+            self._process_job(warmup_input_path, warmup_output_path)
+        logging.info('Warm-up job done')
 
     @abstractmethod
     def _process_job(self, input_path: str, output_path: str) -> None:
@@ -108,36 +147,79 @@ class BaseRunner:
         :param output_path: output directory path
         """
 
+    async def _run_job(self, input_path: str, output_path: str, executor: ThreadPoolExecutor) -> None:
+        """
+        Process a job in the given executor, see :py:meth:`_process_job`.
+
+        :param input_path: input directory path
+        :param output_path: output directory path
+        :param executor: executor to process the job in
+        """
+        await asyncio.get_event_loop().run_in_executor(executor, self._process_job, input_path, output_path)
+
+    async def _handle_job(self, input_message: InputMessage, executor: ThreadPoolExecutor) -> None:
+        """
+        Process the job from the given message in the given executor and reply with ``DoneMessage`` or
+        ``ErrorMessage``.
+
+        :param input_message: message with the job to be processed
+        :param executor: executor to process the job in
+        """
+        job_id = input_message.job_id
+        io_data_root = input_message.io_data_root
+        logging.info('Received job `%s` with io data root `%s`', job_id, io_data_root)
+        try:
+            input_path = path.join(io_data_root, job_id, INPUT_DIR)
+            output_path = path.join(io_data_root, job_id, OUTPUT_DIR)
+            await self._run_job(input_path, output_path, executor)
+            logging.info('Job `%s` done, sending DoneMessage', job_id)
+            await Messenger.send(self._socket, DoneMessage(dict(job_id=job_id)), input_message)
+
+        except asyncio.CancelledError:
+            raise
+
+        except BaseException as ex:
+            logging.exception(ex)
+
+            logging.error('Sending ErrorMessage for job `%s`', job_id)
+            short_erorr = "{}: {}".format(type(ex).__name__, str(ex))
+            long_error = str(traceback.format_tb(ex.__traceback__))
+            error_message = ErrorMessage(dict(job_id=job_id, message=short_erorr,
+                                              exception_traceback=long_error, exception_type=str(type(ex))))
+            await Messenger.send(self._socket, error_message, input_message)
+
     async def process_all(self) -> None:
-        """Listen on the ``self._socket`` and process the incoming jobs in an endless loop."""
+        """
+        Listen on the ``self._socket`` and process the incoming jobs in an endless loop.
+        Up to ``concurrency`` jobs are processed in parallel in a thread pool.
+        The dataset and model are loaded (and warmed-up if ``preload`` is set) before the socket is bound.
+        Every ``HeartbeatMessage`` is answered with a ``ReadyMessage``, hence the shepherd knows the runner is ready
+        only once the model is loaded.
+        """
         logging.info('Starting the loop')
+        executor = ThreadPoolExecutor(max_workers=self._concurrency)
+        jobs = set()
         try:
+            logging.info('Loading the model')
+            await asyncio.get_event_loop().run_in_executor(executor, self._preload_model)
+
             logging.debug('Creating socket')
             self._socket: zmq.Socket = zmq.asyncio.Context.instance().socket(zmq.ROUTER)
             self._socket.setsockopt(zmq.IDENTITY, b"runner")
             self._socket.bind("tcp://0.0.0.0:{}".format(self._port))
             while True:
                 logging.info('Waiting for a job')
-                input_message: InputMessage = await Messenger.recv(self._socket, [InputMessage])
-                job_id = input_message.job_id
-                io_data_root = input_message.io_data_root
-                logging.info('Received job `%s` with io data root `%s`', job_id, io_data_root)
-                try:
-                    input_path = path.join(io_data_root, job_id, INPUT_DIR)
-                    output_path = path.join(io_data_root, job_id, OUTPUT_DIR)
-                    self._process_job(input_path, output_path)
-                    logging.info('Job `%s` done, sending DoneMessage', job_id)
-                    await Messenger.send(self._socket, DoneMessage(dict(job_id=job_id)), input_message)
-
-                except BaseException as ex:
-                    logging.exception(ex)
-
-                    logging.error('Sending ErrorMessage for job `%s`', job_id)
-                    short_erorr = "{}: {}".format(type(ex).__name__, str(ex))
-                    long_error = str(traceback.format_tb(ex.__traceback__))
-                    error_message = ErrorMessage(dict(job_id=job_id, message=short_erorr,
-                                                      exception_traceback=long_error, exception_type=str(type(ex))))
-                    await Messenger.send(self._socket, error_message, input_message)
+                input_message = await Messenger.recv(self._socket, [InputMessage, HeartbeatMessage])
+                if isinstance(input_message, HeartbeatMessage):
+                    logging.debug('Received heartbeat, sending ReadyMessage')
+                    await Messenger.send(self._socket, ReadyMessage(), input_message)
+                    continue
+                job = asyncio.create_task(self._handle_job(input_message, executor))
+                jobs.add(job)
+                job.add_done_callback(jobs.discard)
         finally:
+            for job in jobs:
+                job.cancel()
+            executor.shutdown(wait=False)
             if self._socket is not None:
                 self._socket.close(0)
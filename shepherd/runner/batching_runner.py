@@ -0,0 +1,214 @@
+import json
+import asyncio
+import logging
+import os.path as path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Optional, Dict, Sequence, Any, Set
+
+import emloop as el
+import numpy as np
+
+from ..constants import DEFAULT_PAYLOAD_FILE, DEFAULT_OUTPUT_FILE
+from .json_runner import JSONRunner, to_json_serializable
+
+
+def batch_size(batch: el.Batch) -> int:
+    """Return the number of examples in the given batch."""
+    return len(next(iter(batch.values())))
+
+
+def concatenate_batches(batches: Sequence[el.Batch]) -> el.Batch:
+    """
+    Concatenate the given batches with the same sources into a single batch.
+
+    :param batches: batches to be concatenated
+    :return: the concatenated batch
+    :raise ValueError: if the batches have different sources
+    """
+    sources = set(batches[0].keys())
+    if any(set(batch.keys()) != sources for batch in batches):
+        raise ValueError('Batches with different sources cannot be concatenated')
+
+    result = {}
+    for source in sources:
+        values = [batch[source] for batch in batches]
+        if all(isinstance(value, np.ndarray) for value in values):
+            result[source] = np.concatenate(values)
+        else:
+            result[source] = [item for value in values for item in value]
+    return result
+
+
+def split_batch(batch: el.Batch, sizes: Sequence[int]) -> List[el.Batch]:
+    """
+    Split the given batch into consecutive batches of the given sizes.
+
+    :param batch: batch to be split
+    :param sizes: sizes of the resulting batches
+    :return: the list of the resulting batches
+    """
+    batches = []
+    offset = 0
+    for size in sizes:
+        batches.append({source: value[offset:offset+size] for source, value in batch.items()})
+        offset += size
+    return batches
+
+
+class BatchingJSONRunner(JSONRunner):
+    """
+    :py:class:`shepherd.runner.JSONRunner` which processes multiple jobs with a single model call.
+
+    The incoming jobs are collected for up to ``batch_window`` seconds or until there is ``max_batch_size`` of them.
+    Stream batches of all the collected jobs are concatenated, the model is run once and the results are split back
+    to the individual jobs. Jobs producing batches with different sources are processed one by one.
+
+    The sheep should be configured with ``concurrency`` of at least ``max_batch_size``, otherwise it does not send
+    enough jobs to fill the batches.
+    """
+
+    def __init__(self, *args, max_batch_size: int = 8, batch_window: float = 0.01, **kwargs):
+        """
+        Create new :py:class:`BatchingJSONRunner`.
+
+        :param args: :py:class:`shepherd.runner.BaseRunner`'s args
+        :param max_batch_size: maximum number of jobs processed together
+        :param batch_window: maximum time (in seconds) to wait for more jobs to be processed together
+        :param kwargs: :py:class:`shepherd.runner.BaseRunner`'s kwargs
+        """
+        super().__init__(*args, **kwargs)
+        self._max_batch_size = max_batch_size
+        self._batch_window = batch_window
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._batches: Set[asyncio.Task] = set()  # batches being processed
+
+    def _process_jobs(self, jobs: Sequence[Tuple[str, str]]) -> List[Optional[BaseException]]:
+        """
+        Process the given jobs together.
+
+        :param jobs: sequence of (input directory path, output directory path) pairs
+        :return: list of the errors encountered when processing the respective jobs (``None`` for successful jobs)
+        """
+        self._load_dataset()
+        self._load_model()
+        errors: List[Optional[BaseException]] = [None] * len(jobs)
+
+        # collect the stream batches of all the jobs
+        input_batches: List[el.Batch] = []
+        batch_jobs: List[int] = []
+        for i, (input_path, _) in enumerate(jobs):
+            try:
+                with open(path.join(input_path, DEFAULT_PAYLOAD_FILE)) as payload_file:
+                    payload = json.load(payload_file)
+                job_batches = list(getattr(self._dataset, self._stream_name + '_stream')(payload))
+            except Exception as ex:
+                errors[i] = ex
+                continue
+            input_batches += job_batches
+            batch_jobs += [i] * len(job_batches)
+
+        # run the model once for all the batches (or one by one if they cannot be concatenated)
+        try:
+            merged_batch = concatenate_batches(input_batches) if input_batches else None
+        except ValueError:
+            logging.warning('Stream batches cannot be concatenated, processing them one by one')
+            merged_batch = None
+
+        if merged_batch is not None:
+            logging.info('Running the model on %s batches of %s jobs', len(input_batches), len(jobs))
+            output_batch = self._model.run(merged_batch, train=False, stream=None)
+            output_batches = split_batch(output_batch, [batch_size(batch) for batch in input_batches])
+            input_batches = split_batch(merged_batch, [batch_size(batch) for batch in input_batches])
+        else:
+            output_batches = [self._model.run(batch, train=False, stream=None) for batch in input_batches]
+
+        # post-process and save the results of the individual jobs
+        results: Dict[int, Dict[str, List[Any]]] = defaultdict(lambda: defaultdict(list))
+        for i, input_batch, output_batch in zip(batch_jobs, input_batches, output_batches):
+            if hasattr(self._dataset, 'postprocess_batch'):
+                output_batch = self._dataset.postprocess_batch(input_batch=input_batch, output_batch=output_batch)
+            for source, value in output_batch.items():
+                results[i][source] += list(value)
+
+        for i, (_, output_path) in enumerate(jobs):
+            if errors[i] is None:
+                try:
+                    with open(path.join(output_path, DEFAULT_OUTPUT_FILE), 'w') as output_file:
+                        json.dump(to_json_serializable(results[i]), output_file)
+                except Exception as ex:
+                    errors[i] = ex
+
+        return errors
+
+    async def _process_batch(self, jobs: Sequence[Tuple[str, str, asyncio.Future]],
+                             executor: ThreadPoolExecutor) -> None:
+        """
+        Process the given jobs together in the given executor and resolve their futures.
+
+        :param jobs: sequence of (input directory path, output directory path, future) triplets
+        :param executor: executor to process the jobs in
+        """
+        try:
+            errors = await asyncio.get_event_loop().run_in_executor(
+                executor, self._process_jobs, [(input_path, output_path) for input_path, output_path, _ in jobs])
+        except BaseException as ex:
+            errors = [ex] * len(jobs)
+
+        for (_, _, future), error in zip(jobs, errors):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    def _flush(self, executor: ThreadPoolExecutor) -> None:
+        """
+        Start processing the pending jobs.
+
+        :param executor: executor to process the jobs in
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        jobs, self._pending = self._pending, []
+        if jobs:
+            batch = asyncio.create_task(self._process_batch(jobs, executor))
+            self._batches.add(batch)
+            batch.add_done_callback(self._batches.discard)
+
+    async def process_all(self) -> None:
+        """
+        Process the incoming jobs (see :py:meth:`shepherd.runner.BaseRunner.process_all`).
+        The batches being processed are cancelled once the processing terminates.
+        """
+        try:
+            await super().process_all()
+        finally:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            for batch in self._batches:
+                batch.cancel()
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+    async def _run_job(self, input_path: str, output_path: str, executor: ThreadPoolExecutor) -> None:
+        """
+        Add the job to the pending batch and wait until the batch is processed.
+
+        :param input_path: input directory path
+        :param output_path: output directory path
+        :param executor: executor to process the job in
+        """
+        future = asyncio.get_event_loop().create_future()
+        self._pending.append((input_path, output_path, future))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush(executor)
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_event_loop().call_later(self._batch_window, self._flush, executor)
+
+        await future
@@ -1,12 +1,15 @@
 import asyncio
 import os
 import sys
+import inspect
 import logging
 import os.path as path
 from argparse import ArgumentParser
 
 import emloop as el
 
+from ..constants import CONCURRENCY_ENV_VAR, PRELOAD_ENV_VAR
+
 
 __all__ = ['main']
 
@@ -17,6 +20,10 @@ def create_argparser():
     parser.add_argument('-p', '--port', dest="port", default=9999, type=int, help='Socket port to bind to')
     parser.add_argument('-s', '--stream', default='predict', help='Dataset stream name')
     parser.add_argument('-r', '--runner', default='shepherd.runner.JSONRunner', help='Fully qualified runner class')
+    parser.add_argument('-c', '--concurrency', type=int, default=int(os.environ.get(CONCURRENCY_ENV_VAR, 1)),
+                        help='Maximum number of jobs processed in parallel')
+    parser.add_argument('-l', '--preload', action='store_true', default=bool(os.environ.get(PRELOAD_ENV_VAR)),
+                        help='Process the warm-up job before accepting jobs')
     parser.add_argument('config_path', help='emloop configuration file path')
     return parser
 
@@ -41,15 +48,26 @@ def main() -> None:
     if path.isfile(args.config_path):
         config_dir = path.dirname(args.config_path)
 
+    runner_kwargs = {}
     runner_config_file = path.join(config_dir, 'runner.yaml')
     if path.exists(runner_config_file):
         logging.info('Using custom runner configuration file')
         runner_config = el.utils.load_config(path.join(runner_config_file))
         runner_fqn = runner_config['runner']['class']
+        runner_kwargs.update({key: value for key, value in runner_config['runner'].items() if key != 'class'})
 
     # create runner
     module, class_ = el.utils.parse_fully_qualified_name(runner_fqn)
-    runner = el.utils.create_object(module, class_, args=(args.config_path, args.port, args.stream))
+    runner_class = el.utils.get_attribute(module, class_)
+
+    # custom runners written before the concurrency and preload options existed do not accept them
+    parameters = inspect.signature(runner_class).parameters
+    accepts_any = any(parameter.kind == inspect.Parameter.VAR_KEYWORD for parameter in parameters.values())
+    for key, value in (('concurrency', args.concurrency), ('preload', args.preload)):
+        if accepts_any or key in parameters:
+            runner_kwargs.setdefault(key, value)
+
+    runner = runner_class(args.config_path, args.port, args.stream, **runner_kwargs)
 
     # listen for input messages
     asyncio.run(runner.process_all())
@@ -0,0 +1,16 @@
+from .base_scheduler import Scheduler, QueuedJob
+from .round_robin_scheduler import RoundRobinScheduler
+from .least_loaded_scheduler import LeastLoadedScheduler
+from .model_affinity_scheduler import ModelAffinityScheduler
+from .priority_scheduler import PriorityScheduler
+
+SCHEDULERS = {
+    'round_robin': RoundRobinScheduler,
+    'least_loaded': LeastLoadedScheduler,
+    'model_affinity': ModelAffinityScheduler,
+    'priority': PriorityScheduler
+}
+"""Mapping of scheduling policy names to scheduler classes."""
+
+__all__ = ['Scheduler', 'QueuedJob', 'RoundRobinScheduler', 'LeastLoadedScheduler', 'ModelAffinityScheduler',
+           'PriorityScheduler', 'SCHEDULERS']
@@ -0,0 +1,154 @@
+import abc
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Mapping, List, Set, Optional, NamedTuple, Hashable
+
+from ..sheep import BaseSheep
+from ..api.models import ModelModel
+
+
+class QueuedJob(NamedTuple):
+    """A job waiting in the scheduler queue."""
+
+    job_id: str
+    """**shepherd** job id."""
+
+    model: ModelModel
+    """Model required by the job."""
+
+    sheep_id: Optional[str] = None
+    """Id of the sheep the job is pinned to (if any)."""
+
+    priority: int = 0
+    """Job priority (higher is more urgent)."""
+
+
+class Scheduler(metaclass=abc.ABCMeta):
+    """
+    A base class for job schedulers - classes deciding which queued job should be processed by which sheep.
+
+    All the jobs are kept in a single central queue. Sheep pull jobs from it once they have free capacity and the
+    scheduling policy (see :py:meth:`_select_job`) picks the job each sheep receives.
+
+    If the policy keeps the queued jobs for other sheep, an idle sheep may steal the oldest job from the longest
+    backlog of such jobs (see :py:meth:`_steal_job`).
+    """
+
+    def __init__(self, sheep: Mapping[str, BaseSheep], work_stealing: bool = True, steal_threshold: int = 2):
+        """
+        Create new :py:class:`Scheduler`.
+
+        :param sheep: mapping of sheep ids to the sheep the jobs are scheduled for
+        :param work_stealing: allow idle sheep to steal jobs kept for other sheep
+        :param steal_threshold: minimal length of a backlog an idle sheep may steal from
+        """
+        self._sheep = sheep
+        self._work_stealing = work_stealing
+        self._steal_threshold = steal_threshold
+        self._jobs: List[QueuedJob] = []  # queued jobs in the order of arrival
+        self._waiting: Set[str] = set()  # ids of sheep waiting for a job
+        self._condition = asyncio.Condition()
+
+    def __len__(self) -> int:
+        """Return the number of queued jobs."""
+        return len(self._jobs)
+
+    def _load(self, sheep_id: str) -> int:
+        """
+        Get the number of jobs assigned to the given sheep.
+
+        :param sheep_id: sheep id
+        :return: the number of jobs the sheep is working on or has prefetched
+        """
+        sheep = self._sheep[sheep_id]
+        return len(sheep.in_progress) + len(sheep.prefetched)
+
+    @staticmethod
+    def _runs_model(sheep: BaseSheep, model: ModelModel) -> bool:
+        """
+        Check if the given sheep is configured with the given model.
+
+        :param sheep: sheep to be checked
+        :param model: model to be checked
+        :return: true if the sheep runs the model, false otherwise
+        """
+        return sheep.model_name == model.name and sheep.model_version == model.version
+
+    def _backlog_key(self, job: QueuedJob) -> Hashable:
+        """
+        Get the key of the backlog the given job belongs to when it is kept for another sheep.
+
+        :param job: queued job
+        :return: backlog key, jobs requiring the same model are in the same backlog by default
+        """
+        return job.model.name, job.model.version
+
+    def _steal_job(self, sheep_id: str, jobs: List[QueuedJob]) -> Optional[QueuedJob]:
+        """
+        Steal the oldest job from the longest backlog of jobs the policy kept for other sheep.
+
+        :param sheep_id: id of the idle sheep
+        :param jobs: non-empty list of queued jobs the sheep may process (in the order of arrival)
+        :return: the stolen job or ``None`` if no backlog is long enough
+        """
+        backlogs = defaultdict(list)
+        for job in jobs:
+            backlogs[self._backlog_key(job)].append(job)
+
+        backlog = max(backlogs.values(), key=len)
+        if len(backlog) < self._steal_threshold:
+            return None
+
+        logging.info('Sheep `%s` steals job `%s` from a backlog of %s jobs', sheep_id, backlog[0].job_id, len(backlog))
+        return backlog[0]
+
+    @abc.abstractmethod
+    def _select_job(self, sheep_id: str, jobs: List[QueuedJob]) -> Optional[QueuedJob]:
+        """
+        Select the job to be processed by the given sheep.
+
+        :param sheep_id: id of the sheep asking for a job
+        :param jobs: non-empty list of queued jobs the sheep may process (in the order of arrival)
+        :return: the selected job or ``None`` if the sheep should wait for another one
+        """
+
+    async def enqueue(self, job: QueuedJob) -> None:
+        """
+        Put the given job to the queue.
+
+        :param job: job to be scheduled
+        """
+        async with self._condition:
+            self._jobs.append(job)
+            self._condition.notify_all()
+
+    async def dequeue(self, sheep_id: str) -> QueuedJob:
+        """
+        Wait for a job to be processed by the given sheep and remove it from the queue.
+
+        :param sheep_id: id of the sheep with free capacity
+        :return: the job to be processed
+        """
+        async with self._condition:
+            self._waiting.add(sheep_id)
+            try:
+                while True:
+                    jobs = [job for job in self._jobs if job.sheep_id is None or job.sheep_id == sheep_id]
+                    job = self._select_job(sheep_id, jobs) if jobs else None
+                    if job is None and jobs and self._work_stealing and self._load(sheep_id) == 0:
+                        job = self._steal_job(sheep_id, jobs)
+                    if job is not None:
+                        self._jobs.remove(job)
+                        self._condition.notify_all()
+                        return job
+                    await self._condition.wait()
+            finally:
+                self._waiting.discard(sheep_id)
+
+    async def notify(self) -> None:
+        """
+        Let the waiting sheep re-evaluate the queue, e.g. when the load or the model of some sheep has changed.
+        """
+        async with self._condition:
+            self._condition.notify_all()
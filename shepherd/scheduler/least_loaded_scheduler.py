@@ -0,0 +1,19 @@
+from typing import List, Optional
+
+from .base_scheduler import Scheduler, QueuedJob
+
+
+class LeastLoadedScheduler(Scheduler):
+    """
+    Scheduler processing the jobs in the order of arrival.
+    Each job is given to the least loaded of the sheep that are waiting for a job.
+    """
+
+    def _select_job(self, sheep_id: str, jobs: List[QueuedJob]) -> Optional[QueuedJob]:
+        """Select the oldest job unless there is a less loaded sheep waiting for it."""
+        load = self._load(sheep_id)
+        for job in jobs:
+            if job.sheep_id == sheep_id or not any(self._load(other_id) < load for other_id in self._waiting
+                                                   if other_id != sheep_id):
+                return job
+        return None
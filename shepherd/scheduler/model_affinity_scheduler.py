@@ -0,0 +1,26 @@
+from typing import List, Optional
+
+from .base_scheduler import Scheduler, QueuedJob
+
+
+class ModelAffinityScheduler(Scheduler):
+    """
+    Scheduler minimizing the number of model switches.
+
+    Jobs requiring a model which is already running on some sheep are kept for that sheep.
+    Jobs requiring a model which is not running anywhere are processed in the order of arrival by any sheep.
+    """
+
+    def _select_job(self, sheep_id: str, jobs: List[QueuedJob]) -> Optional[QueuedJob]:
+        """Select the oldest job with the sheep's model, or the oldest job no other sheep is running the model for."""
+        sheep = self._sheep[sheep_id]
+        for job in jobs:
+            if self._runs_model(sheep, job.model):
+                return job
+
+        for job in jobs:
+            if job.sheep_id == sheep_id or not any(self._runs_model(other, job.model)
+                                                   for other_id, other in self._sheep.items() if other_id != sheep_id):
+                return job
+
+        return None
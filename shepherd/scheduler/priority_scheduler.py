@@ -0,0 +1,14 @@
+from typing import List, Optional
+
+from .base_scheduler import Scheduler, QueuedJob
+
+
+class PriorityScheduler(Scheduler):
+    """
+    Scheduler processing the jobs with the highest priority first.
+    Jobs with the same priority are processed in the order of arrival.
+    """
+
+    def _select_job(self, sheep_id: str, jobs: List[QueuedJob]) -> Optional[QueuedJob]:
+        """Select the oldest job with the highest priority."""
+        return max(jobs, key=lambda job: job.priority)
@@ -0,0 +1,14 @@
+from typing import List, Optional
+
+from .base_scheduler import Scheduler, QueuedJob
+
+
+class RoundRobinScheduler(Scheduler):
+    """
+    Scheduler processing the jobs in the order of arrival.
+    The sheep with free capacity take turns in the order in which they asked for a job.
+    """
+
+    def _select_job(self, sheep_id: str, jobs: List[QueuedJob]) -> Optional[QueuedJob]:
+        """Select the oldest job."""
+        return jobs[0]
@@ -1,8 +1,9 @@
 import os
 import shlex
+import asyncio
 import subprocess
 import os.path as path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 import emloop as el
 from schematics.types import StringType
@@ -10,6 +11,7 @@ from schematics.types import StringType
 from .base_sheep import BaseSheep
 from .docker_sheep import extract_gpu_number
 from ..errors.sheep import SheepConfigurationError
+from ..constants import PRELOAD_ENV_VAR
 
 
 class BareSheep(BaseSheep):
@@ -24,6 +26,8 @@ class BareSheep(BaseSheep):
         stdout_file: Optional[str] = StringType(required=False)  # if specified, capture runner's stdout to this file
         stderr_file: Optional[str] = StringType(required=False)  # if specified, capture runner's stderr to this file
 
+    _EXIT_CHECK_INTERVAL = 0.1
+
     def __init__(self, config: Dict[str, Any], **kwargs):
         """
         Create new :py:class:`BareSheep`.
@@ -33,7 +37,7 @@ class BareSheep(BaseSheep):
         """
         super().__init__(**kwargs)
         self._config: self.Config = self.Config(config)
-        self._runner: Optional[subprocess.Popen] = None
+        self._runners: Dict[Tuple[str, str], subprocess.Popen] = {}  # runner subprocesses by model
         self._runner_config_path: Optional[str] = None
 
     def _load_model(self, model_name: str, model_version: str) -> None:
@@ -52,18 +56,19 @@ class BareSheep(BaseSheep):
         super()._load_model(model_name, model_version)
         self._runner_config_path = path.relpath(emloop_config_path, self._config.working_directory)
 
-    def start(self, model_name: str, model_version: str) -> None:
+    def _start_runner(self, model_name: str, model_version: str, port: int) -> None:
         """
         Start a subprocess with the sheep runner.
 
         :param model_name: model name
         :param model_version: model version
+        :param port: port the runner should listen on
         """
-        super().start(model_name, model_version)
-
         # prepare env. variables for GPU computation and stdout/stderr files
         env = os.environ.copy()
         env['CUDA_VISIBLE_DEVICES'] = ','.join(filter(None, map(extract_gpu_number, self._config.devices)))
+        if self.preload is not None:
+            env[PRELOAD_ENV_VAR] = '1'
         stdout = subprocess.DEVNULL
 
         try:
@@ -83,18 +88,57 @@ class BareSheep(BaseSheep):
             raise SheepConfigurationError('Could not open stderr log file: {}'.format(str(ex))) from ex
 
         # start the runner in a new sub-process
-        self._runner = subprocess.Popen(
-            shlex.split('shepherd-runner -p {} {}'.format(self._config.port, self._runner_config_path)), env=env,
+        self._runners[(model_name, model_version)] = subprocess.Popen(
+            shlex.split('shepherd-runner -p {} -c {} {}'.format(port, self._config.concurrency,
+                                                                self._runner_config_path)), env=env,
             cwd=self._config.working_directory, stdout=stdout, stderr=stderr)
 
-    def slaughter(self) -> None:
-        """Kill the underlying runner (subprocess)."""
-        super().slaughter()
-        if self._runner is not None:
-            self._runner.kill()
-            self._runner = None
-
-    @property
-    def running(self) -> bool:
-        """Check if the underlying runner (subprocess) is running."""
-        return self._runner is not None and self._runner.poll() is None
+    def _kill_runner(self, model_name: str, model_version: str) -> None:
+        """
+        Kill the runner (subprocess) of the given model.
+
+        :param model_name: model name
+        :param model_version: model version
+        """
+        runner = self._runners.pop((model_name, model_version), None)
+        if runner is not None:
+            runner.kill()
+
+    def _runner_running(self, model_name: str, model_version: str) -> bool:
+        """
+        Check if the runner (subprocess) of the given model is running.
+
+        :param model_name: model name
+        :param model_version: model version
+        """
+        runner = self._runners.get((model_name, model_version))
+        return runner is not None and runner.poll() is None
+
+    async def wait_exited(self) -> None:
+        """
+        Wait until the runner (subprocess) of the current model exits.
+        The subprocess is polled without blocking every ``_EXIT_CHECK_INTERVAL`` seconds.
+        """
+        runner = self._runners.get((self.model_name, self.model_version))
+        while runner is not None and runner.poll() is None:
+            await asyncio.sleep(self._EXIT_CHECK_INTERVAL)
+
+    def _runner_memory(self, model_name: str, model_version: str) -> Optional[int]:
+        """
+        Get the resident memory of the runner (subprocess) of the given model.
+
+        :param model_name: model name
+        :param model_version: model version
+        :return: the used memory in bytes or ``None`` if it cannot be determined
+        """
+        runner = self._runners.get((model_name, model_version))
+        if runner is None:
+            return None
+        try:
+            with open('/proc/{}/status'.format(runner.pid)) as status_file:
+                for line in status_file:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
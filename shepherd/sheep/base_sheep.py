@@ -1,26 +1,43 @@
 import abc
+import time
+import asyncio
 import logging
-from typing import List, Optional
-from asyncio import Queue
+from collections import deque, OrderedDict
+from typing import List, Optional, Deque, Tuple, Dict, Mapping
 
 import zmq.asyncio
 from zmq.error import ZMQBaseError
 from schematics import Model
-from schematics.types import StringType, IntType, ListType
+from schematics.types import StringType, IntType, FloatType, ListType, ModelType
+
+from ..api.models import ModelModel
 
 
 class BaseSheep(metaclass=abc.ABCMeta):
     """
     A base class for container adapters - classes that allow launching different kinds of containers.
+
+    A sheep may keep up to ``warm_runners`` runners with different models alive, runner ``i`` listens on port
+    ``port + i``. Only one of the runners (the one with the current model) is fed with jobs at a time.
     """
 
     class Config(Model):
         type: str = StringType(required=True)
         port: int = IntType(required=True)
         devices: List[str] = ListType(StringType, default=lambda: [])
+        prefetch: int = IntType(default=0, min_value=0)  # number of jobs prepared while the runner is busy
+        concurrency: int = IntType(default=1, min_value=1)  # number of jobs processed by the runner in parallel
+        warm_runners: int = IntType(default=1, min_value=1)  # number of runners (with different models) kept alive
+        memory_budget: Optional[int] = IntType(required=False, min_value=0)  # memory (MiB) of all the warm runners
+        preload: Optional[ModelModel] = ModelType(ModelModel, required=False)  # model started with the shepherd
+        startup_timeout: Optional[float] = FloatType(required=False, min_value=0)  # seconds to wait for a runner
+        heartbeat_timeout: Optional[float] = FloatType(default=60, min_value=0)  # seconds to wait for a heartbeat reply
 
     _config: Config
 
+    _EXIT_CHECK_INTERVAL = 1
+    """Interval (in seconds) of checking whether the runner has exited in :py:meth:`wait_exited`."""
+
     def __init__(self, socket: zmq.asyncio.Socket, sheep_data_root: str):
         """
         Create new :py:class:`BaseSheep`.
@@ -30,39 +47,235 @@ class BaseSheep(metaclass=abc.ABCMeta):
         """
         self._config: Optional[self.Config] = None
         self.socket: zmq.asyncio.Socket = socket
-        self.jobs_queue: Queue = Queue()  # queue of jobs to be processed
         self.model_name: Optional[str] = None  # current model name
         self.model_version: Optional[str] = None  # current model version
         self.sheep_data_root: Optional[str] = sheep_data_root
         self.in_progress: set = set()  # set of job_ids which are currently sent for processing to the sheep's runner
+        self.prefetched: Deque[Tuple[str, asyncio.Task]] = deque()  # de-queued job_ids with their preparation tasks
+        self._warm_runners: OrderedDict = OrderedDict()  # ports of warm runners by model, least recently used first
+        self._connected_address: Optional[str] = None
+        self.ready: bool = False  # has the current runner confirmed it is ready to process jobs?
+        self.started_at: Optional[float] = None  # monotonic time of the last (re)start
+        self.startup_time: Optional[float] = None  # seconds between the last (re)start and the runner being ready
+        self.replied_at: Optional[float] = None  # monotonic time of the last heartbeat reply of the current runner
+        self.heartbeat_sent_at: Optional[float] = None  # monotonic time of the heartbeat waiting for a reply (if any)
+
+    @property
+    def prefetch(self) -> int:
+        """Number of jobs which may be de-queued and prepared in advance while the sheep is busy."""
+        return self._config.prefetch
+
+    @property
+    def preload(self) -> Optional[ModelModel]:
+        """
+        Model to be started when the shepherd starts (``None`` if no model should be preloaded).
+        Runners of a sheep with a preloaded model run their warm-up jobs before accepting jobs.
+        """
+        return self._config.preload
+
+    @property
+    def startup_timeout(self) -> Optional[float]:
+        """Maximum number of seconds to wait for a (re)started runner to get ready (``None`` for no limit)."""
+        return self._config.startup_timeout
+
+    def set_ready(self) -> None:
+        """Mark the sheep as ready (its runner has replied to a heartbeat) and record its startup time."""
+        if not self.ready and self.started_at is not None:
+            self.startup_time = time.monotonic() - self.started_at
+        self.ready = True
+        self.replied_at = time.monotonic()
+        self.heartbeat_sent_at = None
+
+    @property
+    def heartbeat_timeout(self) -> Optional[float]:
+        """Maximum number of seconds to wait for a ready runner to reply to a heartbeat (``None`` for no limit)."""
+        return self._config.heartbeat_timeout
+
+    @property
+    def ports(self) -> range:
+        """Ports the runners of the sheep listen on (one port per warm runner)."""
+        return range(self._config.port, self._config.port + self._config.warm_runners)
+
+    @property
+    def memory_budget(self) -> Optional[int]:
+        """Maximum memory (MiB) used by all the warm runners (``None`` for no limit)."""
+        return self._config.memory_budget
+
+    @property
+    def concurrency(self) -> int:
+        """Maximum number of jobs the sheep's runner processes in parallel."""
+        return self._config.concurrency
 
     def _load_model(self, model_name: str, model_version: str) -> None:
         """Tell the sheep to prepare a new model (without restarting)."""
         self.model_name = model_name
         self.model_version = model_version
 
+    @abc.abstractmethod
+    def _start_runner(self, model_name: str, model_version: str, port: int) -> None:
+        """
+        Start a new runner of the given model listening on the given port.
+
+        :param model_name: model name
+        :param model_version: model version
+        :param port: port the runner should listen on
+        """
+
+    @abc.abstractmethod
+    def _kill_runner(self, model_name: str, model_version: str) -> None:
+        """
+        Kill the runner of the given model.
+
+        :param model_name: model name
+        :param model_version: model version
+        """
+
+    @abc.abstractmethod
+    def _runner_running(self, model_name: str, model_version: str) -> bool:
+        """
+        Check if the runner of the given model is running.
+
+        :param model_name: model name
+        :param model_version: model version
+        """
+
+    def _runner_memory(self, model_name: str, model_version: str) -> Optional[int]:
+        """
+        Get the memory used by the runner of the given model.
+
+        :param model_name: model name
+        :param model_version: model version
+        :return: the used memory in bytes or ``None`` if it cannot be determined
+        """
+        return None
+
+    def _connect(self, port: int) -> None:
+        """
+        Connect the socket to the runner listening on the given port.
+
+        :param port: runner port
+        """
+        self._connected_address = "tcp://0.0.0.0:{}".format(port)
+        self.socket.connect(self._connected_address)
+
+    def _disconnect(self) -> None:
+        """Disconnect the socket from the active runner (if any)."""
+        if self._connected_address is None:
+            return
+        try:
+            self.socket.disconnect(self._connected_address)
+        except ZMQBaseError:
+            logging.warning('Failed to disconnect socket (perhaps it was not started/connected)')
+        self._connected_address = None
+
+    def _evict(self, model_name: str, model_version: str) -> int:
+        """
+        Kill the warm runner of the given model and release its port.
+
+        :param model_name: model name
+        :param model_version: model version
+        :return: the released port
+        """
+        logging.info('Evicting warm runner of model `%s:%s`', model_name, model_version)
+        self._kill_runner(model_name, model_version)
+        return self._warm_runners.pop((model_name, model_version))
+
+    def _allocate_port(self) -> int:
+        """
+        Find a port for a new runner, evict the least recently used warm runner if there is no free port.
+
+        :return: the port for the new runner
+        """
+        free_ports = [port for port in self.ports if port not in self._warm_runners.values()]
+        if free_ports:
+            return free_ports[0]
+        return self._evict(*next(iter(self._warm_runners)))
+
+    def warm_runners_memory(self) -> Dict[Tuple[str, str], int]:
+        """
+        Measure the memory used by the warm runners.
+        The measurement may take a while (e.g., ``docker stats``), it does not modify the sheep so that it may be run
+        in an executor.
+
+        :return: the used memory in bytes by models (0 if it cannot be determined)
+        """
+        return {model: self._runner_memory(*model) or 0 for model in list(self._warm_runners)}
+
+    def trim_warm_runners(self, memory: Mapping[Tuple[str, str], int]) -> None:
+        """
+        Evict the least recently used warm runners while their total memory exceeds the configured memory budget.
+        The active runner is never evicted.
+
+        :param memory: the memory used by the warm runners as measured by :py:meth:`warm_runners_memory`
+        """
+        if self._config.memory_budget is None:
+            return
+
+        total = sum(memory.get(model, 0) for model in self._warm_runners)
+        while len(self._warm_runners) > 1 and total > self._config.memory_budget * 1024 ** 2:
+            model = next(iter(self._warm_runners))
+            if model == (self.model_name, self.model_version):
+                break
+            total -= memory.get(model, 0)
+            self._evict(*model)
+
+    @property
+    def warm_models(self) -> List[Tuple[str, str]]:
+        """Models (name and version pairs) with a warm runner from the least to the most recently used."""
+        return list(self._warm_runners.keys())
+
     def start(self, model_name: str, model_version: str) -> None:
         """
-        (Re)start the sheep with the given model name and version.
+        Switch the sheep to the given model name and version.
+        If there is a warm runner for the model, the sheep just starts feeding it. Otherwise, a new runner is started,
+        possibly evicting the least recently used warm runner.
         Any unfinished jobs will be lost, socket connection will be reset.
 
         :param model_name: model name
         :param model_version: model version
         """
-        if self.running:
-            self.slaughter()
-        self._load_model(model_name, model_version)
+        self._disconnect()
         self.in_progress = set()
-        self.socket.connect("tcp://0.0.0.0:{}".format(self._config.port))
+        self.ready = False
+        self.started_at = time.monotonic()
+        self.startup_time = None
+        self.replied_at = None
+        self.heartbeat_sent_at = None
+        model = (model_name, model_version)
+
+        if model in self._warm_runners and self._runner_running(model_name, model_version):
+            logging.info('Using warm runner of model `%s:%s`', model_name, model_version)
+            self._warm_runners.move_to_end(model)
+            self.model_name = model_name
+            self.model_version = model_version
+        else:
+            if model in self._warm_runners:
+                self._evict(model_name, model_version)
+            self._load_model(model_name, model_version)
+            port = self._allocate_port()
+            self._start_runner(model_name, model_version, port)
+            self._warm_runners[model] = port
+
+        self._connect(self._warm_runners[model])
 
     def slaughter(self) -> None:
-        zmq_address = 'tcp://0.0.0.0:{}'.format(self._config.port)
-        try:
-            self.socket.disconnect(zmq_address)
-        except ZMQBaseError:
-            logging.warning('Failed to disconnect socket (perhaps it was not started/connected)')
+        """Kill all the runners of the sheep."""
+        self._disconnect()
+        self.ready = False
+        for model in list(self._warm_runners):
+            self._evict(*model)
 
     @property
-    @abc.abstractmethod
     def running(self) -> bool:
         """Is the sheep running, i.e. capable of accepting computation requests?"""
+        return (self.model_name, self.model_version) in self._warm_runners and \
+            self._runner_running(self.model_name, self.model_version)
+
+    async def wait_exited(self) -> None:
+        """
+        Wait until the runner of the current model exits.
+        By default, :py:attr:`running` is checked off the event loop every ``_EXIT_CHECK_INTERVAL`` seconds, the sheep
+        which can detect the exit directly override this method.
+        """
+        while await asyncio.get_event_loop().run_in_executor(None, lambda: self.running):
+            await asyncio.sleep(self._EXIT_CHECK_INTERVAL)
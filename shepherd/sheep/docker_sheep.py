@@ -1,5 +1,6 @@
 import re
-from typing import Dict, Any, Optional, List
+import logging
+from typing import Dict, Any, Optional, List, Tuple
 
 from schematics.types import BooleanType
 
@@ -8,6 +9,7 @@ from ..docker import DockerContainer, DockerImage
 from ..config import RegistryConfig
 from ..errors.docker import DockerError
 from ..errors.sheep import SheepConfigurationError
+from ..constants import CONCURRENCY_ENV_VAR, PRELOAD_ENV_VAR
 
 
 def extract_gpu_number(device_name: str) -> Optional[str]:
@@ -52,7 +54,7 @@ class DockerSheep(BaseSheep):
         super().__init__(**kwargs)
         self._config: self.Config = self.Config(config)
         self._registry_config = registry_config
-        self._container: Optional[DockerContainer] = None
+        self._containers: Dict[Tuple[str, str], DockerContainer] = {}  # runner containers by model
         self._image: Optional[DockerImage] = None
         self._command: Optional[List[str]] = command
 
@@ -71,39 +73,77 @@ class DockerSheep(BaseSheep):
             raise SheepConfigurationError('Specified model name `{}` (version `{}`) cannot be loaded.'
                                           .format(model_name, model_version)) from de
 
-    def start(self, model_name: str, model_version: str) -> None:
+    def _start_runner(self, model_name: str, model_version: str, port: int) -> None:
         """
         Run a docker command starting the docker runner.
 
         :param model_name: docker image name
         :param model_version: docker image version
+        :param port: host port the runner should be bound to
         """
-        super().start(model_name, model_version)
-
         # prepare nvidia docker 2 env/runtime arguments (-e/--runtime)
         visible_gpu_numbers = list(filter(None, map(extract_gpu_number, self._config.devices)))
-        env = {"NVIDIA_VISIBLE_DEVICES": ",".join(visible_gpu_numbers)}
+        env = {"NVIDIA_VISIBLE_DEVICES": ",".join(visible_gpu_numbers),
+               CONCURRENCY_ENV_VAR: str(self._config.concurrency)}
+        if self.preload is not None:
+            env[PRELOAD_ENV_VAR] = "1"
         runtime = "nvidia" if visible_gpu_numbers else None
 
         # create and start :py:class:`DockerContainer`
-        self._container = DockerContainer(self._image, self._config.autoremove_containers, env=env, runtime=runtime,
-                                          bind_mounts={self.sheep_data_root: self.sheep_data_root},
-                                          ports={self._config.port: self._CONTAINER_POINT}, command=self._command)
+        container = DockerContainer(self._image, self._config.autoremove_containers, env=env, runtime=runtime,
+                                    bind_mounts={self.sheep_data_root: self.sheep_data_root},
+                                    ports={port: self._CONTAINER_POINT}, command=self._command)
         try:
-            self._container.start()
+            container.start()
         except DockerError as de:
-            self._container = None
             raise SheepConfigurationError('Specified model name `{}` (version `{}`) cannot be started.'
                                           .format(model_name, model_version)) from de
+        self._containers[(model_name, model_version)] = container
+
+    def _kill_runner(self, model_name: str, model_version: str) -> None:
+        """
+        Kill the docker container of the given model.
 
-    def slaughter(self) -> None:
-        """Kill the underlying docker container."""
-        super().slaughter()
-        if self._container is not None:
-            self._container.kill()
-            self._container = None
-
-    @property
-    def running(self) -> bool:
-        """Check if the underlying docker container is running."""
-        return self._container is not None and self._container.running
+        :param model_name: docker image name
+        :param model_version: docker image version
+        """
+        container = self._containers.pop((model_name, model_version), None)
+        if container is not None:
+            try:
+                container.kill()
+            except DockerError:
+                logging.warning('Failed to kill docker container of model `%s:%s`', model_name, model_version)
+
+    def _runner_running(self, model_name: str, model_version: str) -> bool:
+        """
+        Check if the docker container of the given model is running.
+
+        :param model_name: docker image name
+        :param model_version: docker image version
+        """
+        container = self._containers.get((model_name, model_version))
+        return container is not None and container.running
+
+    async def wait_exited(self) -> None:
+        """
+        Wait until the docker container of the current model exits.
+        """
+        container = self._containers.get((self.model_name, self.model_version))
+        if container is not None:
+            await container.wait()
+
+    def _runner_memory(self, model_name: str, model_version: str) -> Optional[int]:
+        """
+        Get the memory used by the docker container of the given model.
+
+        :param model_name: docker image name
+        :param model_version: docker image version
+        :return: the used memory in bytes or ``None`` if it cannot be determined
+        """
+        container = self._containers.get((model_name, model_version))
+        if container is None:
+            return None
+        try:
+            return container.memory_usage
+        except DockerError:
+            return None
@@ -1,25 +1,28 @@
+import time
 import asyncio
 import logging
 import shutil
 import traceback
 import os.path as path
 from datetime import datetime
-from itertools import cycle
-from typing import Mapping, Generator, Tuple, Dict, Any, Optional
+from contextlib import suppress, asynccontextmanager
+from typing import Mapping, Generator, Tuple, Dict, Any, Optional, Union, Set, Sequence, AsyncIterator
 
 import zmq
 import zmq.asyncio
 
 from ..constants import OUTPUT_DIR
 from ..storage.minio_storage import Storage
-from ..config import RegistryConfig
+from ..config import RegistryConfig, SchedulerConfig
 from ..sheep import *
+from ..scheduler import Scheduler, QueuedJob, SCHEDULERS
 from ..api.models import SheepModel, ModelModel, JobStatus, JobStatusModel, ErrorModel
 from ..errors.api import UnknownSheepError, UnknownJobError
 from ..errors.sheep import SheepConfigurationError, SheepError
 from ..utils import create_clean_dir
-from ..comm import Messenger, InputMessage, DoneMessage, ErrorMessage
+from ..comm import Messenger, InputMessage, DoneMessage, ErrorMessage, HeartbeatMessage, ReadyMessage
 from ..utils.task_queue import TaskQueue
+from .status_store import StatusStore
 
 
 class Shepherd:
@@ -27,11 +30,21 @@ class Shepherd:
     Manages creation and access to a configured set of sheep
     """
 
+    _HEARTBEAT_INTERVAL = 5
+    """Interval (in seconds) of the heartbeats checking whether the ready runners still respond."""
+
+    _UNKNOWN_JOB_CHECK_INTERVAL = 5
+    """Interval (in seconds) of checking the stored status of an unfinished job which is not known to the shepherd."""
+
     def __init__(self,
                  sheep_config: Mapping[str, Dict[str, Any]],
                  data_root: str,
                  storage: Storage,
-                 registry_config: Optional[RegistryConfig] = None):
+                 registry_config: Optional[RegistryConfig] = None,
+                 scheduler_config: Optional[SchedulerConfig] = None,
+                 upload_workers: int = 4,
+                 status_workers: int = 4,
+                 status_cache_size: int = 10000):
         """
         Create the mighty Shepherd.
 
@@ -39,12 +52,17 @@ class Shepherd:
         :param sheep_config: sheep config
         :param data_root: directory where the task/sheep directories will be managed
         :param storage: remote storage adapter
+        :param scheduler_config: optional job scheduler config
+        :param upload_workers: maximum number of job results uploaded in parallel
+        :param status_workers: maximum number of job statuses written to the storage in parallel
+        :param status_cache_size: maximum number of finished job statuses kept in memory
         """
         for config in sheep_config.values():
             if config["type"] == "docker" and registry_config is None:
                 raise SheepConfigurationError("To use docker sheep, you need to configure a registry URL")
 
         self.job_done_condition = asyncio.Condition()
+        self._sheep_jobs_condition = asyncio.Condition()
 
         self._storage = storage
         self._poller = zmq.asyncio.Poller()
@@ -54,7 +72,12 @@ class Shepherd:
         self._listener = None
         self._health_checker = None
         self._job_status: Dict[str, JobStatusModel] = {}
-        self._job_status_update_queue = None
+        self._status_store = StatusStore(storage, status_workers, status_cache_size)
+        self._job_done: Dict[str, asyncio.Future] = {}  # futures resolved with the final statuses of awaited jobs
+        self._job_done_waiters: Dict[str, int] = {}  # number of the waiters of the awaited jobs
+        self._status_subscribers: Dict[str, Set[asyncio.Queue]] = {}  # queues of the job status subscribers
+        self._upload_queue = None
+        self._upload_workers = upload_workers
 
         for sheep_id, config in sheep_config.items():
             socket = zmq.asyncio.Context.instance().socket(zmq.DEALER)
@@ -68,26 +91,49 @@ class Shepherd:
             else:
                 raise SheepConfigurationError("Unknown sheep type: {}".format(sheep_type))
 
+            for other_id, other in self._sheep.items():
+                if set(sheep.ports) & set(other.ports):
+                    raise SheepConfigurationError("Ports of sheep `{}` and `{}` overlap (each sheep uses `port` up to "
+                                                  "`port + warm_runners - 1`)".format(other_id, sheep_id))
+
             logging.info('Created sheep `%s` of type `%s`', sheep_id, sheep_type)
             self._sheep[sheep_id] = sheep
             self._poller.register(socket, zmq.POLLIN)
 
+        if scheduler_config is None:
+            scheduler_config = SchedulerConfig(dict(policy='model_affinity'))
+        if scheduler_config.policy not in SCHEDULERS:
+            raise SheepConfigurationError("Unknown scheduling policy: {}".format(scheduler_config.policy))
+        self._scheduler: Scheduler = SCHEDULERS[scheduler_config.policy](self._sheep, scheduler_config.work_stealing,
+                                                                         scheduler_config.steal_threshold)
+        logging.info('Using `%s` scheduling policy', scheduler_config.policy)
+
         self._storage_inaccessible_reported = False
-        self._sheep_ring = cycle(self._sheep.keys())
 
     async def start(self) -> None:
         """
-        Start background tasks for the shepherd.
+        Start the preloaded models and background tasks for the shepherd.
         """
+        for sheep_id, sheep in self._sheep.items():
+            if sheep.preload is not None:
+                try:
+                    self._start_sheep(sheep_id, sheep.preload.name, sheep.preload.version)
+                    await Messenger.send(sheep.socket, HeartbeatMessage())  # the listener marks the sheep ready
+                except SheepConfigurationError as sce:
+                    logging.error('Failed to preload model `%s:%s` on sheep `%s`: %s',
+                                  sheep.preload.name, sheep.preload.version, sheep_id, str(sce))
+
         for sheep_id, config in self._sheep_config.items():
             self._sheep_tasks[sheep_id] = [
-                asyncio.create_task(self._dequeue_and_feed_jobs(sheep_id)),
+                asyncio.create_task(self._dequeue_jobs(sheep_id)),
+                asyncio.create_task(self._feed_jobs(sheep_id)),
                 asyncio.create_task(self._health_check(sheep_id))
             ]
 
         self._listener = asyncio.create_task(self._listen())
         self._health_checker = asyncio.create_task(self._shepherd_health_check())
-        self._job_status_update_queue = TaskQueue(worker_count=1)
+        self._status_store.start()
+        self._upload_queue = TaskQueue(worker_count=self._upload_workers)
 
     def _get_sheep(self, sheep_id: str) -> BaseSheep:
         """
@@ -105,6 +151,7 @@ class Shepherd:
     def _start_sheep(self, sheep_id: str, model: str, version: str) -> None:
         """
         (Re)Start the sheep with the given ``sheep_id`` and configure it to run the specified ``model``:``version``.
+        A warm runner of the model is reused if the sheep has one.
 
         :param sheep_id: sheep id to be (re)started
         :param model: model name to be loaded
@@ -124,27 +171,28 @@ class Shepherd:
 
         self._get_sheep(sheep_id).slaughter()
 
-    async def enqueue_job(self, job_id: str, job_meta: ModelModel, sheep_id: Optional[str] = None) -> None:
+    async def enqueue_job(self, job_id: str, job_meta: ModelModel, sheep_id: Optional[str] = None,
+                          priority: int = 0) -> None:
         """
         En-queue the given job for execution. If specified, use a certain sheep.
 
         :param job_id: job id
         :param job_meta: job meta data (model name and version)
-        :param sheep_id: optional sheep id, if not specified use first sheep available
+        :param sheep_id: optional sheep id, if not specified the scheduler picks a sheep
+        :param priority: job priority (higher is more urgent), used by the ``priority`` scheduling policy
         """
         logging.info('En-queueing job `%s` for sheep `%s`', job_id, sheep_id)
-        if sheep_id is None:
-            sheep_id = next(self._sheep_ring)
-            logging.info('Job `%s` is auto-assigned to sheep `%s`', job_id, sheep_id)
+        if sheep_id is not None:
+            self._get_sheep(sheep_id)
 
         status = JobStatusModel({"model": job_meta, "status": JobStatus.QUEUED, "enqueued_at": datetime.utcnow()})
         self._job_status[job_id] = status
 
-        status_future = await self._job_status_update_queue.enqueue_task(self._storage.set_job_status(job_id, status))
-        await self._get_sheep(sheep_id).jobs_queue.put(job_id)
+        status_written = self._set_job_status(job_id, status)
+        await self._scheduler.enqueue(QueuedJob(job_id, job_meta, sheep_id, priority))
 
         # Wait for the status update to finish before returning (this way we can be sure the job was enqueued)
-        await status_future
+        await status_written
 
     async def _shepherd_health_check(self) -> None:
         """
@@ -170,10 +218,10 @@ class Shepherd:
             await asyncio.sleep(1)
             sheep = self._get_sheep(sheep_id)
             try:
-                if not sheep.running:
-                    for job_id in sheep.in_progress:
+                if sheep.in_progress and not sheep.running:
+                    for job_id in list(sheep.in_progress):
                         # clean-up the working directory
-                        shutil.rmtree(path.join(self._get_sheep(sheep_id).sheep_data_root, job_id))
+                        shutil.rmtree(path.join(self._get_sheep(sheep_id).sheep_data_root, job_id), ignore_errors=True)
 
                         # save the error
                         error = ErrorModel({'message': 'Sheep container died without notice'})
@@ -182,71 +230,221 @@ class Shepherd:
                         await self._report_job_failed(job_id, error, sheep)
                     sheep.in_progress = set()
 
-                    async with self.job_done_condition:
-                        self.job_done_condition.notify_all()
+                    await self._notify_sheep_jobs_changed()
             except SheepError as se:
                 logging.warning('Failed to check sheep\'s health '  # pragma: no cover
                                 'due to the following exception: %s', str(se))
 
-    async def _dequeue_and_feed_jobs(self, sheep_id: str) -> None:
+    async def _notify_job_done(self, job_id: str, status: JobStatusModel) -> None:
         """
-        De-queue jobs, prepare working directories and send ``InputMessage`` to the specified sheep in an end-less
-        loop.
+        Wake up the waiters of the given job and everyone waiting for any job to finish.
 
-        :param sheep_id: sheep id to be fed
+        :param job_id: id of the finished job
+        :param status: final status of the job
+        """
+        done = self._job_done.pop(job_id, None)
+        if done is not None and not done.done():
+            done.set_result(status)
+
+        async with self.job_done_condition:
+            self.job_done_condition.notify_all()
+
+    def _set_job_status(self, job_id: str, status: JobStatusModel) -> asyncio.Future:
+        """
+        Publish a new status of a job to its subscribers and schedule writing it to the storage.
+
+        :param job_id: job id
+        :param status: new status of the job
+        :return: a future which resolves once the status is written
+        """
+        for updates in self._status_subscribers.get(job_id, ()):
+            updates.put_nowait((job_id, status.copy()))
+        return self._status_store.set(job_id, status)
+
+    async def _notify_sheep_jobs_changed(self) -> None:
+        """
+        Wake up the sheep feeding loops and the scheduler waiting for a change of the in-progress or prefetched jobs.
+        """
+        async with self._sheep_jobs_condition:
+            self._sheep_jobs_condition.notify_all()
+        await self._scheduler.notify()
+
+    async def _prepare_job(self, sheep: BaseSheep, job_id: str) -> None:
+        """
+        Prepare the working directory of the given job in the data root of the given sheep.
+
+        :param sheep: sheep which is going to process the job
+        :param job_id: job id
+        """
+        logging.info('Preparing working directory for job `%s`', job_id)
+        working_directory = create_clean_dir(path.join(sheep.sheep_data_root, job_id))
+        await self._storage.pull_job_data(job_id, working_directory)
+        create_clean_dir(path.join(working_directory, OUTPUT_DIR))
+
+    async def _dequeue_jobs(self, sheep_id: str) -> None:
         """
+        De-queue jobs for the specified sheep and start preparing their working directories in an end-less loop.
+        A job is de-queued only when the sheep has a free concurrency slot or a free prefetch slot.
+
+        :param sheep_id: sheep id to de-queue the jobs for
+        """
+        sheep = self._get_sheep(sheep_id)
         while True:
-            sheep = self._get_sheep(sheep_id)
-            job_id = await sheep.jobs_queue.get()
-            logging.info('Preparing working directory for job `%s` on `%s`', job_id, sheep_id)
+            async with self._sheep_jobs_condition:
+                await self._sheep_jobs_condition.wait_for(
+                    lambda: len(sheep.in_progress) + len(sheep.prefetched) < sheep.concurrency + sheep.prefetch)
 
-            # prepare working directory
-            working_directory = create_clean_dir(path.join(sheep.sheep_data_root, job_id))
-            await self._storage.pull_job_data(job_id, working_directory)
-            create_clean_dir(path.join(working_directory, OUTPUT_DIR))
+            job_id = (await self._scheduler.dequeue(sheep_id)).job_id
+            logging.info('Job `%s` de-queued for `%s`', job_id, sheep_id)
+            sheep.prefetched.append((job_id, asyncio.create_task(self._prepare_job(sheep, job_id))))
+            await self._notify_sheep_jobs_changed()
 
-            # update the job status
-            status = self._job_status[job_id]
-            status.status = JobStatus.PROCESSING
-            status.processing_started_at = datetime.utcnow()
-            await self._job_status_update_queue.enqueue_task(self._storage.set_job_status(job_id, status.copy()))
-
-            # (re)start the sheep if needed
-            model = status.model
-            if model.name != sheep.model_name or model.version != sheep.model_version or not sheep.running:
-                logging.info('Job `%s` requires model `%s:%s` on `%s`', job_id, model.name, model.version, sheep_id)
-                # we need to wait for the in-progress jobs which are already in the socket
-                async with self.job_done_condition:
-                    await self.job_done_condition.wait_for(lambda: len(sheep.in_progress) == 0)
-                self._slaughter_sheep(sheep_id)
+    async def _feed_jobs(self, sheep_id: str) -> None:
+        """
+        Send ``InputMessage`` for the prefetched jobs to the specified sheep in an end-less loop.
+
+        :param sheep_id: sheep id to be fed
+        """
+        sheep = self._get_sheep(sheep_id)
+        while True:
+            async with self._sheep_jobs_condition:
+                await self._sheep_jobs_condition.wait_for(
+                    lambda: len(sheep.in_progress) < sheep.concurrency and len(sheep.prefetched) > 0)
+
+            job_id, preparation = sheep.prefetched[0]
+            try:
+                await preparation
+            except Exception as ex:
+                sheep.prefetched.popleft()
+                error = ErrorModel({
+                    'message': 'Failed to prepare working directory for this job ({})'.format(str(ex)),
+                    'exception_type': str(type(ex)),
+                    'exception_traceback': str(traceback.format_tb(ex.__traceback__))
+                })
+
+                logging.error('Sheep `%s` encountered error when processing job `%s`: %s', sheep_id, job_id,
+                              error.message)
+                await self._report_job_failed(job_id, error, sheep)
+                await self._notify_sheep_jobs_changed()
+                continue
+
+            # (re)start the sheep if needed and wait for its runner to get ready
+            model = self._job_status[job_id].model
+            restart = model.name != sheep.model_name or model.version != sheep.model_version or \
+                not await self._is_sheep_running(sheep)
+            if restart or not sheep.ready:
+                if restart:
+                    logging.info('Job `%s` requires model `%s:%s` on `%s`', job_id, model.name, model.version,
+                                 sheep_id)
+                    # we need to wait for the in-progress jobs which are already in the socket
+                    async with self._sheep_jobs_condition:
+                        await self._sheep_jobs_condition.wait_for(lambda: len(sheep.in_progress) == 0)
                 try:
-                    self._start_sheep(sheep_id, model.name, model.version)
+                    if restart:
+                        # the sheep keeps the runner of the previous model warm (see ``warm_runners`` sheep option)
+                        self._start_sheep(sheep_id, model.name, model.version)
+                    await self._wait_ready(sheep_id)
+                    if restart:
+                        await self._trim_warm_runners(sheep)
                 except SheepConfigurationError as sce:
+                    sheep.prefetched.popleft()
                     error = ErrorModel({
                         'message': 'Failed to start sheep for this job ({})'.format(str(sce))
                     })
 
-                    logging.error('Sheep `%s` encountered error when processing job `%s`: %s', sheep_id, job_id, error.message)
+                    logging.error('Sheep `%s` encountered error when processing job `%s`: %s', sheep_id, job_id,
+                                  error.message)
                     await self._report_job_failed(job_id, error, sheep)
+                    await self._notify_sheep_jobs_changed()
                     continue
                 except Exception as ex:
+                    sheep.prefetched.popleft()
                     error = ErrorModel({
-                        'message': '`{}` thrown when starting sheep `{}` for job `{}`'.format(str(ex), sheep_id, job_id),
+                        'message': '`{}` thrown when starting sheep `{}` for job `{}`'.format(str(ex), sheep_id,
+                                                                                              job_id),
                         'exception_type': str(type(ex)),
                         'exception_traceback': str(traceback.format_tb(ex.__traceback__))
                     })
 
                     await self._report_job_failed(job_id, error, sheep)
                     logging.exception("Error encountered when starting sheep `%s` for job `%s`", sheep_id, job_id)
+                    await self._notify_sheep_jobs_changed()
                     continue
 
+                if restart:
+                    # the sheep's model has changed, queued jobs may be assigned differently
+                    await self._scheduler.notify()
+
+            # update the job status (the runner is ready, so the processing really starts now)
+            status = self._job_status[job_id]
+            status.status = JobStatus.PROCESSING
+            status.processing_started_at = datetime.utcnow()
+            self._set_job_status(job_id, status)  # written in the background
+
             # send the InputMessage to the sheep
+            sheep.prefetched.popleft()
             sheep.in_progress.add(job_id)
             logging.info('Sending InputMessage for job `%s` on `%s`', job_id, sheep_id)
             await Messenger.send(sheep.socket, InputMessage(dict(job_id=job_id, io_data_root=sheep.sheep_data_root)))
 
-            # notify the queue that the task is done
-            sheep.jobs_queue.task_done()
+    @staticmethod
+    async def _is_sheep_running(sheep: BaseSheep) -> bool:
+        """
+        Check if the given sheep is running off the event loop (the check may run a blocking subprocess).
+
+        :param sheep: the sheep to be checked
+        :return: sheep running flag
+        """
+        return await asyncio.get_event_loop().run_in_executor(None, lambda: sheep.running)
+
+    @staticmethod
+    async def _trim_warm_runners(sheep: BaseSheep) -> None:
+        """
+        Evict the warm runners of the given sheep exceeding its memory budget.
+        The memory is measured off the event loop (the measurement may run a blocking subprocess).
+
+        :param sheep: the sheep to be trimmed
+        """
+        if sheep.memory_budget is None:
+            return
+        memory = await asyncio.get_event_loop().run_in_executor(None, sheep.warm_runners_memory)
+        sheep.trim_warm_runners(memory)
+
+    async def _wait_ready(self, sheep_id: str) -> None:
+        """
+        Send a ``HeartbeatMessage`` to the runner of the specified sheep and wait until it replies with
+        a ``ReadyMessage``. The wait ends as soon as the runner exits (see :py:meth:`BaseSheep.wait_exited`).
+
+        :param sheep_id: sheep id
+        :raise SheepConfigurationError: if the runner dies or does not get ready within the sheep's startup timeout
+        """
+        sheep = self._get_sheep(sheep_id)
+        await Messenger.send(sheep.socket, HeartbeatMessage())
+
+        async def wait_ready() -> None:
+            async with self._sheep_jobs_condition:
+                await self._sheep_jobs_condition.wait_for(lambda: sheep.ready)
+
+        timeout = None
+        if sheep.startup_timeout is not None:
+            timeout = max(sheep.started_at + sheep.startup_timeout - time.monotonic(), 0)
+
+        ready = asyncio.ensure_future(wait_ready())
+        exited = asyncio.ensure_future(sheep.wait_exited())
+        try:
+            done, _ = await asyncio.wait((ready, exited), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            ready.cancel()
+            exited.cancel()
+
+        if sheep.ready:
+            return
+        if exited in done:
+            raise SheepConfigurationError('Runner of sheep `{}` died during its startup'.format(sheep_id)) \
+                from exited.exception()
+        self._slaughter_sheep(sheep_id)
+        raise SheepConfigurationError('Runner of sheep `{}` did not get ready within {}s'
+                                      .format(sheep_id, sheep.startup_timeout))
 
     async def _report_job_failed(self, job_id: str, error: ErrorModel, sheep: BaseSheep) -> None:
         """
@@ -257,57 +455,109 @@ class Shepherd:
         status.error_details = error
         status.finished_at = datetime.utcnow()
 
-        async with self.job_done_condition:
-            self.job_done_condition.notify_all()
-
         try:
             shutil.rmtree(path.join(sheep.sheep_data_root, job_id), ignore_errors=True)
-            await self._job_status_update_queue.enqueue_task(self._storage.set_job_status(job_id, status.copy()))
+            await self._set_job_status(job_id, status)
         except Exception:
             logging.exception('Error when reporting job `%s` as failed', job_id)
 
+        await self._notify_job_done(job_id, status)
+
+    async def _finish_job(self, sheep_id: str, message: Union[DoneMessage, ErrorMessage]) -> None:
+        """
+        Upload the results of a job processed by the specified sheep, clean-up its working directory and update its
+        status according to the given message.
+
+        :param sheep_id: id of the sheep which processed the job
+        :param message: message received from the sheep
+        """
+        sheep = self._get_sheep(sheep_id)
+        job_id = message.job_id
+        working_directory = path.join(sheep.sheep_data_root, job_id)
+
+        try:
+            await self._storage.push_job_data(job_id, working_directory)
+        except Exception as ex:
+            logging.exception('Failed to upload results of job `%s` from sheep `%s`', job_id, sheep_id)
+            if isinstance(message, DoneMessage):
+                message = ErrorMessage(dict(job_id=job_id, message='Failed to upload job results ({})'.format(str(ex)),
+                                            exception_type=str(type(ex)),
+                                            exception_traceback=str(traceback.format_tb(ex.__traceback__))))
+        finally:
+            shutil.rmtree(working_directory, ignore_errors=True)
+
+        # save the done/error file
+        if isinstance(message, DoneMessage):
+            status = self._job_status.pop(job_id)
+            status.status = JobStatus.DONE
+            status.finished_at = datetime.utcnow()
+            try:
+                await self._set_job_status(job_id, status)
+            except Exception:
+                logging.exception('Error when reporting job `%s` as done', job_id)
+            logging.info('Job `%s` from sheep `%s` done', job_id, sheep_id)
+            await self._notify_job_done(job_id, status)
+        elif isinstance(message, ErrorMessage):
+            error = ErrorModel({
+                "message": message.message,
+                "exception_type": message.exception_type,
+                "exception_traceback": message.exception_traceback
+            })
+            await self._report_job_failed(job_id, error, sheep)
+            logging.info('Job `%s` from sheep `%s` failed (%s)', job_id, sheep_id, message.message)
+
+    async def _send_heartbeats(self) -> None:
+        """
+        Send a ``HeartbeatMessage`` to every ready runner which has not replied for ``_HEARTBEAT_INTERVAL`` seconds.
+        A sheep whose runner does not reply within the sheep's heartbeat timeout is slaughtered, as the runner hangs;
+        its jobs in progress are then reported as failed by the health check.
+        """
+        now = time.monotonic()
+        for sheep_id, sheep in self._sheep.items():
+            if not sheep.ready or sheep.heartbeat_timeout is None:
+                continue
+            if sheep.heartbeat_sent_at is None:
+                if now - sheep.replied_at >= self._HEARTBEAT_INTERVAL:
+                    sheep.heartbeat_sent_at = now
+                    await Messenger.send(sheep.socket, HeartbeatMessage())
+            elif now - sheep.heartbeat_sent_at > sheep.heartbeat_timeout:
+                logging.error('Runner of sheep `%s` did not reply to a heartbeat within %ss', sheep_id,
+                              sheep.heartbeat_timeout)
+                self._slaughter_sheep(sheep_id)
+
     async def _listen(self) -> None:
         """
-        Poll the sheep output sockets, process sheep outputs and clean-up working directories in an endless loop.
+        Poll the sheep output sockets, free the sheep capacity and dispatch the outputs for upload in an endless loop.
+        Heartbeats are sent to the ready runners in the meantime.
         """
         while True:
+            await self._send_heartbeats()
+
             # poll the output sockets
-            result = await self._poller.poll()
+            result = await self._poller.poll(timeout=self._HEARTBEAT_INTERVAL * 1000)
             sheep_ids = (sheep_id for sheep_id, sheep in self._sheep.items() if (sheep.socket, zmq.POLLIN) in result)
 
             # process the sheep with pending outputs
             for sheep_id in sheep_ids:
                 sheep = self._get_sheep(sheep_id)
-                message = await Messenger.recv(sheep.socket, [DoneMessage, ErrorMessage], noblock=True)
-                job_id = message.job_id
-
-                # clean-up the working directory and upload the results
-                working_directory = path.join(self._get_sheep(sheep_id).sheep_data_root, job_id)
-                await self._storage.push_job_data(job_id, working_directory)
-                shutil.rmtree(working_directory)
-
-                # save the done/error file
-                if isinstance(message, DoneMessage):
-                    status = self._job_status.pop(job_id)
-                    status.status = JobStatus.DONE
-                    status.finished_at = datetime.utcnow()
-                    await self._job_status_update_queue.enqueue_task(self._storage.set_job_status(job_id, status.copy()))
-                    logging.info('Job `%s` from sheep `%s` done', job_id, sheep_id)
-                elif isinstance(message, ErrorMessage):
-                    error = ErrorModel({
-                        "message": message.message,
-                        "exception_type": message.exception_type,
-                        "exception_traceback": message.exception_traceback
-                    })
-                    await self._report_job_failed(job_id, error, sheep)
-                    self._job_status.pop(job_id)
-                    logging.info('Job `%s` from sheep `%s` failed (%s)', job_id, sheep_id, message.short_error)
+                message = await Messenger.recv(sheep.socket, [DoneMessage, ErrorMessage, ReadyMessage], noblock=True)
+                if isinstance(message, ReadyMessage):
+                    if not sheep.ready:
+                        logging.info('Sheep `%s` is ready, its startup took %.2fs', sheep_id,
+                                     time.monotonic() - sheep.started_at)
+                    sheep.set_ready()
+                    await self._notify_sheep_jobs_changed()
+                    continue
 
-                # notify about the finished job
-                sheep.in_progress.remove(job_id)
+                if message.job_id not in sheep.in_progress:
+                    logging.warning('Ignoring message for job `%s` which is not in progress on sheep `%s`',
+                                    message.job_id, sheep_id)
+                    continue
 
-                async with self.job_done_condition:
-                    self.job_done_condition.notify_all()
+                # the sheep may continue with another job while the results are being uploaded
+                sheep.in_progress.discard(message.job_id)
+                await self._notify_sheep_jobs_changed()
+                await self._upload_queue.enqueue_task(self._finish_job(sheep_id, message))
 
     def get_status(self) -> Generator[Tuple[str, SheepModel], None, None]:
         """
@@ -318,6 +568,8 @@ class Shepherd:
         for sheep_id, sheep in self._sheep.items():
             yield sheep_id, SheepModel({
                 "running": sheep.running,
+                "ready": sheep.ready,
+                "startup_time": sheep.startup_time,
                 "model": {
                     "name": sheep.model_name,
                     "version": sheep.model_version
@@ -331,13 +583,14 @@ class Shepherd:
 
     def get_job_status(self, job_id: str) -> Optional[JobStatusModel]:
         """
-        Get status information for a job. Only the local state is checked, without querying the remote storage.
+        Get status information for a job. Only the local state (the jobs in progress and the recently finished jobs)
+        is checked, without querying the remote storage.
 
         :param job_id: id of the queried job
         :return: status information or None if the job is not in the local state
         """
 
-        return self._job_status.get(job_id)
+        return self._job_status.get(job_id) or self._status_store.get(job_id)
 
     async def is_job_done(self, job_id: str) -> bool:
         """
@@ -349,6 +602,11 @@ class Shepherd:
         :raise UnknownJobError: if the job is not ready nor it is known to this shepherd
         :return: job ready flag
         """
+        if job_id in self._job_status:
+            return False
+        if self._status_store.get(job_id) is not None:
+            return True
+
         if not await self._storage.job_dir_exists(job_id):
             raise UnknownJobError()
 
@@ -356,6 +614,66 @@ class Shepherd:
 
         return status is not None and status.status in (JobStatus.DONE, JobStatus.FAILED)
 
+    async def wait_job_done(self, job_id: str) -> JobStatusModel:
+        """
+        Wait until the specified job is done (or failed).
+        The waiter is woken up only when its job finishes. The storage is queried only for the jobs which are not
+        known to the shepherd (they are neither in progress nor among the recently finished jobs), the status of such
+        an unfinished job is re-checked every ``_UNKNOWN_JOB_CHECK_INTERVAL`` seconds.
+
+        :param job_id: id of the awaited job
+        :raise UnknownJobError: if the job is neither known to this shepherd nor present in the storage
+        :return: final status of the job
+        """
+        # the future is registered first, so that it is resolved even if the job finishes while the storage is queried
+        done = self._job_done.setdefault(job_id, asyncio.get_event_loop().create_future())
+        self._job_done_waiters[job_id] = self._job_done_waiters.get(job_id, 0) + 1
+        try:
+            while True:
+                if job_id in self._job_status:
+                    return await asyncio.shield(done)
+
+                status = self._status_store.get(job_id) or await self._storage.get_job_status(job_id)
+                if status.status in (JobStatus.DONE, JobStatus.FAILED):
+                    return status
+
+                with suppress(asyncio.TimeoutError):
+                    return await asyncio.wait_for(asyncio.shield(done), self._UNKNOWN_JOB_CHECK_INTERVAL)
+        finally:
+            self._job_done_waiters[job_id] -= 1
+            if self._job_done_waiters[job_id] == 0:
+                del self._job_done_waiters[job_id]
+                if self._job_done.get(job_id) is done:
+                    del self._job_done[job_id]
+
+    @asynccontextmanager
+    async def subscribe_job_status(self, job_ids: Sequence[str]) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribe to the status changes of the given jobs.
+        The yielded queue receives ``(job_id, status)`` pairs, the current statuses of the jobs first and then all their
+        changes as they happen. The storage is queried only for the jobs which are not known to the shepherd.
+
+        :param job_ids: ids of the jobs
+        :raise UnknownJobError: if any of the jobs is neither known to this shepherd nor present in the storage
+        :return: a queue of the status changes
+        """
+        job_ids = list(dict.fromkeys(job_ids))  # without duplicates
+        updates = asyncio.Queue()
+        for job_id in job_ids:
+            self._status_subscribers.setdefault(job_id, set()).add(updates)
+
+        try:
+            for job_id in job_ids:
+                status = self.get_job_status(job_id)
+                updates.put_nowait((job_id, status.copy() if status is not None
+                                    else await self._storage.get_job_status(job_id)))
+            yield updates
+        finally:
+            for job_id in job_ids:
+                self._status_subscribers[job_id].discard(updates)
+                if not self._status_subscribers[job_id]:
+                    del self._status_subscribers[job_id]
+
     async def close(self) -> None:
         """
         Perform a clean exit by slaughtering all sheeps, stopping background tasks and waiting for status updates to be
@@ -369,5 +687,10 @@ class Shepherd:
             for sheep_task in sheep_tasks:
                 sheep_task.cancel()
 
-        await self._job_status_update_queue.close()
+        for sheep in self._sheep.values():
+            for _, preparation in sheep.prefetched:
+                preparation.cancel()
+
+        await self._upload_queue.close()
+        await self._status_store.close()
         await self._storage.close()
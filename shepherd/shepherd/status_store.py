@@ -0,0 +1,120 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..storage import Storage
+from ..api.models import JobStatus, JobStatusModel
+
+
+class StatusStore:
+    """
+    Write-behind cache of the job statuses.
+
+    The statuses are written to the storage by ``worker_count`` workers in parallel. The updates of a job which are
+    superseded before they are written are coalesced (only the latest status is written) and the statuses of a single
+    job are never written in parallel, so that they cannot be reordered.
+    The last ``capacity`` finished (done or failed) statuses are kept in memory.
+    """
+
+    def __init__(self, storage: Storage, worker_count: int = 4, capacity: int = 10000):
+        """
+        Create new :py:class:`StatusStore`.
+
+        :param storage: storage to write the statuses to
+        :param worker_count: maximum number of statuses written in parallel
+        :param capacity: maximum number of finished statuses kept in memory
+        """
+        self._storage = storage
+        self._worker_count = worker_count
+        self._capacity = capacity
+        self._queue: Optional[asyncio.Queue] = None  # ids of the jobs with pending statuses which are not being written
+        self._workers: Tuple[asyncio.Task, ...] = ()
+        self._pending: Dict[str, Tuple[JobStatusModel, List[asyncio.Future]]] = {}  # statuses waiting to be written
+        self._writing: Set[str] = set()  # ids of the jobs with statuses being written
+        self._finished: OrderedDict = OrderedDict()  # finished statuses by job ids, least recently updated first
+
+    def start(self) -> None:
+        """Start the workers."""
+        self._queue = asyncio.Queue()
+        for job_id in self._pending:  # statuses set before the start
+            self._queue.put_nowait(job_id)
+        self._workers = tuple(asyncio.create_task(self._write_statuses()) for _ in range(self._worker_count))
+
+    @property
+    def pending_count(self) -> int:
+        """Number of statuses waiting to be written."""
+        return len(self._pending)
+
+    def get(self, job_id: str) -> Optional[JobStatusModel]:
+        """
+        Get the finished status of a job kept in memory.
+
+        :param job_id: job id
+        :return: the status or ``None`` if the job is not finished or its status was already forgotten
+        """
+        return self._finished.get(job_id)
+
+    def set(self, job_id: str, status: JobStatusModel) -> asyncio.Future:
+        """
+        Schedule writing a copy of the given status of a job.
+
+        :param job_id: job id
+        :param status: new status of the job
+        :return: a future which resolves once the status (or a later status of the job) is written
+        """
+        status = status.copy()
+        written = asyncio.get_event_loop().create_future()
+
+        if job_id in self._pending:
+            self._pending[job_id][1].append(written)
+            self._pending[job_id] = status, self._pending[job_id][1]
+        else:
+            self._pending[job_id] = status, [written]
+            if job_id not in self._writing and self._queue is not None:
+                self._queue.put_nowait(job_id)
+
+        self._finished.pop(job_id, None)
+        if status.status in (JobStatus.DONE, JobStatus.FAILED):
+            self._finished[job_id] = status
+            while len(self._finished) > self._capacity:
+                self._finished.popitem(last=False)
+
+        return written
+
+    async def _write_statuses(self) -> None:
+        """
+        Take jobs from the queue and write their latest statuses.
+        """
+        while True:
+            job_id = await self._queue.get()
+            status, written = self._pending.pop(job_id)
+            self._writing.add(job_id)
+
+            try:
+                await self._storage.set_job_status(job_id, status)
+                for future in written:
+                    if not future.done():  # the waiter may have been cancelled
+                        future.set_result(None)
+            except Exception as ex:
+                logging.warning('Failed to write status of job `%s`: %s', job_id, str(ex))
+                for future in written:
+                    if not future.done():
+                        future.set_exception(ex)
+                        future.exception()  # the failure is logged, do not complain about the unawaited futures
+            finally:
+                self._writing.discard(job_id)
+                if job_id in self._pending:
+                    self._queue.put_nowait(job_id)  # the status changed in the meantime
+                self._queue.task_done()
+
+    async def close(self) -> None:
+        """
+        Wait for all the pending statuses to be written and terminate the workers.
+        """
+        if self._queue is None:
+            return
+        await self._queue.join()
+
+        for worker in self._workers:
+            worker.cancel()
@@ -1,4 +1,7 @@
 from .storage import Storage
 from .minio_storage import MinioStorage
+from .local_storage import LocalFsStorage
+from .memory_storage import InMemoryStorage
+from .transfer_scheduler import TransferScheduler
 
-__all__ = ['Storage', 'MinioStorage']
+__all__ = ['Storage', 'MinioStorage', 'LocalFsStorage', 'InMemoryStorage', 'TransferScheduler']
@@ -0,0 +1,253 @@
+import os
+import json
+import errno
+import shutil
+import asyncio
+import logging
+import tempfile
+from io import BytesIO
+from contextlib import suppress
+from os import path
+from typing import Optional, BinaryIO, Union, Callable
+from asyncio import StreamReader
+
+from .storage import Storage
+from ..config import StorageConfig
+from ..errors.api import StorageError, NameConflictError, UnknownJobError
+from ..constants import JOB_STATUS_FILE, INPUT_DIR, OUTPUT_DIR
+from ..api.models import JobStatusModel
+
+
+def _copy_file(source_path: str, destination_path: str) -> None:
+    """
+    Copy a file without passing its data through the user space.
+    ``copy_file_range`` shares the data blocks (reflink) on the filesystems which support it, the copy falls back to
+    :py:func:`shutil.copyfile` if it is not available.
+
+    :param source_path: path of the source file
+    :param destination_path: path of the destination file
+    """
+    if hasattr(os, "copy_file_range"):
+        with open(source_path, "rb") as source, open(destination_path, "wb") as destination:
+            try:
+                while os.copy_file_range(source.fileno(), destination.fileno(), 1024 ** 3) > 0:
+                    pass
+                return
+            except OSError as error:
+                if error.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                    raise
+
+    shutil.copyfile(source_path, destination_path)
+
+
+def _move_file(source_path: str, destination_path: str) -> None:
+    """
+    Move a file, rename it if possible or copy it otherwise.
+
+    :param source_path: path of the source file
+    :param destination_path: path of the destination file
+    """
+    try:
+        os.replace(source_path, destination_path)
+    except OSError as error:
+        if error.errno != errno.EXDEV:
+            raise
+        _copy_file(source_path, destination_path)
+        os.remove(source_path)
+
+
+def _transfer_tree(source_directory: str, target_directory: str, transfer: Callable[[str, str], None]) -> int:
+    """
+    Transfer all the files of a directory tree to another directory.
+
+    :param source_directory: the directory to transfer the files from
+    :param target_directory: the directory to transfer the files to
+    :param transfer: function transferring a single file given the source and destination path
+    :return: the number of transferred files
+    """
+    count = 0
+    for prefix, _, files in os.walk(source_directory):
+        target_prefix = path.join(target_directory, path.relpath(prefix, source_directory))
+        os.makedirs(target_prefix, exist_ok=True)
+        for file in files:
+            transfer(path.join(prefix, file), path.join(target_prefix, file))
+            count += 1
+    return count
+
+
+def _write_file(file_path: str, stream: BinaryIO, length: int, chunk_size: int) -> None:
+    """
+    Write the next ``length`` bytes of a stream to a file atomically (readers never see a partially written file).
+
+    :param file_path: path of the file
+    :param stream: stream to read the data from
+    :param length: number of bytes to write
+    :param chunk_size: size of the chunks to read
+    """
+    os.makedirs(path.dirname(file_path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".part", dir=path.dirname(file_path))
+    try:
+        with open(fd, "wb") as file:
+            remaining = length
+            while remaining > 0:
+                chunk = stream.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                file.write(chunk)
+                remaining -= len(chunk)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+
+
+class LocalFsStorage(Storage):
+    """
+    A storage adapter that keeps the job data in a local directory tree (one directory per job).
+
+    The job data are never passed through the user space if it can be avoided: the inputs are copied to the working
+    directories with ``copy_file_range`` (which shares the data blocks on the filesystems supporting reflinks),
+    the outputs are moved from them and the files are served with ``sendfile``.
+    Therefore, the storage directory should be on the same filesystem as the shepherd data root.
+    """
+
+    _CHUNK_SIZE = 128 * 1024
+    """Size of the chunks (in bytes) the streamed files are written in."""
+
+    def __init__(self, storage_config: StorageConfig):
+        """
+        Initialize the storage according to the configuration.
+
+        :param storage_config: storage configuration
+        """
+        self._root = path.abspath(storage_config.path)
+        os.makedirs(self._root, exist_ok=True)
+
+    def _job_path(self, job_id: str, *parts: str) -> str:
+        """
+        Get the path of a job directory or a file in it.
+
+        :param job_id: job id
+        :param parts: path components of the file relative to the job directory
+        :raises StorageError: the path lies outside of the job directory
+        :return: the path
+        """
+        job_dir = path.normpath(path.join(self._root, job_id))
+        result = path.normpath(path.join(job_dir, *parts))
+        if path.dirname(job_dir) != self._root or path.commonpath([job_dir, result]) != job_dir:
+            raise StorageError(f"Invalid path `{result}` of job `{job_id}`")
+        return result
+
+    @staticmethod
+    async def _run(function: Callable, *args):
+        """
+        Run a blocking filesystem operation in the default executor.
+
+        :raises StorageError: the operation failed
+        """
+        try:
+            return await asyncio.get_event_loop().run_in_executor(None, function, *args)
+        except OSError as error:
+            raise StorageError(f"Local storage operation failed: {error}") from error
+
+    async def is_accessible(self) -> bool:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.is_accessible`.
+        """
+        return path.isdir(self._root) and os.access(self._root, os.R_OK | os.W_OK | os.X_OK)
+
+    async def init_job(self, job_id: str) -> None:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.init_job`.
+        """
+        try:
+            os.mkdir(self._job_path(job_id))
+        except FileExistsError as error:
+            raise NameConflictError("A job with this ID was already submitted") from error
+        except OSError as error:
+            raise StorageError(f"Failed to create job directory `{job_id}`") from error
+
+    async def job_dir_exists(self, job_id: str) -> bool:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.job_dir_exists`.
+        """
+        return path.isdir(self._job_path(job_id))
+
+    async def pull_job_data(self, job_id: str, target_directory: str) -> None:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.pull_job_data`.
+        The input files are copied, so that the runners cannot modify the stored inputs.
+        """
+        logging.debug('Copying job directory `%s` to dir `%s`', job_id, target_directory)
+
+        if not await self.job_dir_exists(job_id):
+            raise StorageError(f"Job directory for `{job_id}` does not exist")
+
+        pulled_count = await self._run(_transfer_tree, self._job_path(job_id, INPUT_DIR),
+                                       path.join(target_directory, INPUT_DIR), _copy_file)
+
+        if pulled_count == 0:
+            logging.warning('No input files pulled from job directory `%s`. Make sure they are in the `inputs/` '
+                            'folder.', job_id)
+
+    async def push_job_data(self, job_id: str, source_directory: str) -> None:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.push_job_data`.
+        The output files are moved from the source directory.
+        """
+        logging.debug('Moving dir `%s` to job directory `%s`', source_directory, job_id)
+
+        if not await self.job_dir_exists(job_id):
+            raise StorageError(f"Job directory for `{job_id}` does not exist")
+
+        pushed_count = await self._run(_transfer_tree, path.join(source_directory, OUTPUT_DIR),
+                                       self._job_path(job_id, OUTPUT_DIR), _move_file)
+
+        if pushed_count == 0:
+            logging.warning('No output files pushed to job directory `%s`. Make sure they are in the `outputs/` '
+                            'folder.', job_id)
+
+    async def put_file(self, job_id: str, file_path: str, stream: BinaryIO, length: int) -> None:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.put_file`.
+        """
+        await self._run(_write_file, self._job_path(job_id, file_path), stream, length, self._CHUNK_SIZE)
+
+    async def get_file(self, job_id: str, file_path: str) -> Optional[Union[StreamReader, str]]:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.get_file`.
+        The path of the file is returned, so that it is served with ``sendfile``.
+        """
+        try:
+            file = self._job_path(job_id, file_path)
+        except StorageError:
+            return None
+
+        return file if path.isfile(file) else None
+
+    async def set_job_status(self, job_id: str, status: JobStatusModel) -> None:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.set_job_status`.
+        """
+        data = json.dumps(status.to_primitive()).encode()
+
+        try:
+            await self._run(_write_file, self._job_path(job_id, JOB_STATUS_FILE), BytesIO(data), len(data),
+                            self._CHUNK_SIZE)
+        except StorageError as error:
+            raise StorageError(f"Failed to update status of job `{job_id}`") from error
+
+    async def get_job_status(self, job_id: str) -> JobStatusModel:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.get_job_status`.
+        """
+        status_path = self._job_path(job_id, JOB_STATUS_FILE)
+
+        try:
+            with open(status_path) as file:
+                return JobStatusModel(json.load(file))
+        except FileNotFoundError as error:
+            raise UnknownJobError('Data for job `{}` does not exist'.format(job_id)) from error
+        except (OSError, ValueError) as error:
+            raise StorageError(f"Failed to get status of job `{job_id}`") from error
@@ -0,0 +1,205 @@
+import os
+import json
+import asyncio
+import logging
+from os import path
+from io import BytesIO
+from collections import OrderedDict
+from typing import Optional, BinaryIO, Dict, Set
+
+from .storage import Storage
+from ..config import StorageConfig
+from ..errors.api import StorageError, NameConflictError, UnknownJobError
+from ..constants import JOB_STATUS_FILE, INPUT_DIR, OUTPUT_DIR
+from ..api.models import JobStatusModel, JobStatus
+
+
+_FOLDER_DELIMITER = '/'
+"""Delimiter of the folders in the file names."""
+
+
+def _read_tree(source_directory: str) -> Dict[str, bytes]:
+    """
+    Read all the files of a directory tree.
+
+    :param source_directory: the directory to read
+    :return: contents of the files by their paths relative to the directory (with ``/`` delimiters)
+    """
+    files = {}
+    for prefix, _, file_names in os.walk(source_directory):
+        for file_name in file_names:
+            file_path = path.join(prefix, file_name)
+            with open(file_path, "rb") as file:
+                files[path.relpath(file_path, source_directory).replace(path.sep, _FOLDER_DELIMITER)] = file.read()
+    return files
+
+
+def _write_tree(files: Dict[str, bytes], target_directory: str) -> None:
+    """
+    Write files to a directory tree.
+
+    :param files: contents of the files by their paths relative to the directory (with ``/`` delimiters)
+    :param target_directory: the directory to write the files to
+    """
+    for file_name, content in files.items():
+        file_path = path.join(target_directory, *file_name.split(_FOLDER_DELIMITER))
+        os.makedirs(path.dirname(file_path), exist_ok=True)
+        with open(file_path, "wb") as file:
+            file.write(content)
+
+
+class InMemoryStorage(Storage):
+    """
+    A storage adapter that keeps the job data in memory, hence they are lost when the shepherd exits.
+
+    The total size of the stored files may be limited with ``memory_limit``. The least recently used finished
+    (done or failed) jobs are evicted when the limit would be exceeded.
+    """
+
+    def __init__(self, storage_config: StorageConfig):
+        """
+        Initialize the storage according to the configuration.
+
+        :param storage_config: storage configuration
+        """
+        self._memory_limit: Optional[int] = storage_config.memory_limit
+        self._jobs: OrderedDict = OrderedDict()  # files of the jobs by their names, least recently used first
+        self._finished: Set[str] = set()  # ids of the done or failed jobs, which may be evicted
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """Total size of the stored files in bytes."""
+        return self._size
+
+    def _get_job(self, job_id: str) -> Dict[str, bytes]:
+        """
+        Get the files of a job and mark it as recently used.
+
+        :param job_id: job id
+        :raises StorageError: the job does not exist
+        :return: the job files by their names
+        """
+        if job_id not in self._jobs:
+            raise StorageError(f"Job directory for `{job_id}` does not exist")
+        self._jobs.move_to_end(job_id)
+        return self._jobs[job_id]
+
+    def _evict(self, job_id: str) -> None:
+        """
+        Remove a job with all its files.
+
+        :param job_id: job id
+        """
+        logging.debug('Evicting job `%s` from the in-memory storage', job_id)
+        self._size -= sum(map(len, self._jobs.pop(job_id).values()))
+        self._finished.discard(job_id)
+
+    def _store(self, job_id: str, files: Dict[str, bytes]) -> None:
+        """
+        Store files of a job, evict the least recently used finished jobs to make space for them if necessary.
+
+        :param job_id: job id
+        :param files: contents of the files by their names
+        :raises StorageError: the files do not fit in the memory limit
+        """
+        job = self._get_job(job_id)
+        growth = sum(len(content) - len(job.get(file_name, b"")) for file_name, content in files.items())
+
+        if self._memory_limit is not None:
+            for evicted_id in [candidate for candidate in self._jobs if candidate in self._finished]:
+                if self._size + growth <= self._memory_limit:
+                    break
+                if evicted_id != job_id:
+                    self._evict(evicted_id)
+
+            if self._size + growth > self._memory_limit:
+                raise StorageError(f"Files of job `{job_id}` do not fit in the in-memory storage")
+
+        job.update(files)
+        self._size += growth
+
+    async def is_accessible(self) -> bool:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.is_accessible`.
+        """
+        return True
+
+    async def init_job(self, job_id: str) -> None:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.init_job`.
+        """
+        if job_id in self._jobs:
+            raise NameConflictError("A job with this ID was already submitted")
+        self._jobs[job_id] = {}
+
+    async def job_dir_exists(self, job_id: str) -> bool:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.job_dir_exists`.
+        """
+        return job_id in self._jobs
+
+    async def pull_job_data(self, job_id: str, target_directory: str) -> None:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.pull_job_data`.
+        """
+        prefix = INPUT_DIR + _FOLDER_DELIMITER
+        inputs = {file_name: content for file_name, content in self._get_job(job_id).items()
+                  if file_name.startswith(prefix)}
+
+        if not inputs:
+            logging.warning('No input files pulled for job `%s`. Make sure they are in the `inputs/` folder.', job_id)
+
+        await asyncio.get_event_loop().run_in_executor(None, _write_tree, inputs, target_directory)
+
+    async def push_job_data(self, job_id: str, source_directory: str) -> None:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.push_job_data`.
+        """
+        self._get_job(job_id)
+        outputs = await asyncio.get_event_loop().run_in_executor(None, _read_tree,
+                                                                 path.join(source_directory, OUTPUT_DIR))
+
+        if not outputs:
+            logging.warning('No output files pushed for job `%s`. Make sure they are in the `outputs/` folder.',
+                            job_id)
+
+        self._store(job_id, {OUTPUT_DIR + _FOLDER_DELIMITER + file_name: content
+                             for file_name, content in outputs.items()})
+
+    async def put_file(self, job_id: str, file_path: str, stream: BinaryIO, length: int) -> None:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.put_file`.
+        """
+        content = await asyncio.get_event_loop().run_in_executor(None, stream.read, length)
+        self._store(job_id, {file_path: content})
+
+    async def get_file(self, job_id: str, file_path: str) -> Optional[BinaryIO]:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.get_file`.
+        """
+        content = self._get_job(job_id).get(file_path)
+        return BytesIO(content) if content is not None else None  # shares the buffer with the stored bytes
+
+    async def set_job_status(self, job_id: str, status: JobStatusModel) -> None:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.set_job_status`.
+        """
+        try:
+            self._store(job_id, {JOB_STATUS_FILE: json.dumps(status.to_primitive()).encode()})
+        except StorageError as error:
+            raise StorageError(f"Failed to update status of job `{job_id}`") from error
+
+        if status.status in (JobStatus.DONE, JobStatus.FAILED):
+            self._finished.add(job_id)
+        else:
+            self._finished.discard(job_id)
+
+    async def get_job_status(self, job_id: str) -> JobStatusModel:
+        """
+        Implementation of :py:meth:`shepherd.storage.Storage.get_job_status`.
+        """
+        if job_id not in self._jobs or JOB_STATUS_FILE not in self._jobs[job_id]:
+            raise UnknownJobError('Data for job `{}` does not exist'.format(job_id))
+
+        return JobStatusModel(json.loads(self._get_job(job_id)[JOB_STATUS_FILE]))
@@ -1,20 +1,26 @@
 import json
 import os
+import base64
 import asyncio
+import random
+import hashlib
 import logging
+import itertools
 from asyncio import StreamReader
 from os import path
 from io import BytesIO
-from typing import Optional, BinaryIO, AsyncIterable
+from collections import Counter
+from typing import Optional, BinaryIO, AsyncIterable, Sequence, Tuple, NamedTuple, Callable, Awaitable, TypeVar, List
 from xml.etree import ElementTree
 
 from aiohttp.typedefs import LooseHeaders
 import aiohttp
 from aiohttp.client_exceptions import ClientError as AioHTTPClientError
-from minio.helpers import get_target_url, get_md5_base64digest, get_sha256_hexdigest
+from minio.helpers import get_target_url
 from minio.signer import sign_v4
 
 from .storage import Storage
+from .transfer_scheduler import TransferScheduler
 from ..config import StorageConfig
 from ..errors.api import StorageError, StorageInaccessibleError, NameConflictError, UnknownJobError
 from ..constants import JOB_STATUS_FILE, INPUT_DIR, OUTPUT_DIR
@@ -24,6 +30,153 @@ from ..api.models import JobStatusModel
 _MINIO_FOLDER_DELIMITER = '/'
 """Minio folder delimiter."""
 
+_CONNECTION_ERRORS = (AioHTTPClientError, asyncio.TimeoutError)
+"""Exceptions raised by aiohttp when the storage cannot be reached or it does not respond in time."""
+
+T = TypeVar('T')
+
+
+class _ServerError(StorageError):
+    """Exception raised when the storage server responds with a 5xx status, i.e. the request may succeed later."""
+
+
+def _status_error(status: int, message: str) -> StorageError:
+    """
+    Create an exception for an unexpected response status.
+
+    :param status: the response status
+    :param message: the exception message
+    :return: :py:class:`_ServerError` (which is retried) for the 5xx statuses, :py:class:`StorageError` otherwise
+    """
+    return _ServerError(message) if status >= 500 else StorageError(message)
+
+
+class _GuardedStreamReader(aiohttp.StreamReader):
+    """
+    Proxy of a response body stream which reports the connection failures and timeouts
+    as :py:class:`StorageInaccessibleError`.
+    """
+
+    def __init__(self, stream: aiohttp.StreamReader):  # the state is kept by the wrapped stream
+        """
+        Wrap the given stream.
+
+        :param stream: the response body stream
+        """
+        self._stream = stream
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream, name)
+
+    async def _guard(self, read: Awaitable[T]) -> T:
+        """
+        Await a read of the wrapped stream.
+
+        :raises StorageInaccessibleError: the read failed due to a connection failure or a timeout
+        """
+        try:
+            return await read
+        except _CONNECTION_ERRORS as error:
+            raise StorageInaccessibleError() from error
+
+    def exception(self) -> Optional[BaseException]:
+        return self._stream.exception()
+
+    def at_eof(self) -> bool:
+        return self._stream.at_eof()
+
+    async def read(self, n: int = -1) -> bytes:
+        return await self._guard(self._stream.read(n))
+
+    async def readany(self) -> bytes:
+        return await self._guard(self._stream.readany())
+
+    async def readline(self) -> bytes:
+        return await self._guard(self._stream.readline())
+
+    async def readchunk(self) -> Tuple[bytes, bool]:
+        return await self._guard(self._stream.readchunk())
+
+    async def readexactly(self, n: int) -> bytes:
+        return await self._guard(self._stream.readexactly(n))
+
+
+class ConnectionPoolStats(NamedTuple):
+    """Utilization of the storage connection pool."""
+
+    limit: int
+    """Maximum number of open connections (0 for no limit)."""
+
+    in_use: int
+    """Number of connections used by the running requests."""
+
+    idle: int
+    """Number of open connections kept for reuse."""
+
+    waiting: int
+    """Number of requests waiting for a connection."""
+
+
+def _md5_base64digest(content: BinaryIO, length: int, chunk_size: int) -> str:
+    """
+    Compute the base64 encoded MD5 digest of the next ``length`` bytes of the given seekable stream chunk by chunk.
+    The stream position is restored afterwards.
+
+    :param content: seekable stream
+    :param length: number of bytes to digest
+    :param chunk_size: size of the chunks to read
+    :return: base64 encoded MD5 digest
+    """
+    position = content.tell()
+    md5 = hashlib.md5()
+    remaining = length
+    while remaining > 0:
+        chunk = content.read(min(chunk_size, remaining))
+        if not chunk:
+            break
+        md5.update(chunk)
+        remaining -= len(chunk)
+    content.seek(position)
+    return base64.b64encode(md5.digest()).decode()
+
+
+async def _gather_or_cancel(*coroutines: Awaitable) -> List:
+    """
+    Run the given coroutines concurrently like :py:func:`asyncio.gather`.
+    When any of them fails, the others are cancelled and awaited before the error is re-raised, so that none of them
+    keeps using the resources (e.g., open files) of the caller.
+
+    :param coroutines: the coroutines to run
+    :return: the results of the coroutines
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _read_chunks(content: BinaryIO, length: int, chunk_size: int) -> AsyncIterable[bytes]:
+    """
+    Read the next ``length`` bytes of the given stream chunk by chunk without blocking the event loop.
+
+    :param content: stream to read from
+    :param length: number of bytes to read
+    :param chunk_size: size of the chunks to read
+    :return: a generator of chunks
+    """
+    loop = asyncio.get_event_loop()
+    remaining = length
+    while remaining > 0:
+        chunk = await loop.run_in_executor(None, content.read, min(chunk_size, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
 
 class MinioStorage(Storage):
     """
@@ -34,6 +187,9 @@ class MinioStorage(Storage):
         "s3": "http://s3.amazonaws.com/doc/2006-03-01/"
     }
 
+    _CHUNK_SIZE = 128 * 1024
+    """Size of the chunks (in bytes) the objects are downloaded and uploaded in."""
+
     def __init__(self, storage_config: StorageConfig):
         """
         Initialize the storage according to the configuration.
@@ -41,8 +197,57 @@ class MinioStorage(Storage):
         :param storage_config: storage configuration
         """
 
-        self._session = aiohttp.ClientSession()
+        self._connector = aiohttp.TCPConnector(limit=storage_config.connection_limit,
+                                               limit_per_host=storage_config.connection_limit_per_host,
+                                               keepalive_timeout=storage_config.keepalive_timeout,
+                                               ttl_dns_cache=storage_config.dns_cache_ttl)
+        timeout = aiohttp.ClientTimeout(total=storage_config.request_timeout,
+                                        connect=storage_config.connect_timeout,
+                                        sock_read=storage_config.read_timeout)
+        self._session = aiohttp.ClientSession(connector=self._connector, timeout=timeout)
         self._config = storage_config
+        self.transfers = TransferScheduler(storage_config.max_transfers, storage_config.max_job_transfers)
+        """Scheduler of the job file transfers (with queue depth and in-flight statistics)."""
+        self.retry_counts: Counter = Counter()
+        """Number of retried requests by operation (``GET``, ``HEAD``, ``PUT`` and ``LIST``)."""
+
+    @property
+    def connection_pool_stats(self) -> ConnectionPoolStats:
+        """
+        Utilization of the connection pool.
+        The usage is read from the connector internals, it is reported as zero if they are not available.
+        """
+        return ConnectionPoolStats(limit=self._connector.limit,
+                                   in_use=len(getattr(self._connector, "_acquired", ())),
+                                   idle=sum(map(len, getattr(self._connector, "_conns", {}).values())),
+                                   waiting=sum(map(len, getattr(self._connector, "_waiters", {}).values())))
+
+    async def _retry(self, operation: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        """
+        Make an idempotent request and retry it up to ``retries`` times on transient failures (connection errors,
+        timeouts and 5xx responses).
+        The delays between the retries grow exponentially up to ``retry_max_delay`` and they are randomized (full
+        jitter), so that the requests failed during a storage outage are not retried all at once.
+
+        :param operation: the operation name (``GET``, ``HEAD``, ``PUT`` or ``LIST``) for :py:attr:`retry_counts`
+        :param attempt: coroutine function making a single attempt
+        :return: the result of the first successful attempt
+        """
+        for retry in itertools.count():
+            try:
+                return await attempt()
+            except (StorageInaccessibleError, _ServerError, asyncio.TimeoutError) as error:
+                if retry >= self._config.retries:
+                    if isinstance(error, asyncio.TimeoutError):
+                        raise StorageInaccessibleError() from error
+                    raise
+
+                delay = random.uniform(0, min(self._config.retry_max_delay,
+                                              self._config.retry_base_delay * 2 ** retry))
+                self.retry_counts[operation] += 1
+                logging.warning('Storage %s request failed (%r), retrying in %.2f seconds', operation,
+                                error.__cause__ or error, delay)
+                await asyncio.sleep(delay)
 
     @staticmethod
     def _ensure_user_agent_header(headers: Optional[LooseHeaders] = None) -> LooseHeaders:
@@ -74,14 +279,16 @@ class MinioStorage(Storage):
         headers = self._ensure_auth_headers("PUT", url)
 
         try:
-            response = await self._session.put(url, headers=headers)
-        except AioHTTPClientError as he:
+            # release the connection to the pool right away
+            async with self._session.put(url, headers=headers) as response:
+                status = response.status
+        except _CONNECTION_ERRORS as he:
             raise StorageInaccessibleError() from he
 
-        if response.status == 409:
+        if status == 409:
             raise NameConflictError("A job with this ID was already submitted")
 
-        if response.status != 200:
+        if status != 200:
             raise StorageError(f"Failed to create minio bucket `{job_id}`")
 
     async def is_accessible(self) -> bool:
@@ -93,9 +300,9 @@ class MinioStorage(Storage):
         headers = self._ensure_auth_headers('HEAD', url)
 
         try:
-            await self._session.head(url, headers=headers)
-            return True
-        except AioHTTPClientError:
+            async with self._session.head(url, headers=headers):
+                return True
+        except _CONNECTION_ERRORS:
             return False
 
     async def job_dir_exists(self, job_id: str) -> bool:
@@ -104,87 +311,202 @@ class MinioStorage(Storage):
         """
 
         url = get_target_url(self._config.url, job_id)
-        headers = self._ensure_auth_headers('HEAD', url)
 
-        try:
-            response = await self._session.head(url, headers=headers)
-        except AioHTTPClientError as error:
-            raise StorageInaccessibleError(f"Failed to check minio bucket `{job_id}`") from error
+        async def head() -> bool:
+            headers = self._ensure_auth_headers('HEAD', url)
+
+            try:
+                async with self._session.head(url, headers=headers) as response:
+                    status = response.status
+            except _CONNECTION_ERRORS as error:
+                raise StorageInaccessibleError(f"Failed to check minio bucket `{job_id}`") from error
+
+            if status >= 500:
+                raise _status_error(status, f"Failed to check minio bucket `{job_id}`")
+            return status == 200
 
-        return response.status == 200
+        return await self._retry("HEAD", head)
 
-    async def _list_bucket(self, bucket: str) -> AsyncIterable[str]:
+    async def _list_bucket(self, bucket: str, prefix: str = "") -> AsyncIterable[Tuple[str, int]]:
         """
-        List the names of all files in a bucket.
+        List the names and sizes of all files in a bucket (with the given prefix).
+        The listing pages are parsed incrementally, so the files are yielded as soon as they are received.
 
         :param bucket: the bucket to list
-        :return: a generator of file names
+        :param prefix: list only the files with this prefix
+        :return: a generator of file name and size pairs
         """
 
         continuation_token = None
         truncated = True
 
         while truncated:
-            query = {}
+            query = {"list-type": "2", "prefix": prefix}
             if continuation_token is not None:
                 query["continuation-token"] = continuation_token
 
             url = get_target_url(self._config.url, bucket_name=bucket, query=query)
-            headers = self._ensure_auth_headers("GET", url)
+            parser = ElementTree.XMLPullParser(events=("end",))
+            truncated = False
+            continuation_token = None
 
-            try:
-                response = await self._session.get(url, headers=headers)
-            except AioHTTPClientError as ce:
-                raise StorageInaccessibleError() from ce
+            async def get_page() -> aiohttp.ClientResponse:
+                headers = self._ensure_auth_headers("GET", url)
 
-            if response.status != 200:
-                raise StorageError(f"Listing minio bucket `{bucket}` failed")
+                try:
+                    response = await self._session.get(url, headers=headers)
+                except _CONNECTION_ERRORS as ce:
+                    raise StorageInaccessibleError() from ce
 
-            tree = ElementTree.fromstring(await response.text())
+                if response.status != 200:
+                    response.release()
+                    raise _status_error(response.status, f"Listing minio bucket `{bucket}` failed")
+                return response
 
-            for key in map(lambda el: el.text, tree.findall(".//s3:Key", self._NS)):
-                yield key
+            # only the request is retried, the listed files may have been yielded already when the body fails
+            response = await self._retry("LIST", get_page)
 
-            truncated = tree.find("s3:IsTruncated", self._NS).text != "false"
-            continuation_token = tree.find("s3:NextContinuationToken", self._NS)
+            try:
+                async with response:
+                    async for chunk in response.content.iter_chunked(self._CHUNK_SIZE):
+                        parser.feed(chunk)
+                        for _, element in parser.read_events():
+                            if element.tag == self._s3_tag("Contents"):
+                                yield (element.find("s3:Key", self._NS).text,
+                                       int(element.find("s3:Size", self._NS).text))
+                                element.clear()
+                            elif element.tag == self._s3_tag("IsTruncated"):
+                                truncated = element.text != "false"
+                            elif element.tag == self._s3_tag("NextContinuationToken"):
+                                continuation_token = element.text
+            except _CONNECTION_ERRORS as ce:
+                raise StorageInaccessibleError() from ce
+
+    @classmethod
+    def _s3_tag(cls, name: str) -> str:
+        """Get the fully qualified tag of an S3 XML element with the given name."""
+        return "{" + cls._NS["s3"] + "}" + name
 
     async def _get_object(self, bucket: str, object_name: str, destination: BinaryIO) -> None:
         """
         Fetch a remote object into a binary file/stream.
 
+        The request is retried only if the destination is seekable (it is rewound before every retry).
+
         :param bucket: the bucket where the object is stored
         :param object_name: the path to the object
         """
 
         url = get_target_url(self._config.url, bucket_name=bucket, object_name=object_name)
-        headers = self._ensure_auth_headers("GET", url)
+        start = destination.tell() if destination.seekable() else None
 
-        try:
-            async with self._session.get(url, headers=headers) as response:
-                if response.status != 200:
-                    raise StorageError(f"Could not fetch `{bucket}/{object_name}` from minio")
+        async def get() -> None:
+            if start is not None:
+                destination.seek(start)
+                destination.truncate()
+            headers = self._ensure_auth_headers("GET", url)
 
-                while True:
-                    chunk = await response.content.read(128 * 1024)
+            try:
+                async with self._session.get(url, headers=headers) as response:
+                    if response.status != 200:
+                        raise _status_error(response.status, f"Could not fetch `{bucket}/{object_name}` from minio")
 
-                    if not chunk:
-                        break
+                    while True:
+                        chunk = await response.content.read(self._CHUNK_SIZE)
 
-                    destination.write(chunk)
-        except AioHTTPClientError as ce:
-            raise StorageInaccessibleError() from ce
+                        if not chunk:
+                            break
+
+                        destination.write(chunk)
+            except _CONNECTION_ERRORS as ce:
+                raise StorageInaccessibleError() from ce
+
+        if start is None:
+            await get()
+        else:
+            await self._retry("GET", get)
+
+    async def _get_object_range(self, bucket: str, object_name: str, destination: int, start: int,
+                                end: int) -> None:
+        """
+        Fetch a byte range of a remote object into the same range of a file.
+
+        :param bucket: the bucket where the object is stored
+        :param object_name: the path to the object
+        :param destination: file descriptor of the destination file
+        :param start: the first byte of the range
+        :param end: the last byte of the range (inclusive)
+        """
+
+        url = get_target_url(self._config.url, bucket_name=bucket, object_name=object_name)
+
+        async def get_range() -> None:
+            headers = self._ensure_auth_headers("GET", url, {"Range": f"bytes={start}-{end}"})
+
+            try:
+                async with self._session.get(url, headers=headers) as response:
+                    if response.status != 206:
+                        raise _status_error(response.status, f"Could not fetch range {start}-{end} of "
+                                                             f"`{bucket}/{object_name}` from minio")
+
+                    offset = start
+                    while True:
+                        chunk = await response.content.read(self._CHUNK_SIZE)
+
+                        if not chunk:
+                            break
+
+                        os.pwrite(destination, chunk, offset)
+                        offset += len(chunk)
+            except _CONNECTION_ERRORS as ce:
+                raise StorageInaccessibleError() from ce
 
-    async def _download_object(self, bucket: str, object_name: str, destination_path: str) -> None:
+            if offset != end + 1:
+                raise StorageError(f"Incomplete range {start}-{end} of `{bucket}/{object_name}` fetched from minio")
+
+        await self._retry("GET", get_range)
+
+    async def _download_object(self, bucket: str, object_name: str, destination_path: str,
+                               size: Optional[int] = None) -> None:
         """
         Download a remote object into a file identified by a path.
+        Objects of at least ``ranged_download_threshold`` bytes are downloaded as multiple byte ranges in parallel.
+        The download waits for its turn in :py:attr:`transfers`.
+
+        :param bucket: the bucket where the object is stored
+        :param object_name: the path to the object
+        :param destination_path: where the object should be stored
+        :param size: size of the object (if known)
+        """
+
+        async with self.transfers.transfer(bucket, size or 0):
+            if size is None or size < self._config.ranged_download_threshold:
+                with open(destination_path, "wb") as destination:
+                    await self._get_object(bucket, object_name, destination)
+            else:
+                await self._download_object_ranged(bucket, object_name, destination_path, size)
+
+    async def _download_object_ranged(self, bucket: str, object_name: str, destination_path: str, size: int) -> None:
+        """
+        Download a remote object into a file identified by a path as multiple byte ranges in parallel.
 
         :param bucket: the bucket where the object is stored
         :param object_name: the path to the object
         :param destination_path: where the object should be stored
+        :param size: size of the object
         """
 
+        part_size = self._config.ranged_download_part_size
+        semaphore = asyncio.Semaphore(self._config.ranged_download_concurrency)
+
+        async def download_range(start: int) -> None:
+            async with semaphore:
+                await self._get_object_range(bucket, object_name, destination.fileno(), start,
+                                             min(start + part_size, size) - 1)
+
         with open(destination_path, "wb") as destination:
-            await self._get_object(bucket, object_name, destination)
+            destination.truncate(size)  # preallocate the file, so that the ranges may be written at their offsets
+            await _gather_or_cancel(*(download_range(start) for start in range(0, size, part_size)))
 
     async def pull_job_data(self, job_id: str, target_directory: str) -> None:
         """
@@ -198,12 +520,18 @@ class MinioStorage(Storage):
         pulled_count = 0
         tasks = []
 
-        async for file_name in self._list_bucket(job_id):
-            if file_name.startswith(INPUT_DIR + _MINIO_FOLDER_DELIMITER):
+        try:
+            # start the downloads as soon as the files are listed
+            async for file_name, size in self._list_bucket(job_id, INPUT_DIR + _MINIO_FOLDER_DELIMITER):
                 filepath = path.join(*file_name.split(_MINIO_FOLDER_DELIMITER))
                 os.makedirs(path.join(target_directory, path.dirname(filepath)), exist_ok=True)
-                tasks.append(self._download_object(job_id, file_name, path.join(target_directory, filepath)))
+                tasks.append(asyncio.ensure_future(
+                    self._download_object(job_id, file_name, path.join(target_directory, filepath), size)))
                 pulled_count += 1
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
 
         await asyncio.gather(*tasks)
 
@@ -214,6 +542,9 @@ class MinioStorage(Storage):
     async def _put_object(self, bucket: str, object_name: str, content: BinaryIO, length: int) -> None:
         """
         Store data from a file/stream object as a remote object.
+        The data are streamed in chunks of ``_CHUNK_SIZE`` bytes, so the memory usage does not depend on the length.
+        Seekable streams of at least ``multipart_threshold`` bytes are uploaded with a multipart upload.
+        Failed uploads of seekable streams are retried (the stream is rewound before every retry).
 
         :param bucket: the bucket where the object should be stored
         :param object_name: the name of the new object
@@ -221,40 +552,194 @@ class MinioStorage(Storage):
         :param length: the length of the data
         """
 
+        if length >= self._config.multipart_threshold and content.seekable():
+            await self._put_object_multipart(bucket, object_name, content, length)
+            return
+
         url = get_target_url(self._config.url, bucket_name=bucket, object_name=object_name)
 
-        headers = self._ensure_user_agent_header({
-            "Content-Length": str(length),
-            "Content-Type": "application/octet-stream"
-        })
+        md5 = None
+        start = None
+
+        # the payload is streamed, hence it is not signed (its MD5 digest is checked by the server if possible)
+        if content.seekable():
+            md5 = await asyncio.get_event_loop().run_in_executor(
+                None, _md5_base64digest, content, length, self._CHUNK_SIZE)
+            start = content.tell()
+
+        async def put() -> None:
+            if start is not None:
+                content.seek(start)
+            headers = self._ensure_user_agent_header({
+                "Content-Length": str(length),
+                "Content-Type": "application/octet-stream"
+            })
+            if md5 is not None:
+                headers["Content-Md5"] = md5
+            headers = self._ensure_auth_headers("PUT", url, headers, content_sha256="UNSIGNED-PAYLOAD")
+            data = _read_chunks(content, length, self._CHUNK_SIZE)
+
+            try:
+                # release the connection to the pool right away
+                async with self._session.put(url, data=data, headers=headers) as response:
+                    status = response.status
+            except _CONNECTION_ERRORS as ce:
+                raise StorageInaccessibleError() from ce
+
+            if status != 200:
+                raise _status_error(status, f"Failed to upload object `{bucket}/{object_name}`")
+
+        if start is None:
+            await put()
+        else:
+            await self._retry("PUT", put)
+
+    async def _put_object_multipart(self, bucket: str, object_name: str, content: BinaryIO, length: int) -> None:
+        """
+        Store data from a seekable file/stream object as a remote object with a multipart upload.
+        Up to ``multipart_concurrency`` parts of ``multipart_part_size`` bytes are read and uploaded in parallel.
+        The upload is aborted on failure, once all the part uploads are stopped.
+
+        :param bucket: the bucket where the object should be stored
+        :param object_name: the name of the new object
+        :param content: a seekable stream containing the object data
+        :param length: the length of the data
+        """
+        upload_id = await self._initiate_multipart_upload(bucket, object_name)
+        start = content.tell()
+        part_size = self._config.multipart_part_size
+        semaphore = asyncio.Semaphore(self._config.multipart_concurrency)
+        read_lock = asyncio.Lock()
+
+        async def upload_part(part_number: int, offset: int) -> str:
+            async with semaphore:
+                async with read_lock:
+                    content.seek(start + offset)
+                    data = await asyncio.get_event_loop().run_in_executor(
+                        None, content.read, min(part_size, length - offset))
+                return await self._upload_part(bucket, object_name, upload_id, part_number, data)
+
+        try:
+            etags = await _gather_or_cancel(*(upload_part(part_number, offset) for part_number, offset
+                                              in enumerate(range(0, length, part_size), start=1)))
+            await self._complete_multipart_upload(bucket, object_name, upload_id, etags)
+        except BaseException:
+            await self._abort_multipart_upload(bucket, object_name, upload_id)
+            raise
+
+    async def _initiate_multipart_upload(self, bucket: str, object_name: str) -> str:
+        """
+        Initiate a multipart upload of a remote object.
+
+        :param bucket: the bucket where the object should be stored
+        :param object_name: the name of the new object
+        :return: the upload id
+        """
+        url = get_target_url(self._config.url, bucket_name=bucket, object_name=object_name, query={"uploads": ""})
+        headers = self._ensure_auth_headers("POST", url, {"Content-Type": "application/octet-stream"})
 
-        data = content.read()
-        content_sha256 = get_sha256_hexdigest(data)
+        try:
+            async with self._session.post(url, headers=headers) as response:
+                if response.status != 200:
+                    raise StorageError(f"Failed to initiate multipart upload of `{bucket}/{object_name}`")
+                tree = ElementTree.fromstring(await response.text())
+        except _CONNECTION_ERRORS as ce:
+            raise StorageInaccessibleError() from ce
+
+        return tree.find("s3:UploadId", self._NS).text
 
-        if self._config.secure:
-            headers["Content-Md5"] = get_md5_base64digest(data)
-            content_sha256 = "UNSIGNED-PAYLOAD"
+    async def _upload_part(self, bucket: str, object_name: str, upload_id: str, part_number: int,
+                           data: bytes) -> str:
+        """
+        Upload a single part of a multipart upload.
 
-        headers = self._ensure_auth_headers("PUT", url, headers, content_sha256=content_sha256)
+        :param bucket: the bucket where the object should be stored
+        :param object_name: the name of the new object
+        :param upload_id: the upload id
+        :param part_number: number of the part (starting with 1)
+        :param data: the part data
+        :return: ETag of the uploaded part
+        """
+        url = get_target_url(self._config.url, bucket_name=bucket, object_name=object_name,
+                             query={"partNumber": str(part_number), "uploadId": upload_id})
+        md5 = base64.b64encode(hashlib.md5(data).digest()).decode()
+
+        async def put_part() -> str:
+            headers = self._ensure_user_agent_header({"Content-Length": str(len(data)), "Content-Md5": md5})
+            headers = self._ensure_auth_headers("PUT", url, headers, content_sha256="UNSIGNED-PAYLOAD")
+
+            try:
+                async with self._session.put(url, data=data, headers=headers) as response:
+                    if response.status != 200:
+                        raise _status_error(response.status,
+                                            f"Failed to upload part {part_number} of `{bucket}/{object_name}`")
+                    return response.headers["ETag"]
+            except _CONNECTION_ERRORS as ce:
+                raise StorageInaccessibleError() from ce
+
+        return await self._retry("PUT", put_part)
+
+    async def _complete_multipart_upload(self, bucket: str, object_name: str, upload_id: str,
+                                         etags: Sequence[str]) -> None:
+        """
+        Complete a multipart upload from the uploaded parts.
+
+        :param bucket: the bucket where the object should be stored
+        :param object_name: the name of the new object
+        :param upload_id: the upload id
+        :param etags: ETags of the uploaded parts ordered by their numbers
+        """
+        url = get_target_url(self._config.url, bucket_name=bucket, object_name=object_name,
+                             query={"uploadId": upload_id})
+        root = ElementTree.Element("CompleteMultipartUpload", xmlns=self._NS["s3"])
+        for part_number, etag in enumerate(etags, start=1):
+            part = ElementTree.SubElement(root, "Part")
+            ElementTree.SubElement(part, "PartNumber").text = str(part_number)
+            ElementTree.SubElement(part, "ETag").text = etag
+        data = ElementTree.tostring(root)
+        headers = self._ensure_auth_headers("POST", url, {"Content-Type": "application/xml"},
+                                            content_sha256=hashlib.sha256(data).hexdigest())
 
         try:
-            response = await self._session.put(url, data=data, headers=headers)
-        except AioHTTPClientError as ce:
+            async with self._session.post(url, data=data, headers=headers) as response:
+                # the server may report an error in the body of a response with 200 status
+                if response.status != 200 or b"<Error>" in await response.read():
+                    raise StorageError(f"Failed to complete multipart upload of `{bucket}/{object_name}`")
+        except _CONNECTION_ERRORS as ce:
             raise StorageInaccessibleError() from ce
 
-        if response.status != 200:
-            raise StorageError(f"Failed to upload object `{bucket}/{object_name}`")
+    async def _abort_multipart_upload(self, bucket: str, object_name: str, upload_id: str) -> None:
+        """
+        Abort a multipart upload and free the uploaded parts (failures are only logged).
+
+        :param bucket: the bucket where the object should be stored
+        :param object_name: the name of the new object
+        :param upload_id: the upload id
+        """
+        url = get_target_url(self._config.url, bucket_name=bucket, object_name=object_name,
+                             query={"uploadId": upload_id})
+        headers = self._ensure_auth_headers("DELETE", url)
+
+        try:
+            async with self._session.delete(url, headers=headers) as response:
+                if response.status != 204:
+                    logging.warning('Failed to abort multipart upload of `%s/%s`', bucket, object_name)
+        except _CONNECTION_ERRORS:
+            logging.warning('Failed to abort multipart upload of `%s/%s`', bucket, object_name)
 
     async def _upload_object(self, bucket: str, object_name: str, source_path: str):
         """
         Store the contents of a file identified by a path in a remote object.
+        The upload waits for its turn in :py:attr:`transfers`.
 
         :param bucket: the bucket where the object should stored
         :param object_name: the name of the new object
         :param source_path: the path of the source file
         """
-        with open(source_path, 'rb') as source:
-            await self._put_object(bucket, object_name, source, os.stat(source_path).st_size)
+        size = os.stat(source_path).st_size
+        async with self.transfers.transfer(bucket, size):
+            with open(source_path, 'rb') as source:
+                await self._put_object(bucket, object_name, source, size)
 
     async def push_job_data(self, job_id: str, source_directory: str) -> None:
         """
@@ -298,14 +783,21 @@ class MinioStorage(Storage):
         """
 
         url = get_target_url(self._config.url, bucket_name=bucket, object_name=object_name)
-        headers = self._ensure_auth_headers("HEAD", url)
 
-        try:
-            response = await self._session.head(url, headers=headers)
+        async def head() -> bool:
+            headers = self._ensure_auth_headers("HEAD", url)
 
-            return response.status == 200
-        except AioHTTPClientError as ce:
-            raise StorageInaccessibleError() from ce
+            try:
+                async with self._session.head(url, headers=headers) as response:
+                    status = response.status
+            except _CONNECTION_ERRORS as ce:
+                raise StorageInaccessibleError() from ce
+
+            if status >= 500:
+                raise _status_error(status, f"Failed to check object `{bucket}/{object_name}`")
+            return status == 200
+
+        return await self._retry("HEAD", head)
 
     async def get_file(self, job_id: str, file_path: str) -> Optional[StreamReader]:
         """
@@ -313,17 +805,25 @@ class MinioStorage(Storage):
         """
 
         url = get_target_url(self._config.url, bucket_name=job_id, object_name=file_path)
-        headers = self._ensure_auth_headers("GET", url)
 
-        try:
-            if not await self._object_exists(job_id, file_path):
-                return None
+        if not await self._object_exists(job_id, file_path):
+            return None
+
+        async def get() -> StreamReader:
+            headers = self._ensure_auth_headers("GET", url)
 
-            response = await self._session.get(url, headers=headers)
+            try:
+                response = await self._session.get(url, headers=headers)
+            except _CONNECTION_ERRORS as he:
+                raise StorageInaccessibleError() from he
 
-            return response.content
-        except AioHTTPClientError as he:
-            raise StorageInaccessibleError() from he
+            if response.status >= 500:
+                response.release()
+                raise _status_error(response.status, f"Could not fetch `{job_id}/{file_path}` from minio")
+            return _GuardedStreamReader(response.content)
+
+        # only the request is retried, the response is streamed by the caller
+        return await self._retry("GET", get)
 
     async def set_job_status(self, job_id: str, status: JobStatusModel) -> None:
         """
@@ -349,7 +849,7 @@ class MinioStorage(Storage):
 
             data = BytesIO()
             await self._get_object(job_id, JOB_STATUS_FILE, data)
-        except AioHTTPClientError as he:
+        except _CONNECTION_ERRORS as he:
             raise StorageInaccessibleError() from he
         except StorageError as ce:
             raise StorageError(f"Failed to get status of job `{job_id}`") from ce
@@ -364,5 +864,5 @@ class MinioStorage(Storage):
 
         try:
             await self._session.close()
-        except AioHTTPClientError as he:
+        except _CONNECTION_ERRORS as he:
             raise StorageError("There was an error while closing the AioHTTP client session") from he
@@ -1,6 +1,6 @@
 import abc
 from asyncio import StreamReader
-from typing import Optional, BinaryIO
+from typing import Optional, BinaryIO, Union
 
 from ..api.models import JobStatusModel
 
@@ -70,13 +70,13 @@ class Storage(metaclass=abc.ABCMeta):
         """
 
     @abc.abstractmethod
-    async def get_file(self, job_id: str, file_path: str) -> Optional[StreamReader]:
+    async def get_file(self, job_id: str, file_path: str) -> Optional[Union[StreamReader, BinaryIO, str]]:
         """
         Download given file.
 
         :param job_id: identifier of the job to which the file belongs
         :param file_path: path to the queried file
-        :return: a stream to read the file contents from
+        :return: a stream to read the file contents from or a path of a local file, ``None`` if it does not exist
         :raises StorageInaccessibleError: the remote storage is not accessible
         :raises StorageError: there was an error when communicating with the remote storage
         """
@@ -0,0 +1,113 @@
+import asyncio
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict
+
+
+class TransferScheduler:
+    """
+    Limits the number of file transfers running in parallel, both in total and per job.
+
+    Waiting transfers of different jobs take turns and the jobs with fewer running transfers go first, so a job with
+    thousands of files does not starve the other jobs.
+    """
+
+    def __init__(self, max_transfers: int, max_job_transfers: int):
+        """
+        Create new :py:class:`TransferScheduler`.
+
+        :param max_transfers: maximum number of transfers running in parallel
+        :param max_job_transfers: maximum number of transfers of a single job running in parallel
+        """
+        self._max_transfers = max_transfers
+        self._max_job_transfers = max_job_transfers
+        self._waiting: Dict[str, Deque[asyncio.Future]] = {}  # waiting transfers of the jobs
+        self._job_in_flight: Dict[str, int] = defaultdict(int)
+        self._last_turn: Dict[str, int] = {}  # number of the last turn of the jobs with waiting or running transfers
+        self._turns = 0
+        self._in_flight = 0
+        self._in_flight_bytes = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of transfers waiting for their turn."""
+        return sum(map(len, self._waiting.values()))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of running transfers."""
+        return self._in_flight
+
+    @property
+    def in_flight_bytes(self) -> int:
+        """Total size of the running transfers (in bytes, as far as it is known)."""
+        return self._in_flight_bytes
+
+    def _dispatch(self) -> None:
+        """Start the waiting transfers while there are free slots, take the jobs in turns."""
+        while self._in_flight < self._max_transfers:
+            # the job with the least running transfers goes first, the job which has not had its turn for
+            # the longest time wins a tie
+            candidates = [job_id for job_id in self._waiting
+                          if self._job_in_flight.get(job_id, 0) < self._max_job_transfers]
+            if not candidates:
+                return
+
+            job_id = min(candidates, key=lambda candidate: (self._job_in_flight.get(candidate, 0),
+                                                            self._last_turn.get(candidate, -1)))
+            waiting = self._waiting[job_id]
+            started = waiting.popleft()
+            if not waiting:
+                del self._waiting[job_id]
+            if started.cancelled():
+                continue  # the waiting transfer was cancelled
+
+            started.set_result(None)
+            self._job_in_flight[job_id] += 1
+            self._in_flight += 1
+            self._last_turn[job_id] = self._turns
+            self._turns += 1
+
+    def _release(self, job_id: str) -> None:
+        """
+        Free the slot of a finished transfer of the given job.
+
+        :param job_id: job id
+        """
+        self._in_flight -= 1
+        self._job_in_flight[job_id] -= 1
+        if self._job_in_flight[job_id] == 0:
+            del self._job_in_flight[job_id]
+            if job_id not in self._waiting:
+                del self._last_turn[job_id]
+        self._dispatch()
+
+    @asynccontextmanager
+    async def transfer(self, job_id: str, size: int = 0):
+        """
+        Wait for a free slot and keep it for a transfer of the given job until the context is exited.
+
+        :param job_id: job id
+        :param size: transfer size in bytes (if known)
+        """
+        started = asyncio.get_event_loop().create_future()
+        self._waiting.setdefault(job_id, deque()).append(started)
+        self._dispatch()
+
+        try:
+            await started
+        except asyncio.CancelledError:
+            if started.done() and not started.cancelled():
+                self._release(job_id)  # the slot was granted right before the cancellation
+            elif started in self._waiting.get(job_id, ()):
+                self._waiting[job_id].remove(started)
+                if not self._waiting[job_id]:
+                    del self._waiting[job_id]
+            raise
+
+        self._in_flight_bytes += size
+        try:
+            yield
+        finally:
+            self._in_flight_bytes -= size
+            self._release(job_id)
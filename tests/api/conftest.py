@@ -4,10 +4,11 @@ import asyncio
 
 from shepherd.api import create_app
 from shepherd.api.openapi import oapi
-from shepherd.api.models import SheepModel
+from shepherd.api.models import SheepModel, JobStatusModel, JobStatus
 from shepherd.api.views import create_shepherd_routes
 from shepherd.shepherd import Shepherd
 from shepherd.storage import MinioStorage
+from shepherd.errors.api import UnknownJobError
 
 
 @pytest.fixture(scope="function")
@@ -27,11 +28,20 @@ def mock_shepherd():
     async def nothing(*args, **kwargs):
         return None
 
+    async def wait_done(job_id):
+        if job_id == 'uuid-ready':
+            return JobStatusModel(dict(status=JobStatus.DONE, model=dict(name='model_1', version='latest')))
+        if job_id == 'uuid-not-ready':
+            await asyncio.Event().wait()
+        raise UnknownJobError('Data for job `{}` does not exist'.format(job_id))
+
     m = mock.create_autospec(Shepherd)
     m.get_status.side_effect = status_gen
     m.is_job_done.side_effect = ready
     m.job_done_condition = asyncio.Condition()
     m.enqueue_job.side_effect = nothing
+    m.get_job_status.return_value = None
+    m.wait_job_done.side_effect = wait_done
     yield m
 
 
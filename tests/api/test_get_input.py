@@ -4,7 +4,12 @@ from io import BytesIO
 import pytest
 from minio import Minio
 
+from shepherd.api import create_app
+from shepherd.api.openapi import oapi
+from shepherd.api.views import create_shepherd_routes
+from shepherd.config import StorageConfig
 from shepherd.constants import INPUT_DIR
+from shepherd.storage import LocalFsStorage
 
 
 @pytest.fixture()
@@ -31,3 +36,18 @@ async def test_get_input_not_found(job, aiohttp_client, app):
 
     response = await client.get("/jobs/{}/input/i-dont-exist.json".format(job_id))
     assert response.status == 404
+
+
+async def test_get_input_local_storage(tmpdir, mock_shepherd, aiohttp_client):
+    oapi.app = None  # HACK
+    storage = LocalFsStorage(StorageConfig(dict(type='local', path=str(tmpdir))))
+    await storage.init_job('job')
+    data = json.dumps({"content": "Lorem ipsum"}).encode()
+    await storage.put_file('job', INPUT_DIR + "/payload.json", BytesIO(data), len(data))
+
+    app = create_app(debug=True)
+    app.add_routes(create_shepherd_routes(mock_shepherd, storage))
+    client = await aiohttp_client(app)
+    response = await client.get("/jobs/job/input/payload.json")
+    assert response.status == 200
+    assert await response.json() == {"content": "Lorem ipsum"}
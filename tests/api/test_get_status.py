@@ -2,9 +2,10 @@ import json
 import asyncio
 import pytest
 from io import BytesIO
+from contextlib import asynccontextmanager
 
 from shepherd.constants import JOB_STATUS_FILE
-from shepherd.api.models import JobStatus
+from shepherd.api.models import JobStatus, JobStatusModel
 
 
 async def test_get_status(aiohttp_client, app):
@@ -72,3 +73,47 @@ async def test_ready_error(aiohttp_client, app):
     client = await aiohttp_client(app)
     response = await client.get('/jobs/non-existent/wait_ready')
     assert response.status == 400
+
+
+async def test_job_events(aiohttp_client, app, mock_shepherd):
+    updates = asyncio.Queue()
+    for job_id, status in (('job-a', JobStatus.QUEUED), ('job-b', JobStatus.PROCESSING), ('job-a', JobStatus.DONE),
+                           ('job-b', JobStatus.FAILED)):
+        updates.put_nowait((job_id, JobStatusModel(dict(status=status, model=dict(name='model', version='1')))))
+
+    @asynccontextmanager
+    async def subscribe_job_status(job_ids):
+        assert job_ids == ['job-a', 'job-b']
+        yield updates
+
+    mock_shepherd.subscribe_job_status = subscribe_job_status
+    client = await aiohttp_client(app)
+    response = await client.get('/jobs/events?job_ids=job-a,job-b')
+    assert response.status == 200
+    assert response.headers['Content-Type'] == 'text/event-stream'
+
+    events = (await response.text()).strip().split('\n\n')
+    assert all(event.startswith('event: status\ndata: ') for event in events)
+    data = [json.loads(event[len('event: status\ndata: '):]) for event in events]
+    assert [(item['job_id'], item['status']['status']) for item in data] == \
+        [('job-a', JobStatus.QUEUED), ('job-b', JobStatus.PROCESSING), ('job-a', JobStatus.DONE),
+         ('job-b', JobStatus.FAILED)]
+
+
+async def test_job_statuses(aiohttp_client, minio, app, mock_shepherd):
+    local_status = JobStatusModel(dict(status=JobStatus.PROCESSING, model=dict(name='model', version='1')))
+    mock_shepherd.get_job_status.side_effect = lambda job_id: local_status if job_id == 'uuid-local' else None
+
+    stored_status = json.dumps({'status': JobStatus.DONE, 'model': {'name': 'model', 'version': '1'}}).encode()
+    minio.make_bucket('uuid-stored')
+    minio.put_object('uuid-stored', JOB_STATUS_FILE, BytesIO(stored_status), len(stored_status))
+
+    client = await aiohttp_client(app)
+    response = await client.post('/jobs/status', headers={'Content-Type': 'application/json'}, data=json.dumps({
+        'job_ids': ['uuid-local', 'uuid-stored', 'uuid-unknown', 'uuid-local']
+    }))
+    assert response.status == 200
+    data = await response.json()
+    assert {job_id: status['status'] for job_id, status in data['statuses'].items()} == \
+        {'uuid-local': JobStatus.PROCESSING, 'uuid-stored': JobStatus.DONE}
+    assert data['unknown'] == ['uuid-unknown']
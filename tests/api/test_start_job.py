@@ -2,13 +2,19 @@ import json
 from io import BytesIO
 from typing import Union
 
+import aiohttp
 import pytest
 from minio import Minio
 from unittest.mock import Mock
 
+from shepherd.api import create_app
+from shepherd.api.openapi import oapi
+from shepherd.api.views import create_shepherd_routes
+from shepherd.config import StorageConfig
 from shepherd.errors.api import UnknownJobError
+from shepherd.storage import LocalFsStorage
 
-from shepherd.constants import DEFAULT_PAYLOAD_PATH
+from shepherd.constants import DEFAULT_PAYLOAD_PATH, DEFAULT_PAYLOAD_FILE, INPUT_DIR
 from shepherd.shepherd import Shepherd
 
 
@@ -115,3 +121,120 @@ async def test_start_job_with_payload_in_minio(minio: Minio, aiohttp_client, app
     assert response.status == 200
 
     mock_shepherd.enqueue_job.assert_called()
+
+
+async def test_start_jobs(minio: Minio, aiohttp_client, app, mock_shepherd: Union[Mock, Shepherd]):
+    client = await aiohttp_client(app)
+
+    response = await client.post("/start-jobs", headers={"Content-Type": "application/json"}, data=json.dumps({
+        "jobs": [{
+            "job_id": job_id,
+            "model": {
+                "name": "model_1",
+                "version": "latest"
+            },
+            "payload": "Payload of " + job_id
+        } for job_id in ("uuid-1", "uuid-2")] + [{
+            "job_id": "uuid-missing",
+            "model": {
+                "name": "model_1",
+                "version": "latest"
+            }
+        }]
+    }))
+
+    assert response.status == 200
+    results = (await response.json())["results"]
+    assert [result["job_id"] for result in results] == ["uuid-1", "uuid-2", "uuid-missing"]
+    assert [result["success"] for result in results] == [True, True, False]
+    assert results[2]["error"]["exception_type"] == "UnknownJobError"
+
+    for job_id in ("uuid-1", "uuid-2"):
+        assert minio.get_object(job_id, DEFAULT_PAYLOAD_PATH).data == ("Payload of " + job_id).encode()
+    assert mock_shepherd.enqueue_job.call_count == 2
+
+
+async def test_start_jobs_empty(aiohttp_client, app):
+    client = await aiohttp_client(app)
+
+    response = await client.post("/start-jobs", headers={"Content-Type": "application/json"},
+                                 data=json.dumps({"jobs": []}))
+
+    assert response.status == 400
+
+
+async def test_start_job_upload(minio: Minio, aiohttp_client, app, mock_shepherd: Union[Mock, Shepherd]):
+    client = await aiohttp_client(app)
+
+    data = aiohttp.FormData()
+    data.add_field("job", json.dumps({"job_id": "uuid-upload", "model": {"name": "model_1", "version": "latest"}}),
+                   content_type="application/json")
+    data.add_field("image", BytesIO(b"image content"), filename="images/a.png")
+    data.add_field("payload", BytesIO(b"payload content"), filename=DEFAULT_PAYLOAD_FILE)
+
+    response = await client.post("/start-job/upload", data=data)
+
+    assert response.status == 200
+    assert (await response.json())["success"]
+    assert minio.get_object("uuid-upload", INPUT_DIR + "/images/a.png").data == b"image content"
+    assert minio.get_object("uuid-upload", DEFAULT_PAYLOAD_PATH).data == b"payload content"
+    mock_shepherd.enqueue_job.assert_called()
+
+    spec = oapi.to_openapi_dict()["paths"]["/start-job/upload"]["post"]
+    assert "multipart/form-data" in spec["requestBody"]["content"]
+    assert "200" in spec["responses"]
+
+
+@pytest.mark.parametrize("fields", [
+    [("payload", b"payload content", "payload.json")],
+    [("job", b"{\"job_id\": \"uuid-upload\"}", None)],
+    [("job", b"not-json", None)],
+    [("job", b"\"string\"", None)],
+    [("job", b"{\"job_id\": \"uuid-upload\", \"model\": {\"name\": \"model_1\"}}", None),
+     ("payload", b"payload content", "../payload.json")],
+])
+async def test_start_job_upload_invalid(fields, aiohttp_client, app, mock_shepherd: Union[Mock, Shepherd]):
+    client = await aiohttp_client(app)
+
+    data = aiohttp.FormData()
+    for name, content, filename in fields:
+        data.add_field(name, BytesIO(content), filename=filename)
+
+    response = await client.post("/start-job/upload", data=data)
+
+    assert response.status == 400
+    mock_shepherd.enqueue_job.assert_not_called()
+
+
+async def test_start_job_upload_not_multipart(aiohttp_client, app):
+    client = await aiohttp_client(app)
+
+    response = await client.post("/start-job/upload", headers={"Content-Type": "application/json"}, data="{}")
+
+    assert response.status == 400
+
+
+async def test_start_job_upload_retry(tmpdir, aiohttp_client, mock_shepherd: Union[Mock, Shepherd]):
+    oapi.app = None  # HACK
+    storage = LocalFsStorage(StorageConfig(dict(type='local', path=str(tmpdir))))
+    app = create_app(debug=True)
+    app.add_routes(create_shepherd_routes(mock_shepherd, storage))
+    client = await aiohttp_client(app)
+
+    def upload_data(file_name: str) -> aiohttp.FormData:
+        data = aiohttp.FormData()
+        data.add_field("job", json.dumps({"job_id": "uuid-upload", "model": {"name": "model_1"}}))
+        data.add_field("image", BytesIO(b"image content"), filename=file_name)
+        data.add_field("other", BytesIO(b"other content" * 100000), filename="other.dat")
+        return data
+
+    response = await client.post("/start-job/upload", data=upload_data("../a.png"))
+    assert response.status == 400
+    assert not await storage.job_dir_exists("uuid-upload")
+
+    # the connection is reused and the job can be submitted again
+    response = await client.post("/start-job/upload", data=upload_data("a.png"))
+    assert response.status == 200
+    with open(await storage.get_file("uuid-upload", INPUT_DIR + "/a.png"), "rb") as file:
+        assert file.read() == b"image content"
+    mock_shepherd.enqueue_job.assert_called_once()
@@ -2,12 +2,14 @@ import pytest
 import zmq
 import zmq.asyncio
 
-from shepherd.comm import InputMessage, DoneMessage, ErrorMessage
+from shepherd.comm import InputMessage, DoneMessage, ErrorMessage, HeartbeatMessage, ReadyMessage
 
 
 messages = (InputMessage(dict(job_id='test_job', io_data_root='/tmp')),
             DoneMessage(dict(job_id='done_job')),
-            ErrorMessage(dict(job_id='test_job', message='short err', exception_traceback='it was really bad')))
+            ErrorMessage(dict(job_id='test_job', message='short err', exception_traceback='it was really bad')),
+            HeartbeatMessage(),
+            ReadyMessage())
 
 
 @pytest.fixture(params=messages)
@@ -0,0 +1,70 @@
+import os
+import json
+import time
+import asyncio
+import os.path as path
+
+import numpy as np
+import pytest
+
+from examples.docker.emloop_example.dummy import DummyModel
+from shepherd.constants import INPUT_DIR, OUTPUT_DIR, DEFAULT_PAYLOAD_FILE, DEFAULT_OUTPUT_FILE
+from shepherd.runner import BatchingJSONRunner
+from shepherd.runner.batching_runner import concatenate_batches, split_batch
+from shepherd.comm import *
+
+
+def test_concatenate_and_split():
+    batches = [{'a': np.array([1, 2]), 'b': ['x', 'y']}, {'a': np.array([3]), 'b': ['z']}]
+    merged = concatenate_batches(batches)
+    assert merged['a'].tolist() == [1, 2, 3]
+    assert merged['b'] == ['x', 'y', 'z']
+
+    split = split_batch(merged, [2, 1])
+    assert [batch['a'].tolist() for batch in split] == [[1, 2], [3]]
+    assert [batch['b'] for batch in split] == [['x', 'y'], ['z']]
+
+
+async def test_batching_runner(feeding_socket, tmpdir, mocker):
+    socket, port = feeding_socket
+    job_ids = ['job-1', 'job-2', 'job-3']
+    for i, job_id in enumerate(job_ids):
+        os.makedirs(path.join(tmpdir, job_id, INPUT_DIR))
+        os.makedirs(path.join(tmpdir, job_id, OUTPUT_DIR))
+        json.dump({'key': [i]}, open(path.join(tmpdir, job_id, INPUT_DIR, DEFAULT_PAYLOAD_FILE), 'w'))
+
+    run = mocker.spy(DummyModel, 'run')
+    config_path = path.join('examples', 'docker', 'emloop_example', 'emloop-test', 'latest')
+    runner = BatchingJSONRunner(config_path, port, 'predict', concurrency=3, max_batch_size=2, batch_window=0.1)
+    task = asyncio.create_task(runner.process_all())
+    for job_id in job_ids:
+        await Messenger.send(socket, InputMessage(dict(job_id=job_id, io_data_root=str(tmpdir))))
+    messages = [await Messenger.recv(socket, [DoneMessage]) for _ in job_ids]
+    task.cancel()
+
+    # the first two jobs are processed together, the last one after the batch window elapses
+    assert sorted(message.job_id for message in messages) == job_ids
+    assert run.call_count == 2
+    for i, job_id in enumerate(job_ids):
+        output = json.load(open(path.join(tmpdir, job_id, OUTPUT_DIR, DEFAULT_OUTPUT_FILE)))
+        assert output == {'key': [i], 'output': [i*2]}
+
+
+async def test_batching_runner_cancel(feeding_socket, tmpdir, mocker):
+    socket, port = feeding_socket
+    os.makedirs(path.join(tmpdir, 'job', INPUT_DIR))
+    os.makedirs(path.join(tmpdir, 'job', OUTPUT_DIR))
+    json.dump({'key': [0]}, open(path.join(tmpdir, 'job', INPUT_DIR, DEFAULT_PAYLOAD_FILE), 'w'))
+
+    mocker.patch.object(DummyModel, 'run', side_effect=lambda *args, **kwargs: time.sleep(0.5))
+    config_path = path.join('examples', 'docker', 'emloop_example', 'emloop-test', 'latest')
+    runner = BatchingJSONRunner(config_path, port, 'predict', max_batch_size=1)
+    task = asyncio.create_task(runner.process_all())
+    await Messenger.send(socket, InputMessage(dict(job_id='job', io_data_root=str(tmpdir))))
+    while not runner._batches:
+        await asyncio.sleep(0.01)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert not runner._batches
@@ -8,7 +8,7 @@ import os.path as path
 import subprocess
 from threading import Thread
 
-from shepherd.constants import OUTPUT_DIR, DEFAULT_OUTPUT_FILE
+from shepherd.constants import OUTPUT_DIR, DEFAULT_OUTPUT_FILE, DEFAULT_PAYLOAD_FILE
 from shepherd.runner import *
 from shepherd.runner.runner_entry_point import main
 from shepherd.comm import *
@@ -84,6 +84,23 @@ def test_runner_configuration(mocker):
         main()  # runner is configured to a non-existent module; thus, we expect a failure
 
 
+class LegacyRunner:
+    """Custom runner written before the concurrency and preload options existed."""
+
+    def __init__(self, config_path, port, stream_name):
+        self.args = config_path, port, stream_name
+
+    async def process_all(self):
+        LegacyRunner.created = self
+
+
+def test_legacy_runner_configuration(tmpdir, mocker):
+    mocker.patch('sys.argv', ['shepherd-runner', '-p', '8888', '-r', 'tests.runner.test_runner.LegacyRunner',
+                              str(tmpdir)])
+    main()
+    assert LegacyRunner.created.args == (str(tmpdir), 8888, 'predict')
+
+
 def test_n_gpus(mocker):
     n_system_gpus = len([s for s in os.listdir("/dev") if re.search(r'nvidia[0-9]+', s) is not None])
     assert n_available_gpus() == n_system_gpus
@@ -93,3 +110,52 @@ def test_n_gpus(mocker):
     assert n_available_gpus() == 1
     mocker.patch('os.environ', {'NVIDIA_VISIBLE_DEVICES': '0,3', 'CUDA_VISIBLE_DEVICES': ''})
     assert n_available_gpus() == 0
+
+
+async def test_json_runner_concurrency(job, feeding_socket):
+    socket, port = feeding_socket
+    job_id, job_dir = job
+
+    config_path = path.join('examples', 'docker', 'emloop_example', 'emloop-test', 'latest')
+    runner = JSONRunner(config_path, port, 'predict', concurrency=2)
+    task = asyncio.create_task(runner.process_all())
+    for _ in range(2):
+        await Messenger.send(socket, InputMessage(dict(job_id=job_id, io_data_root=job_dir)))
+    messages = [await Messenger.recv(socket, [DoneMessage]) for _ in range(2)]
+    task.cancel()
+
+    assert [message.job_id for message in messages] == [job_id, job_id]
+
+
+async def test_json_runner_preload(job, feeding_socket, tmpdir, mocker):
+    socket, port = feeding_socket
+    job_id, job_dir = job
+    warmup_dir = path.join(str(tmpdir), 'warmup')
+    os.makedirs(warmup_dir)
+    json.dump({'key': [1]}, open(path.join(warmup_dir, DEFAULT_PAYLOAD_FILE), 'w'))
+
+    config_path = path.join('examples', 'docker', 'emloop_example', 'emloop-test', 'latest')
+    runner = JSONRunner(config_path, port, 'predict', preload=True, warmup=warmup_dir)
+    process_job = mocker.spy(runner, '_process_job')
+    task = asyncio.create_task(runner.process_all())
+    await Messenger.send(socket, InputMessage(dict(job_id=job_id, io_data_root=job_dir)))
+    await Messenger.recv(socket, [DoneMessage])
+    task.cancel()
+
+    assert runner._model is not None
+    assert process_job.call_count == 2
+    assert process_job.call_args_list[0][0][0] == warmup_dir
+
+
+async def test_runner_ready_after_load(feeding_socket, mocker):
+    socket, port = feeding_socket
+    config_path = path.join('examples', 'docker', 'emloop_example', 'emloop-test', 'latest')
+    runner = JSONRunner(config_path, port, 'predict')
+    process_job = mocker.spy(runner, '_process_job')
+    task = asyncio.create_task(runner.process_all())
+    await Messenger.send(socket, HeartbeatMessage())
+    await Messenger.recv(socket, [ReadyMessage])
+    task.cancel()
+
+    assert runner._model is not None  # loaded before the runner reported it is ready
+    assert process_job.call_count == 0  # no warm-up without preload
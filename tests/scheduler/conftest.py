@@ -0,0 +1,22 @@
+from collections import deque
+from unittest import mock
+
+import pytest
+
+from shepherd.api.models import ModelModel
+
+
+@pytest.fixture()
+def sheep():
+    yield {sheep_id: mock.Mock(model_name=None, model_version=None, in_progress=set(), prefetched=deque())
+           for sheep_id in ('sheep_a', 'sheep_b')}
+
+
+@pytest.fixture()
+def model_a():
+    yield ModelModel(dict(name='model', version='a'))
+
+
+@pytest.fixture()
+def model_b():
+    yield ModelModel(dict(name='model', version='b'))
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from shepherd.scheduler import QueuedJob, RoundRobinScheduler, LeastLoadedScheduler, ModelAffinityScheduler, \
+    PriorityScheduler
+
+
+async def dequeue_nowait(scheduler, sheep_id):
+    return await asyncio.wait_for(scheduler.dequeue(sheep_id), timeout=0.1)
+
+
+async def test_round_robin(sheep, model_a, model_b, loop):
+    scheduler = RoundRobinScheduler(sheep)
+    for job_id, model in (('job-1', model_a), ('job-2', model_b), ('job-3', model_a)):
+        await scheduler.enqueue(QueuedJob(job_id, model))
+    assert len(scheduler) == 3
+
+    assert (await dequeue_nowait(scheduler, 'sheep_b')).job_id == 'job-1'
+    assert (await dequeue_nowait(scheduler, 'sheep_b')).job_id == 'job-2'
+    assert (await dequeue_nowait(scheduler, 'sheep_a')).job_id == 'job-3'
+    assert len(scheduler) == 0
+
+
+async def test_pinned_jobs(sheep, model_a, loop):
+    scheduler = RoundRobinScheduler(sheep)
+    await scheduler.enqueue(QueuedJob('job-1', model_a, 'sheep_a'))
+    await scheduler.enqueue(QueuedJob('job-2', model_a))
+
+    assert (await dequeue_nowait(scheduler, 'sheep_b')).job_id == 'job-2'
+    with pytest.raises(asyncio.TimeoutError):
+        await dequeue_nowait(scheduler, 'sheep_b')
+    assert (await dequeue_nowait(scheduler, 'sheep_a')).job_id == 'job-1'
+
+
+async def test_dequeue_waits(sheep, model_a, loop):
+    scheduler = RoundRobinScheduler(sheep)
+    task = asyncio.create_task(scheduler.dequeue('sheep_a'))
+    await asyncio.sleep(0.1)
+    assert not task.done()
+
+    await scheduler.enqueue(QueuedJob('job-1', model_a))
+    assert (await asyncio.wait_for(task, timeout=0.1)).job_id == 'job-1'
+
+
+async def test_least_loaded(sheep, model_a, loop):
+    scheduler = LeastLoadedScheduler(sheep)
+    sheep['sheep_a'].in_progress.add('job-0')
+
+    busy_task = asyncio.create_task(scheduler.dequeue('sheep_a'))
+    idle_task = asyncio.create_task(scheduler.dequeue('sheep_b'))
+    await asyncio.sleep(0.1)
+    await scheduler.enqueue(QueuedJob('job-1', model_a))
+
+    assert (await asyncio.wait_for(idle_task, timeout=0.1)).job_id == 'job-1'
+    await asyncio.sleep(0.1)
+    assert not busy_task.done()
+
+    await scheduler.enqueue(QueuedJob('job-2', model_a))
+    assert (await asyncio.wait_for(busy_task, timeout=0.1)).job_id == 'job-2'
+
+
+async def test_model_affinity(sheep, model_a, model_b, loop):
+    scheduler = ModelAffinityScheduler(sheep, work_stealing=False)
+    sheep['sheep_b'].model_name, sheep['sheep_b'].model_version = model_b.name, model_b.version
+    await scheduler.enqueue(QueuedJob('job-1', model_b))
+    await scheduler.enqueue(QueuedJob('job-2', model_a))
+    await scheduler.enqueue(QueuedJob('job-3', model_b, 'sheep_a'))
+
+    # jobs with the model of sheep_b are kept for sheep_b unless pinned to another sheep
+    assert (await dequeue_nowait(scheduler, 'sheep_a')).job_id == 'job-2'
+    assert (await dequeue_nowait(scheduler, 'sheep_a')).job_id == 'job-3'
+    with pytest.raises(asyncio.TimeoutError):
+        await dequeue_nowait(scheduler, 'sheep_a')
+    assert (await dequeue_nowait(scheduler, 'sheep_b')).job_id == 'job-1'
+
+
+async def test_priority(sheep, model_a, loop):
+    scheduler = PriorityScheduler(sheep)
+    for job_id, priority in (('job-1', 0), ('job-2', 5), ('job-3', 5), ('job-4', 1)):
+        await scheduler.enqueue(QueuedJob(job_id, model_a, priority=priority))
+
+    assert [(await dequeue_nowait(scheduler, 'sheep_a')).job_id for _ in range(4)] == \
+           ['job-2', 'job-3', 'job-4', 'job-1']
+
+
+async def test_work_stealing(sheep, model_a, model_b, loop):
+    scheduler = ModelAffinityScheduler(sheep, work_stealing=True, steal_threshold=2)
+    sheep['sheep_b'].model_name, sheep['sheep_b'].model_version = model_b.name, model_b.version
+    sheep['sheep_b'].in_progress.add('job-0')
+    await scheduler.enqueue(QueuedJob('job-1', model_b))
+
+    # the backlog of sheep_b is too short to be stolen from
+    with pytest.raises(asyncio.TimeoutError):
+        await dequeue_nowait(scheduler, 'sheep_a')
+
+    await scheduler.enqueue(QueuedJob('job-2', model_b))
+    assert (await dequeue_nowait(scheduler, 'sheep_a')).job_id == 'job-1'
+
+    # busy sheep do not steal
+    sheep['sheep_a'].in_progress.add('job-1')
+    await scheduler.enqueue(QueuedJob('job-3', model_b))
+    with pytest.raises(asyncio.TimeoutError):
+        await dequeue_nowait(scheduler, 'sheep_a')
+
+
+async def test_work_stealing_disabled(sheep, model_b, loop):
+    scheduler = ModelAffinityScheduler(sheep, work_stealing=False)
+    sheep['sheep_b'].model_name, sheep['sheep_b'].model_version = model_b.name, model_b.version
+    for job_id in ('job-1', 'job-2', 'job-3'):
+        await scheduler.enqueue(QueuedJob(job_id, model_b))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await dequeue_nowait(scheduler, 'sheep_a')
@@ -29,6 +29,46 @@ def test_bare_sheep_start_stop(bare_sheep: BareSheep):
     bare_sheep.start('emloop-test', 'latest')
 
 
+def test_bare_sheep_warm_runners(sheep_socket, tmpdir: Path, bare_sheep_config):
+    bare_sheep_config['warm_runners'] = 2
+    bare_sheep = BareSheep(bare_sheep_config, socket=sheep_socket, sheep_data_root=str(tmpdir))
+    try:
+        bare_sheep.start('emloop-test', 'latest')
+        latest_runner = bare_sheep._runners[('emloop-test', 'latest')]
+        bare_sheep.start('emloop-test', 'test')
+        assert bare_sheep.running
+        assert bare_sheep.warm_models == [('emloop-test', 'latest'), ('emloop-test', 'test')]
+
+        # switching back reuses the warm runner
+        bare_sheep.start('emloop-test', 'latest')
+        assert bare_sheep._runners[('emloop-test', 'latest')] is latest_runner
+        assert bare_sheep.warm_models == [('emloop-test', 'test'), ('emloop-test', 'latest')]
+
+        # the least recently used runner is evicted when the pool is full
+        bare_sheep.start('emloop-test', 'test2')
+        assert bare_sheep.warm_models == [('emloop-test', 'latest'), ('emloop-test', 'test2')]
+        assert ('emloop-test', 'test') not in bare_sheep._runners
+    finally:
+        bare_sheep.slaughter()
+    assert not bare_sheep.running
+    assert bare_sheep.warm_models == []
+
+
+def test_trim_warm_runners(sheep_socket, tmpdir: Path, bare_sheep_config, mocker):
+    bare_sheep_config.update(warm_runners=3, memory_budget=100)
+    bare_sheep = BareSheep(bare_sheep_config, socket=sheep_socket, sheep_data_root=str(tmpdir))
+    mocker.patch.object(bare_sheep, '_start_runner')
+    kill_runner = mocker.patch.object(bare_sheep, '_kill_runner')
+    mocker.patch.object(bare_sheep, '_runner_memory', side_effect=lambda name, version: 40 * 1024 ** 2)
+    for version in ('latest', 'test', 'test2'):
+        bare_sheep.start('emloop-test', version)
+    assert len(bare_sheep.warm_models) == 3  # switching the model does not measure the memory
+
+    bare_sheep.trim_warm_runners(bare_sheep.warm_runners_memory())
+    assert bare_sheep.warm_models == [('emloop-test', 'test'), ('emloop-test', 'test2')]
+    kill_runner.assert_called_once_with('emloop-test', 'latest')
+
+
 def test_bare_configuration_error(bare_sheep: BareSheep):
 
     with pytest.raises(SheepConfigurationError):  # model version does not exist
@@ -29,6 +29,16 @@ def test_load_config(valid_config_file):
     assert config.sheep['bare_sheep']['type'] == 'bare'
     assert config.sheep['bare_sheep']['port'] == 9001
 
+    assert config.scheduler.policy == 'model_affinity'
+    assert config.scheduler.work_stealing
+    assert config.scheduler.steal_threshold == 2
+    assert config.upload_workers == 4
+    assert config.storage.multipart_threshold == 64 * 1024 ** 2
+    assert config.storage.multipart_part_size == 16 * 1024 ** 2
+    assert config.storage.connection_limit == 100
+    assert config.storage.request_timeout is None
+    assert config.batch_concurrency == 32
+
 
 def test_load_config_valid_env(valid_config_env_file):
     os.environ['REGISTRY_URL'] = 'http://0.0.0.0:6000'
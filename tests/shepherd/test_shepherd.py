@@ -1,16 +1,25 @@
+import os
+import signal
 import asyncio
 import json
+import os.path as path
+from io import BytesIO
 from contextlib import suppress
+from unittest import mock
 
 import pytest
 
-from shepherd.constants import DEFAULT_OUTPUT_PATH, JOB_STATUS_FILE
+from shepherd.constants import DEFAULT_OUTPUT_PATH, JOB_STATUS_FILE, INPUT_DIR, DEFAULT_PAYLOAD_FILE, \
+    DEFAULT_PAYLOAD_PATH
 from shepherd.sheep import BareSheep, DockerSheep
-from shepherd.api.models import JobStatus
+from shepherd.api.models import JobStatus, JobStatusModel, ModelModel
+from shepherd.comm import DoneMessage
 from shepherd.shepherd import Shepherd
-from shepherd.errors.api import UnknownSheepError, UnknownJobError
+from shepherd.errors.api import UnknownSheepError, UnknownJobError, StorageError
 from shepherd.errors.sheep import SheepConfigurationError
-from shepherd.config import ShepherdConfig
+from shepherd.config import ShepherdConfig, SchedulerConfig, StorageConfig
+from shepherd.scheduler import PriorityScheduler, QueuedJob
+from shepherd.storage import Storage, InMemoryStorage
 from shepherd.utils.storage import minio_object_exists
 
 
@@ -108,3 +117,239 @@ async def test_bad_runner_job(shepherd, bad_runner_job, minio):
     assert await shepherd.is_job_done(job_id)
     assert minio_object_exists(minio, job_id, JOB_STATUS_FILE)
     assert json.load(minio.get_object(job_id, JOB_STATUS_FILE))["status"] == JobStatus.FAILED
+
+
+async def test_shepherd_scheduler(valid_config: ShepherdConfig, loop):
+    shepherd = Shepherd(valid_config.sheep, valid_config.data_root, mock.create_autospec(Storage),
+                        scheduler_config=SchedulerConfig(dict(policy='priority')))
+    assert isinstance(shepherd._scheduler, PriorityScheduler)
+
+    with pytest.raises(SheepConfigurationError):
+        Shepherd(valid_config.sheep, valid_config.data_root, mock.create_autospec(Storage),
+                 scheduler_config=SchedulerConfig(dict(policy='unknown')))
+
+
+async def test_shepherd_port_overlap(valid_config: ShepherdConfig, loop):
+    valid_config.sheep['bare_sheep']['warm_runners'] = 2
+    valid_config.sheep['another_sheep'] = dict(valid_config.sheep['bare_sheep'], port=9003, warm_runners=1)
+    Shepherd(valid_config.sheep, valid_config.data_root, mock.create_autospec(Storage))
+
+    valid_config.sheep['another_sheep']['port'] = 9002  # the second warm runner of `bare_sheep` listens on 9002
+    with pytest.raises(SheepConfigurationError):
+        Shepherd(valid_config.sheep, valid_config.data_root, mock.create_autospec(Storage))
+
+
+async def test_prefetch(valid_config: ShepherdConfig, loop):
+    valid_config.sheep['bare_sheep']['prefetch'] = 2
+    storage = mock.create_autospec(Storage)
+    shepherd = Shepherd(valid_config.sheep, valid_config.data_root, storage)
+    sheep = shepherd._get_sheep('bare_sheep')
+    for i in range(5):
+        await shepherd._scheduler.enqueue(QueuedJob(f'job-{i}', ModelModel(dict(name='model', version='a'))))
+
+    task = asyncio.create_task(shepherd._dequeue_jobs('bare_sheep'))
+    await asyncio.sleep(0.1)
+
+    # one job to be processed and two prefetched jobs
+    assert [job_id for job_id, _ in sheep.prefetched] == ['job-0', 'job-1', 'job-2']
+    assert all(preparation.done() for _, preparation in sheep.prefetched)
+    assert storage.pull_job_data.await_count == 3
+
+    # a busy sheep keeps its prefetch slots full
+    sheep.prefetched.popleft()
+    sheep.in_progress.add('job-0')
+    await shepherd._notify_sheep_jobs_changed()
+    await asyncio.sleep(0.1)
+    assert [job_id for job_id, _ in sheep.prefetched] == ['job-1', 'job-2']
+
+    sheep.in_progress.remove('job-0')
+    await shepherd._notify_sheep_jobs_changed()
+    await asyncio.sleep(0.1)
+    assert [job_id for job_id, _ in sheep.prefetched] == ['job-1', 'job-2', 'job-3']
+    task.cancel()
+
+
+async def test_finish_job(valid_config: ShepherdConfig, loop):
+    storage = mock.create_autospec(Storage)
+    shepherd = Shepherd(valid_config.sheep, valid_config.data_root, storage)
+    shepherd._status_store.start()
+    model = ModelModel(dict(name='model', version='a'))
+    for job_id in ('job-done', 'job-upload-failed'):
+        shepherd._job_status[job_id] = JobStatusModel(dict(model=model, status=JobStatus.PROCESSING))
+
+    await shepherd._finish_job('bare_sheep', DoneMessage(dict(job_id='job-done')))
+    (job_id, status), _ = storage.set_job_status.await_args
+    assert job_id == 'job-done' and status.status == JobStatus.DONE
+    assert 'job-done' not in shepherd._job_status
+    assert shepherd.get_job_status('job-done').status == JobStatus.DONE  # the finished status is kept in memory
+
+    storage.push_job_data.side_effect = StorageError('Boom!')
+    await shepherd._finish_job('bare_sheep', DoneMessage(dict(job_id='job-upload-failed')))
+    (job_id, status), _ = storage.set_job_status.await_args
+    assert job_id == 'job-upload-failed' and status.status == JobStatus.FAILED
+    assert 'Boom!' in status.error_details.message
+
+    await shepherd._status_store.close()
+
+
+async def test_preload(valid_config: ShepherdConfig, loop, monkeypatch):
+    monkeypatch.setenv('PYTHONPATH', os.getcwd())  # the example model is imported from the `examples` package
+    valid_config.sheep['bare_sheep']['preload'] = {'name': 'emloop-test', 'version': 'latest'}
+    shepherd = Shepherd(valid_config.sheep, valid_config.data_root, mock.create_autospec(Storage))
+    await shepherd.start()
+    sheep = shepherd._get_sheep('bare_sheep')
+    try:
+        assert sheep.running
+        assert (sheep.model_name, sheep.model_version) == ('emloop-test', 'latest')
+        for _ in range(100):
+            if sheep.ready:
+                break
+            await asyncio.sleep(0.1)
+        assert sheep.ready
+        assert sheep.startup_time is not None
+    finally:
+        await shepherd.close()
+    assert not sheep.running
+
+
+async def test_wait_ready_runner_died(valid_config: ShepherdConfig, loop):
+    shepherd = Shepherd(valid_config.sheep, valid_config.data_root, mock.create_autospec(Storage))
+    await shepherd.start()
+    sheep = shepherd._get_sheep('bare_sheep')
+    try:
+        async def send(*args):
+            pass
+
+        with mock.patch.object(sheep, 'wait_exited', side_effect=send), \
+                mock.patch('shepherd.shepherd.shepherd.Messenger.send', side_effect=send):
+            with pytest.raises(SheepConfigurationError):
+                await asyncio.wait_for(shepherd._wait_ready('bare_sheep'), 0.5)  # the exit is detected right away
+    finally:
+        await shepherd.close()
+
+
+async def test_runner_heartbeat_timeout(valid_config: ShepherdConfig, loop, monkeypatch):
+    monkeypatch.setenv('PYTHONPATH', os.getcwd())  # the example model is imported from the `examples` package
+    monkeypatch.setattr(Shepherd, '_HEARTBEAT_INTERVAL', 0.1)
+    valid_config.sheep['bare_sheep']['heartbeat_timeout'] = 1
+    shepherd = Shepherd(valid_config.sheep, valid_config.data_root, mock.create_autospec(Storage))
+    await shepherd.start()
+    sheep = shepherd._get_sheep('bare_sheep')
+    try:
+        shepherd._start_sheep('bare_sheep', 'emloop-test', 'latest')
+        await asyncio.wait_for(shepherd._wait_ready('bare_sheep'), 30)
+        await asyncio.sleep(1.5)
+        assert sheep.running and sheep.ready  # the heartbeats are answered
+
+        os.kill(sheep._runners[('emloop-test', 'latest')].pid, signal.SIGSTOP)  # the runner hangs
+        await asyncio.sleep(1.5)
+        assert not sheep.running and not sheep.ready
+    finally:
+        await shepherd.close()
+
+
+async def test_job_processing_after_ready(valid_config: ShepherdConfig, loop, monkeypatch):
+    monkeypatch.setenv('PYTHONPATH', os.getcwd())  # the example model is imported from the `examples` package
+    storage = mock.create_autospec(Storage)
+
+    async def pull_job_data(job_id, job_dir):
+        os.makedirs(path.join(job_dir, INPUT_DIR))
+        with open(path.join(job_dir, INPUT_DIR, DEFAULT_PAYLOAD_FILE), 'w') as payload_file:
+            json.dump({'key': [1]}, payload_file)
+
+    storage.pull_job_data.side_effect = pull_job_data
+    shepherd = Shepherd(valid_config.sheep, valid_config.data_root, storage)
+    await shepherd.start()
+    sheep = shepherd._get_sheep('bare_sheep')
+    try:
+        await shepherd.enqueue_job('job-ready', ModelModel(dict(name='emloop-test', version='latest')))
+        async with shepherd.job_done_condition:
+            await asyncio.wait_for(shepherd.job_done_condition.wait_for(
+                lambda: 'job-ready' not in shepherd._job_status), 30)
+
+        assert sheep.ready
+        assert sheep.startup_time is not None
+        statuses = [call[0][1] for call in storage.set_job_status.await_args_list]
+        assert [status.status for status in statuses[1:]] == [JobStatus.PROCESSING, JobStatus.DONE]
+        processing_status = statuses[1]
+        waiting_time = processing_status.processing_started_at - processing_status.enqueued_at
+        assert waiting_time.total_seconds() >= sheep.startup_time
+        _, status = next(shepherd.get_status())
+        assert status.ready and status.startup_time == sheep.startup_time
+    finally:
+        await shepherd.close()
+
+
+async def test_job_in_memory(valid_config: ShepherdConfig, loop, monkeypatch):
+    monkeypatch.setenv('PYTHONPATH', os.getcwd())  # the example model is imported from the `examples` package
+    storage = InMemoryStorage(StorageConfig(dict(type='memory')))
+    shepherd = Shepherd(valid_config.sheep, valid_config.data_root, storage)
+    await shepherd.start()
+    try:
+        await storage.init_job('job-memory')
+        data = json.dumps({'key': [1000]}).encode()
+        await storage.put_file('job-memory', DEFAULT_PAYLOAD_PATH, BytesIO(data), len(data))
+        await shepherd.enqueue_job('job-memory', ModelModel(dict(name='emloop-test', version='latest')))
+        await wait_for_job(shepherd, 'job-memory')
+
+        assert (await storage.get_job_status('job-memory')).status == JobStatus.DONE
+        output = json.load(await storage.get_file('job-memory', DEFAULT_OUTPUT_PATH))
+        assert output['output'] == [1000*2]
+    finally:
+        await shepherd.close()
+
+
+async def test_wait_job_done(valid_config: ShepherdConfig, loop):
+    storage = InMemoryStorage(StorageConfig(dict(type='memory')))
+    storage.get_job_status = mock.Mock(wraps=storage.get_job_status)
+    shepherd = Shepherd(valid_config.sheep, valid_config.data_root, storage)
+    shepherd._status_store.start()
+    model = ModelModel(dict(name='model', version='a'))
+    await storage.init_job('job-known')
+    shepherd._job_status['job-known'] = JobStatusModel(dict(model=model, status=JobStatus.PROCESSING))
+
+    waiters = [asyncio.create_task(shepherd.wait_job_done('job-known')) for _ in range(3)]
+    await asyncio.sleep(0.1)
+    assert not any(waiter.done() for waiter in waiters)
+    await shepherd._finish_job('bare_sheep', DoneMessage(dict(job_id='job-known')))
+    statuses = await asyncio.gather(*waiters)
+    assert all(status.status == JobStatus.DONE for status in statuses)
+    assert (await shepherd.wait_job_done('job-known')).status == JobStatus.DONE  # kept in memory
+    assert storage.get_job_status.call_count == 0
+    assert not shepherd._job_done and not shepherd._job_done_waiters
+
+    # the storage is queried for the unknown jobs only
+    await storage.init_job('job-unknown')
+    await storage.set_job_status('job-unknown', JobStatusModel(dict(model=model, status=JobStatus.FAILED)))
+    assert (await shepherd.wait_job_done('job-unknown')).status == JobStatus.FAILED
+    assert storage.get_job_status.call_count == 1
+    with pytest.raises(UnknownJobError):
+        await shepherd.wait_job_done('job-missing')
+    assert not shepherd._job_done and not shepherd._job_done_waiters
+
+    await shepherd._status_store.close()
+
+
+async def test_subscribe_job_status(valid_config: ShepherdConfig, loop):
+    storage = InMemoryStorage(StorageConfig(dict(type='memory')))
+    shepherd = Shepherd(valid_config.sheep, valid_config.data_root, storage)
+    shepherd._status_store.start()
+    model = ModelModel(dict(name='model', version='a'))
+    await storage.init_job('job-stored')
+    await storage.set_job_status('job-stored', JobStatusModel(dict(model=model, status=JobStatus.DONE)))
+    await storage.init_job('job')
+    shepherd._job_status['job'] = JobStatusModel(dict(model=model, status=JobStatus.PROCESSING))
+
+    async with shepherd.subscribe_job_status(['job', 'job-stored']) as updates:
+        await shepherd._finish_job('bare_sheep', DoneMessage(dict(job_id='job')))
+        received = [updates.get_nowait() for _ in range(updates.qsize())]
+    assert [(job_id, status.status) for job_id, status in received] == \
+        [('job', JobStatus.PROCESSING), ('job-stored', JobStatus.DONE), ('job', JobStatus.DONE)]
+    assert not shepherd._status_subscribers
+
+    with pytest.raises(UnknownJobError):
+        async with shepherd.subscribe_job_status(['job-missing']):
+            pass
+    assert not shepherd._status_subscribers
+
+    await shepherd._status_store.close()
@@ -0,0 +1,124 @@
+import gc
+import asyncio
+from unittest import mock
+
+import pytest
+
+from shepherd.api.models import JobStatus, JobStatusModel
+from shepherd.errors.api import StorageError
+from shepherd.shepherd.status_store import StatusStore
+from shepherd.storage import Storage
+
+
+def job_status(status: str) -> JobStatusModel:
+    return JobStatusModel(dict(status=status, model=dict(name='model', version='latest')))
+
+
+@pytest.fixture()
+def slow_storage():
+    storage = mock.create_autospec(Storage)
+    storage.writes = []
+
+    async def set_job_status(job_id, status):
+        storage.writes.append((job_id, status.status))
+        await asyncio.sleep(0.1)
+
+    storage.set_job_status.side_effect = set_job_status
+    yield storage
+
+
+async def test_status_store_coalescing(slow_storage, loop):
+    store = StatusStore(slow_storage, worker_count=1)
+    store.start()
+
+    first = store.set('job', job_status(JobStatus.QUEUED))
+    await asyncio.sleep(0.01)  # the first status is being written
+    superseded = store.set('job', job_status(JobStatus.PROCESSING))
+    last = store.set('job', job_status(JobStatus.DONE))
+    assert store.pending_count == 1
+
+    await asyncio.gather(first, superseded, last)
+    assert slow_storage.writes == [('job', JobStatus.QUEUED), ('job', JobStatus.DONE)]
+    assert store.get('job').status == JobStatus.DONE
+    await store.close()
+
+
+async def test_status_store_parallel(slow_storage, loop):
+    store = StatusStore(slow_storage, worker_count=4)
+    store.start()
+
+    started = loop.time()
+    await asyncio.gather(*(store.set(f'job-{i}', job_status(JobStatus.QUEUED)) for i in range(4)))
+    assert loop.time() - started < 0.2
+    assert len(slow_storage.writes) == 4
+    assert store.get('job-0') is None  # only the finished statuses are kept
+    await store.close()
+
+
+async def test_status_store_capacity(loop):
+    store = StatusStore(mock.create_autospec(Storage), capacity=2)
+    store.start()
+
+    for job_id in ('job-a', 'job-b', 'job-c'):
+        store.set(job_id, job_status(JobStatus.FAILED))
+    assert store.get('job-a') is None
+    assert store.get('job-b') is not None and store.get('job-c') is not None
+
+    store.set('job-b', job_status(JobStatus.QUEUED))  # the job was re-submitted
+    assert store.get('job-b') is None
+    await store.close()
+
+
+async def test_status_store_failure(loop):
+    storage = mock.create_autospec(Storage)
+    storage.set_job_status.side_effect = StorageError('storage failed')
+    store = StatusStore(storage)
+    store.start()
+
+    with pytest.raises(StorageError):
+        await store.set('job', job_status(JobStatus.QUEUED))
+    await store.close()
+
+
+async def test_status_store_unawaited_failure(loop):
+    async def set_job_status(*_):
+        raise StorageError('storage failed')
+
+    storage = mock.create_autospec(Storage)
+    storage.set_job_status.side_effect = set_job_status
+    store = StatusStore(storage)
+    store.start()
+
+    errors = []
+    loop.set_exception_handler(lambda _, context: errors.append(context))
+    store.set('job', job_status(JobStatus.QUEUED))  # written in the background, nobody awaits the result
+    await store.close()
+    await asyncio.sleep(0.01)  # let the cancelled workers finish
+    del store
+    gc.collect()  # the futures report the unretrieved exceptions once collected
+    assert errors == []
+
+
+@pytest.mark.parametrize('fail', [False, True])
+async def test_status_store_cancelled_waiter(fail, slow_storage, loop):
+    if fail:
+        slow_storage.set_job_status.side_effect = StorageError('storage failed')
+    store = StatusStore(slow_storage, worker_count=1)
+    store.start()
+
+    store.set('job-a', job_status(JobStatus.QUEUED)).cancel()  # the waiter gave up
+    await asyncio.sleep(0.01)
+
+    slow_storage.set_job_status.side_effect = None
+    await asyncio.wait_for(store.set('job-b', job_status(JobStatus.QUEUED)), 1)
+    await asyncio.wait_for(store.close(), 1)
+
+
+async def test_status_store_set_before_start(slow_storage, loop):
+    store = StatusStore(slow_storage)
+    written = store.set('job', job_status(JobStatus.QUEUED))
+
+    store.start()
+    await asyncio.wait_for(written, 1)
+    assert slow_storage.writes == [('job', JobStatus.QUEUED)]
+    await store.close()
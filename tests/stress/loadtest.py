@@ -1,4 +1,5 @@
 from uuid import uuid4 as uuid
+import os
 import json
 import asyncio
 from io import BytesIO
@@ -12,6 +13,7 @@ from shepherd.constants import DEFAULT_PAYLOAD_PATH
 _SHEPHERD_URL = 'http://0.0.0.0:5000'
 _BYTES = str(open("/dev/urandom", "rb").read(10*1024**2))
 _SLEEP = 5
+_MINIO = os.environ.get('STRESS_STORAGE', 'minio') == 'minio'  # the jobs with data put to minio need minio storage
 
 
 def minio():
@@ -161,7 +163,8 @@ async def job_with_payload(session):
 
 @scenario(weight=20)
 async def job_with_minio(session):
-    await asyncio.wait_for(job_lifecycle_minio(session, minio()), timeout=120)
+    if _MINIO:
+        await asyncio.wait_for(job_lifecycle_minio(session, minio()), timeout=120)
 
 
 @scenario(weight=20)
@@ -0,0 +1,96 @@
+import io
+import os
+import os.path as path
+
+import pytest
+
+from shepherd.api.models import JobStatusModel, JobStatus
+from shepherd.config import StorageConfig
+from shepherd.constants import INPUT_DIR, OUTPUT_DIR, DEFAULT_PAYLOAD_PATH
+from shepherd.errors.api import StorageError, NameConflictError, UnknownJobError
+from shepherd.storage import LocalFsStorage
+from shepherd.storage.local_storage import _copy_file, _write_file
+
+
+@pytest.fixture()
+def local_storage(tmpdir, loop):
+    yield LocalFsStorage(StorageConfig(dict(type='local', path=path.join(tmpdir, 'storage'))))
+
+
+async def test_local_init_job(local_storage: LocalFsStorage):
+    assert await local_storage.is_accessible()
+    assert not await local_storage.job_dir_exists('job')
+
+    await local_storage.init_job('job')
+    assert await local_storage.job_dir_exists('job')
+    with pytest.raises(NameConflictError):
+        await local_storage.init_job('job')
+    with pytest.raises(StorageError):
+        await local_storage.init_job('..')
+
+
+async def test_local_files(local_storage: LocalFsStorage):
+    await local_storage.init_job('job')
+    await local_storage.put_file('job', DEFAULT_PAYLOAD_PATH, io.BytesIO(b'payload and more'), 7)
+
+    file = await local_storage.get_file('job', DEFAULT_PAYLOAD_PATH)
+    with open(file, 'rb') as payload:
+        assert payload.read() == b'payload'
+    assert await local_storage.get_file('job', INPUT_DIR + '/missing') is None
+    assert await local_storage.get_file('job', '../../secret') is None
+
+
+async def test_local_pull_push(local_storage: LocalFsStorage, tmpdir):
+    await local_storage.init_job('job')
+    await local_storage.put_file('job', INPUT_DIR + '/nested/a.dat', io.BytesIO(b'input'), 5)
+    working_dir = path.join(tmpdir, 'working')
+
+    await local_storage.pull_job_data('job', working_dir)
+    pulled = path.join(working_dir, INPUT_DIR, 'nested', 'a.dat')
+    with open(pulled, 'r+b') as file:
+        file.write(b'INPUT')  # the runner modifies the input in place
+    with open(await local_storage.get_file('job', INPUT_DIR + '/nested/a.dat'), 'rb') as stored:
+        assert stored.read() == b'input'
+
+    os.makedirs(path.join(working_dir, OUTPUT_DIR))
+    with open(path.join(working_dir, OUTPUT_DIR, 'output'), 'wb') as output:
+        output.write(b'output')
+    await local_storage.push_job_data('job', working_dir)
+    assert not path.exists(path.join(working_dir, OUTPUT_DIR, 'output'))  # moved
+    with open(await local_storage.get_file('job', OUTPUT_DIR + '/output'), 'rb') as output:
+        assert output.read() == b'output'
+
+    with pytest.raises(StorageError):
+        await local_storage.pull_job_data('missing', working_dir)
+
+
+async def test_local_job_status(local_storage: LocalFsStorage):
+    await local_storage.init_job('job')
+    with pytest.raises(UnknownJobError):
+        await local_storage.get_job_status('job')
+
+    status = JobStatusModel(dict(status=JobStatus.QUEUED, model=dict(name='model', version='latest')))
+    await local_storage.set_job_status('job', status)
+    assert (await local_storage.get_job_status('job')).status == JobStatus.QUEUED
+
+
+def test_copy_file(tmpdir):
+    data = os.urandom(1000)
+    with open(path.join(tmpdir, 'source'), 'wb') as source:
+        source.write(data)
+
+    _copy_file(path.join(tmpdir, 'source'), path.join(tmpdir, 'destination'))
+    with open(path.join(tmpdir, 'destination'), 'rb') as destination:
+        assert destination.read() == data
+
+
+def test_write_file_failure(tmpdir):
+    class FailingStream(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell() > 0:
+                raise OSError('connection reset')
+            return super().read(size)
+
+    with pytest.raises(OSError):
+        _write_file(path.join(tmpdir, 'data', 'file'), FailingStream(os.urandom(1000)), 1000, 100)
+    assert os.listdir(path.join(tmpdir, 'data')) == []
@@ -0,0 +1,65 @@
+import io
+import os
+import os.path as path
+
+import pytest
+
+from shepherd.api.models import JobStatusModel, JobStatus
+from shepherd.config import StorageConfig
+from shepherd.constants import INPUT_DIR, OUTPUT_DIR, DEFAULT_PAYLOAD_PATH
+from shepherd.errors.api import StorageError, NameConflictError, UnknownJobError
+from shepherd.storage import InMemoryStorage
+
+
+def job_status(status: str) -> JobStatusModel:
+    return JobStatusModel(dict(status=status, model=dict(name='model', version='latest')))
+
+
+async def test_memory_storage(tmpdir, loop):
+    storage = InMemoryStorage(StorageConfig(dict(type='memory')))
+    await storage.init_job('job')
+    with pytest.raises(NameConflictError):
+        await storage.init_job('job')
+    with pytest.raises(UnknownJobError):
+        await storage.get_job_status('job')
+
+    await storage.put_file('job', INPUT_DIR + '/nested/a.dat', io.BytesIO(b'input'), 5)
+    await storage.pull_job_data('job', str(tmpdir))
+    with open(path.join(tmpdir, INPUT_DIR, 'nested', 'a.dat'), 'rb') as file:
+        assert file.read() == b'input'
+
+    os.makedirs(path.join(tmpdir, OUTPUT_DIR))
+    with open(path.join(tmpdir, OUTPUT_DIR, 'output'), 'wb') as file:
+        file.write(b'output')
+    await storage.push_job_data('job', str(tmpdir))
+    assert (await storage.get_file('job', OUTPUT_DIR + '/output')).read() == b'output'
+    assert await storage.get_file('job', OUTPUT_DIR + '/missing') is None
+    assert storage.size == 11
+
+    await storage.set_job_status('job', job_status(JobStatus.DONE))
+    assert (await storage.get_job_status('job')).status == JobStatus.DONE
+    with pytest.raises(StorageError):
+        await storage.pull_job_data('missing', str(tmpdir))
+
+
+async def test_memory_storage_eviction(loop):
+    storage = InMemoryStorage(StorageConfig(dict(type='memory', memory_limit=1500)))
+    for job_id in ('job-a', 'job-b', 'job-c'):
+        await storage.init_job(job_id)
+        await storage.put_file(job_id, DEFAULT_PAYLOAD_PATH, io.BytesIO(b'x' * 300), 300)
+    await storage.set_job_status('job-a', job_status(JobStatus.DONE))
+    await storage.set_job_status('job-b', job_status(JobStatus.FAILED))
+    await storage.set_job_status('job-c', job_status(JobStatus.DONE))
+    await storage.get_file('job-a', DEFAULT_PAYLOAD_PATH)  # job-b is the least recently used now
+
+    await storage.init_job('job-d')
+    await storage.put_file('job-d', DEFAULT_PAYLOAD_PATH, io.BytesIO(b'x' * 300), 300)
+    assert not await storage.job_dir_exists('job-b')
+    assert await storage.job_dir_exists('job-a') and await storage.job_dir_exists('job-c')
+    assert storage.size <= 1500
+
+    # unfinished jobs are never evicted
+    await storage.init_job('job-e')
+    with pytest.raises(StorageError):
+        await storage.put_file('job-e', DEFAULT_PAYLOAD_PATH, io.BytesIO(b'x' * 1500), 1500)
+    assert await storage.job_dir_exists('job-d')
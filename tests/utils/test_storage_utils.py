@@ -2,12 +2,17 @@ import pytest
 import os
 import os.path as path
 import io
+import base64
+import asyncio
+import hashlib
 
+from aiohttp import web
 from minio import Minio
 
 from shepherd.config import StorageConfig
 from shepherd.constants import INPUT_DIR, OUTPUT_DIR
 from shepherd.storage import MinioStorage
+from shepherd.storage.minio_storage import _read_chunks, _md5_base64digest, _ServerError
 from shepherd.utils import *
 from shepherd.errors.api import StorageError, StorageInaccessibleError, UnknownJobError
 
@@ -135,3 +140,208 @@ async def test_minio_accessibility_negative(storage_config_inaccessible, minio):
 async def test_nonexistent_job_done(storage: MinioStorage, minio):
     with pytest.raises(UnknownJobError):
         await storage.get_job_status("whatever-i-dont-exist")
+
+
+async def test_read_chunks(loop):
+    data = io.BytesIO(b'0123456789abc')
+    chunks = [chunk async for chunk in _read_chunks(data, 10, 4)]
+    assert chunks == [b'0123', b'4567', b'89']
+    assert data.read() == b'abc'
+
+
+def test_md5_base64digest():
+    data = io.BytesIO(b'0123456789')
+    data.seek(2)
+    assert _md5_base64digest(data, 8, 3) == base64.b64encode(hashlib.md5(b'23456789').digest()).decode()
+    assert data.tell() == 2
+
+
+async def test_minio_put_file_streamed(storage: MinioStorage, minio: Minio, bucket, tmpdir):
+    data = os.urandom(3 * MinioStorage._CHUNK_SIZE + 42)
+    with open(path.join(tmpdir, 'large.bin'), 'wb') as file:
+        file.write(data)
+
+    with open(path.join(tmpdir, 'large.bin'), 'rb') as file:
+        await storage.put_file(bucket, INPUT_DIR + '/large.bin', file, len(data))
+    assert minio.get_object(bucket, INPUT_DIR + '/large.bin').read() == data
+
+
+async def test_minio_put_file_multipart(storage_config: StorageConfig, minio: Minio, bucket, mocker):
+    config = StorageConfig(dict(storage_config.to_primitive(), multipart_threshold=6 * 1024 ** 2,
+                                multipart_part_size=5 * 1024 ** 2, multipart_concurrency=2))
+    storage = MinioStorage(config)
+    upload_part = mocker.spy(storage, '_upload_part')
+    data = os.urandom(11 * 1024 ** 2)
+
+    await storage.put_file(bucket, INPUT_DIR + '/large.bin', io.BytesIO(data), len(data))
+    assert upload_part.call_count == 3
+    assert minio.get_object(bucket, INPUT_DIR + '/large.bin').read() == data
+
+    # failed uploads are aborted
+    abort = mocker.spy(storage, '_abort_multipart_upload')
+    mocker.patch.object(storage, '_upload_part', side_effect=StorageError('part upload failed'))
+    with pytest.raises(StorageError):
+        await storage.put_file(bucket, INPUT_DIR + '/failed.bin', io.BytesIO(data), len(data))
+    assert abort.call_count == 1
+    assert not minio_object_exists(minio, bucket, INPUT_DIR + '/failed.bin')
+    await storage.close()
+
+
+async def test_minio_put_file_multipart_part_failure(storage_config: StorageConfig, minio: Minio, bucket, mocker):
+    config = StorageConfig(dict(storage_config.to_primitive(), multipart_threshold=6 * 1024 ** 2,
+                                multipart_part_size=5 * 1024 ** 2, multipart_concurrency=3))
+    storage = MinioStorage(config)
+    running = set()
+
+    async def upload_part(bucket, object_name, upload_id, part_number, data):
+        running.add(part_number)
+        try:
+            if part_number == 3:
+                raise StorageError('part upload failed')
+            await asyncio.sleep(1)
+        finally:
+            running.discard(part_number)
+
+    async def abort_multipart_upload(*args):
+        assert not running  # no part is being uploaded when the upload is aborted
+
+    mocker.patch.object(storage, '_upload_part', side_effect=upload_part)
+    abort = mocker.patch.object(storage, '_abort_multipart_upload', side_effect=abort_multipart_upload)
+    data = os.urandom(11 * 1024 ** 2)
+    with pytest.raises(StorageError):
+        await storage.put_file(bucket, INPUT_DIR + '/failed.bin', io.BytesIO(data), len(data))
+    assert abort.call_count == 1
+    assert not running
+    await storage.close()
+
+
+async def test_minio_pull_ranged(storage_config: StorageConfig, minio: Minio, bucket, job_dir, mocker):
+    config = StorageConfig(dict(storage_config.to_primitive(), ranged_download_threshold=1000,
+                                ranged_download_part_size=300, ranged_download_concurrency=3))
+    storage = MinioStorage(config)
+    get_object_range = mocker.spy(storage, '_get_object_range')
+    data = os.urandom(2501)
+    minio.put_object(bucket, INPUT_DIR + '/large.bin', io.BytesIO(data), len(data))
+    minio.put_object(bucket, INPUT_DIR + '/small.bin', io.BytesIO(data[:10]), 10)
+
+    await storage.pull_job_data(bucket, job_dir)
+    assert get_object_range.call_count == 9  # the small file is downloaded at once
+    with open(path.join(job_dir, INPUT_DIR, 'large.bin'), 'rb') as file:
+        assert file.read() == data
+    with open(path.join(job_dir, INPUT_DIR, 'small.bin'), 'rb') as file:
+        assert file.read() == data[:10]
+    await storage.close()
+
+
+async def test_minio_pull_ranged_failure(storage_config: StorageConfig, job_dir, mocker):
+    config = StorageConfig(dict(storage_config.to_primitive(), ranged_download_part_size=300,
+                                ranged_download_concurrency=3))
+    storage = MinioStorage(config)
+    running = set()
+
+    async def get_object_range(bucket, object_name, destination, start, end):
+        running.add(start)
+        try:
+            if start == 300:
+                raise StorageError('range download failed')
+            await asyncio.sleep(1)
+            os.pwrite(destination, b'x', start)
+        finally:
+            running.discard(start)
+
+    mocker.patch.object(storage, '_get_object_range', side_effect=get_object_range)
+    with pytest.raises(StorageError):
+        await storage._download_object_ranged('bucket', 'large.bin', path.join(job_dir, 'large.bin'), 2501)
+    assert not running  # no range is being written once the file is closed
+    await storage.close()
+
+
+async def test_minio_list_prefix(storage: MinioStorage, minio: Minio, bucket):
+    for object_name in (INPUT_DIR + '/a.dat', INPUT_DIR + '/nested/b.dat', OUTPUT_DIR + '/c.dat'):
+        minio.put_object(bucket, object_name, io.BytesIO(b'data'), 4)
+
+    listed = [item async for item in storage._list_bucket(bucket, INPUT_DIR + '/')]
+    assert listed == [(INPUT_DIR + '/a.dat', 4), (INPUT_DIR + '/nested/b.dat', 4)]
+    assert len([item async for item in storage._list_bucket(bucket)]) == 3
+
+
+async def test_minio_connection_pool(storage_config: StorageConfig, loop):
+    config = StorageConfig(dict(storage_config.to_primitive(), connection_limit=8, connection_limit_per_host=4,
+                                keepalive_timeout=30, request_timeout=60))
+    storage = MinioStorage(config)
+    assert storage._connector.limit_per_host == 4
+    assert storage._session.timeout.total == 60
+    assert storage.connection_pool_stats == (8, 0, 0, 0)
+    await storage.close()
+
+
+async def test_minio_retry(storage_config: StorageConfig, loop):
+    config = StorageConfig(dict(storage_config.to_primitive(), retries=2, retry_base_delay=0.01, retry_max_delay=0.02))
+    storage = MinioStorage(config)
+    attempts = []
+
+    async def attempt(error: Exception, failures: int):
+        attempts.append(error)
+        if len(attempts) <= failures:
+            raise error
+        return 'done'
+
+    assert await storage._retry('GET', lambda: attempt(_ServerError('unavailable'), 2)) == 'done'
+    assert storage.retry_counts == {'GET': 2}
+
+    # the retry budget is exhausted
+    attempts.clear()
+    storage.retry_counts.clear()
+    with pytest.raises(StorageInaccessibleError):
+        await storage._retry('HEAD', lambda: attempt(asyncio.TimeoutError(), 3))
+    assert len(attempts) == 3
+    assert storage.retry_counts == {'HEAD': 2}
+
+    # client errors are not retried
+    attempts.clear()
+    with pytest.raises(StorageError):
+        await storage._retry('PUT', lambda: attempt(StorageError('forbidden'), 1))
+    assert len(attempts) == 1
+    await storage.close()
+
+
+async def test_minio_retry_inaccessible(storage_config_inaccessible: StorageConfig, loop):
+    config = StorageConfig(dict(storage_config_inaccessible.to_primitive(), retry_base_delay=0.01))
+    storage = MinioStorage(config)
+
+    with pytest.raises(StorageInaccessibleError):
+        await storage.job_dir_exists('whatever')
+    assert storage.retry_counts == {'HEAD': config.retries}
+    await storage.close()
+
+
+async def test_minio_timeout(aiohttp_server, storage_config: StorageConfig, loop):
+    async def stall(request):
+        response = web.StreamResponse()
+        if request.method == 'GET':  # send a part of the body only
+            await response.prepare(request)
+            await response.write(b'partial content')
+        await asyncio.sleep(10)
+        return response
+
+    async def object_exists(*args):
+        return True
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', stall)
+    server = await aiohttp_server(app)
+    config = StorageConfig(dict(storage_config.to_primitive(), url=f'http://127.0.0.1:{server.port}', retries=0,
+                                request_timeout=0.2))
+    storage = MinioStorage(config)
+
+    assert not await storage.is_accessible()
+    with pytest.raises(StorageInaccessibleError):
+        await storage.init_job('job')
+
+    # the response body is streamed by the caller
+    storage._object_exists = object_exists
+    stream = await storage.get_file('job', 'file')
+    with pytest.raises(StorageInaccessibleError):
+        while await stream.read(1024):
+            pass
+    await storage.close()
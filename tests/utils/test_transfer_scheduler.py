@@ -0,0 +1,64 @@
+import asyncio
+
+from shepherd.storage import TransferScheduler
+
+
+async def transfer_coro(scheduler: TransferScheduler, job_id: str, size: int, log: list, release: asyncio.Event):
+    async with scheduler.transfer(job_id, size):
+        log.append(job_id)
+        await release.wait()
+
+
+async def test_transfer_scheduler_limits(loop):
+    scheduler = TransferScheduler(max_transfers=3, max_job_transfers=2)
+    release = asyncio.Event()
+    log = []
+    tasks = [asyncio.create_task(transfer_coro(scheduler, job_id, 10, log, release))
+             for job_id in ['job-a'] * 4 + ['job-b'] * 2]
+    await asyncio.sleep(0.1)
+
+    # the per-job limit lets job-b in although job-a was first
+    assert sorted(log) == ['job-a', 'job-a', 'job-b']
+    assert scheduler.in_flight == 3
+    assert scheduler.in_flight_bytes == 30
+    assert scheduler.queue_depth == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert len(log) == 6
+    assert scheduler.in_flight == 0
+    assert scheduler.in_flight_bytes == 0
+    assert scheduler.queue_depth == 0
+
+
+async def test_transfer_scheduler_fairness(loop):
+    scheduler = TransferScheduler(max_transfers=1, max_job_transfers=1)
+    log = []
+
+    async def transfer(job_id: str):
+        async with scheduler.transfer(job_id):
+            log.append(job_id)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[transfer('job-a') for _ in range(3)], *[transfer('job-b') for _ in range(3)])
+    assert log == ['job-a', 'job-b', 'job-a', 'job-b', 'job-a', 'job-b']
+
+
+async def test_transfer_scheduler_cancel(loop):
+    scheduler = TransferScheduler(max_transfers=1, max_job_transfers=1)
+    release = asyncio.Event()
+    log = []
+    running = asyncio.create_task(transfer_coro(scheduler, 'job-a', 0, log, release))
+    waiting = asyncio.create_task(transfer_coro(scheduler, 'job-b', 0, log, release))
+    await asyncio.sleep(0.1)
+    assert scheduler.queue_depth == 1
+
+    waiting.cancel()
+    running.cancel()
+    await asyncio.gather(running, waiting, return_exceptions=True)
+    assert scheduler.queue_depth == 0
+    assert scheduler.in_flight == 0
+
+    release.set()
+    await transfer_coro(scheduler, 'job-c', 0, log, release)
+    assert log == ['job-a', 'job-c']